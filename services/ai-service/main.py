@@ -5,21 +5,52 @@ Advanced AI analysis service for content processing and recommendations
 """
 
 import os
+import sys
+import re
+import gc
+import math
+import contextlib
+import functools
 import asyncio
 import logging
 import json
+import time
+import sqlite3
+import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
+from collections import Counter
+from pathlib import Path
 import hashlib
+import unicodedata
+import uuid
 
 import redis
 from fastapi import FastAPI, HTTPException, Depends, Query, BackgroundTasks, Body
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field, validator
 import httpx
-import openai
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+# transformers is imported lazily: it adds seconds to startup and is only
+# needed once a model request actually arrives
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Vector search is optional: without hnswlib the semantic endpoints return 503
+# and the embedding model is never loaded
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+# Helpers shared by the Python services live in services/shared
+sys.path.append(str(Path(__file__).resolve().parent.parent / "shared"))
+from observability import LATENCY_BUCKETS, create_metric, install_profiling, metrics_response
 
 # Configure logging
 logging.basicConfig(
@@ -36,6 +67,46 @@ HUGGING_FACE_API_KEY = os.getenv("HUGGING_FACE_API_KEY", "")
 CACHE_TTL = int(os.getenv("AI_CACHE_TTL", "3600"))  # 1 hour default
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
 
+# Chat upstreams (OpenAI-compatible; point these at mock_upstream.py for tests)
+GROK_API_BASE = os.getenv("GROK_API_BASE", "https://api.x.ai/v1").rstrip("/")
+OPENAI_API_BASE = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1").rstrip("/")
+CHAT_TIMEOUT = float(os.getenv("AI_CHAT_TIMEOUT", "30"))
+CHAT_MAX_CONNECTIONS = int(os.getenv("AI_CHAT_MAX_CONNECTIONS", "100"))
+CHAT_CACHE_TTL = int(os.getenv("AI_CHAT_CACHE_TTL", "600"))
+
+# Headline digest precomputed by news-service for include_context
+NEWS_DIGEST_KEY = "news:digest"
+NEWS_DIGEST_REFRESH = float(os.getenv("AI_NEWS_DIGEST_REFRESH", "60"))
+
+# Model hosting: "local" loads models per worker, "preload" loads them at import
+# time so a pre-forking server (gunicorn --preload) shares them copy-on-write,
+# "server" forwards inference to model_server.py over a Unix socket
+MODEL_HOST_MODE = os.getenv("AI_MODEL_HOST_MODE", "local").lower()
+MODEL_SERVER_SOCKET = os.getenv("AI_MODEL_SOCKET", "/tmp/kaitech-models.sock")
+MODEL_SERVER_TIMEOUT = float(os.getenv("AI_MODEL_SERVER_TIMEOUT", "60"))
+
+# Long-text summarization (map-reduce over token chunks)
+SUMMARIZATION_MODEL_NAME = "facebook/bart-large-cnn"
+SUMMARY_CHUNK_TOKENS = int(os.getenv("AI_SUMMARY_CHUNK_TOKENS", "900"))  # BART accepts 1024
+SUMMARY_BATCH_SIZE = int(os.getenv("AI_SUMMARY_BATCH_SIZE", "4"))
+SUMMARY_MAX_REDUCE_DEPTH = 3
+
+# Semantic search: sentence embeddings of news-service snapshot articles in an
+# on-disk HNSW index, synced incrementally as new snapshots are published. In
+# "server" mode the model server owns the index; otherwise one worker at a time
+# syncs it and the others reload it from disk when it changes
+EMBEDDING_MODEL_NAME = os.getenv("AI_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+EMBEDDING_BATCH_SIZE = int(os.getenv("AI_EMBEDDING_BATCH_SIZE", "64"))
+VECTOR_INDEX_DIR = Path(os.getenv("AI_VECTOR_INDEX_DIR", "/tmp/kaitech-vectors"))  # mount a volume in production
+VECTOR_INDEX_CAPACITY = int(os.getenv("AI_VECTOR_INDEX_CAPACITY", "100000"))  # doubled whenever it fills
+VECTOR_HNSW_M = int(os.getenv("AI_VECTOR_HNSW_M", "16"))
+VECTOR_HNSW_EF_CONSTRUCTION = int(os.getenv("AI_VECTOR_HNSW_EF_CONSTRUCTION", "200"))
+VECTOR_HNSW_EF_SEARCH = int(os.getenv("AI_VECTOR_HNSW_EF_SEARCH", "64"))
+VECTOR_SYNC_INTERVAL = float(os.getenv("AI_VECTOR_SYNC_INTERVAL", "60"))
+VECTOR_SYNC_LOCK = "lock:ai:vectors:sync"
+NEWS_SNAPSHOT_KEY = "news:all"
+NEWS_VERSION_KEY = "news:version"
+
 # Redis setup
 try:
     redis_client = redis.from_url(REDIS_URL, decode_responses=True)
@@ -63,10 +134,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrics
+HTTP_REQUEST_SECONDS = create_metric("Histogram", "ai_http_request_seconds", "HTTP request latency", ("method", "route", "status"), buckets=LATENCY_BUCKETS)
+CACHE_REQUESTS = create_metric("Counter", "ai_cache_requests_total", "Result cache lookups", ("result",))
+REDIS_SECONDS = create_metric("Histogram", "ai_redis_seconds", "Redis command latency", ("operation",), buckets=LATENCY_BUCKETS)
+INFERENCE_SECONDS = create_metric("Histogram", "ai_inference_seconds", "AI function latency", ("function",), buckets=LATENCY_BUCKETS)
+BATCH_SIZE = create_metric("Histogram", "ai_batch_size", "Items per model batch", ("operation",), buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512))
+QUEUE_DEPTH = create_metric("Gauge", "ai_inference_queue_depth", "Requests waiting for an inference slot", ("model",), multiprocess_mode="livesum")
+INFERENCES_ACTIVE = create_metric("Gauge", "ai_inferences_active", "Inferences currently running", ("model",), multiprocess_mode="livesum")
+ADMISSION_REJECTIONS = create_metric("Counter", "ai_admission_rejections_total", "Inferences refused by admission control", ("model", "reason"))
+
+def instrumented(function_name: str):
+    """Record an async AI function's latency in ai_inference_seconds"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                INFERENCE_SECONDS.labels(function_name).observe(time.perf_counter() - start_time)
+        return wrapper
+    return decorator
+
+@app.middleware("http")
+async def record_request_metrics(request, call_next):
+    """Record request latency per route template"""
+    start_time = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    HTTP_REQUEST_SECONDS.labels(
+        request.method,
+        getattr(route, "path", "unmatched"),
+        str(response.status_code)
+    ).observe(time.perf_counter() - start_time)
+    return response
+
+profiler = install_profiling(app, "ai-service")
+
 # Initialize AI models (lazy loading)
 sentiment_model = None
 summarization_model = None
 classification_model = None
+embedding_model = None
 
 # Pydantic models
 class TextInput(BaseModel):
@@ -89,12 +199,18 @@ class ChatInput(BaseModel):
     temperature: float = Field(0.7, ge=0.0, le=2.0)
     max_tokens: int = Field(1000, ge=1, le=4000)
     include_context: bool = Field(False, description="Include news context")
+    stream: bool = Field(False, description="Stream the reply as server-sent events")
+    cache: bool = Field(False, description="Reuse cached replies for identical temperature=0 requests")
 
 class AnalysisInput(BaseModel):
     text: str = Field(..., min_length=10, max_length=50000)
     analysis_type: str = Field("comprehensive", regex="^(sentiment|summary|category|keywords|comprehensive)$")
     options: Optional[Dict[str, Any]] = Field({})
 
+class BatchTextInput(BaseModel):
+    texts: List[str] = Field(..., min_items=1, max_items=500)
+    update_corpus: bool = Field(True, description="Add these documents to the keyword corpus")
+
 class AIResponse(BaseModel):
     status: str = "success"
     result: Any
@@ -109,11 +225,91 @@ class ErrorResponse(BaseModel):
     error_code: Optional[str] = None
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
+# Bump an entry when its model or post-processing changes so stale results
+# stop being served from the shared result store
+MODEL_VERSIONS = {
+    "sentiment": "twitter-roberta-base-sentiment-latest.1",
+    "summary": "bart-large-cnn.mapreduce.1",
+    "classification": "bart-large-mnli.1",
+    "keywords": "tfidf.1"
+}
+
+# Keyword extraction (TF-IDF over a corpus document-frequency table)
+KEYWORD_TOKEN_PATTERN = re.compile(r'\b[a-zA-Z]{3,}\b')
+KEYWORD_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'its', 'our', 'their', 'what', 'where', 'when', 'why', 'how'
+})
+KEYWORD_DF_KEY = "ai:keywords:df"
+KEYWORD_DOCS_KEY = "ai:keywords:docs"
+KEYWORD_CORPUS_IDS_KEY = "ai:keywords:corpus-ids"  # news articles already counted
+keyword_document_frequencies = Counter()  # Used when Redis is unavailable
+keyword_corpus_size = {"documents": 0}
+KEYWORD_GENERATION_TTL = 30  # seconds a process reuses the shared corpus generation
+keyword_generation_cache = {"generation": 0, "expires": 0.0}
+keyword_corpus_ids = set()
+
+DEFAULT_CATEGORIES = [
+    "technology", "business", "politics", "sports", "entertainment",
+    "health", "science", "world news", "cryptocurrency", "ai & machine learning"
+]
+
+# Model cascade: answer from the cheap tier when it is confident enough,
+# escalate to the transformer otherwise
+CASCADE_ENABLED = os.getenv("AI_CASCADE_MODE", "false").lower() == "true"
+CASCADE_SENTIMENT_THRESHOLD = float(os.getenv("AI_CASCADE_SENTIMENT_THRESHOLD", "0.6"))
+CASCADE_CLASSIFY_THRESHOLD = float(os.getenv("AI_CASCADE_CLASSIFY_THRESHOLD", "0.5"))
+SENTIMENT_WORD_PATTERN = re.compile(r"[a-z]+")
+POSITIVE_WORDS = frozenset({
+    'breakthrough', 'success', 'successful', 'growth', 'positive', 'achievement', 'innovation',
+    'gain', 'gains', 'win', 'wins', 'record', 'surge', 'improve', 'improves', 'boost', 'celebrate'
+})
+NEGATIVE_WORDS = frozenset({
+    'crisis', 'failure', 'decline', 'negative', 'problem', 'concern', 'crash', 'loss', 'losses',
+    'death', 'dead', 'killed', 'attack', 'war', 'fraud', 'scandal', 'collapse', 'warning'
+})
+cascade_stats = {
+    task: {tier: {"count": 0, "total_time": 0.0} for tier in ("fast", "escalated")}
+    for task in ("sentiment", "classification")
+}
+
+# Admission control: per-model inference concurrency and wait queue bounds.
+# When saturated, "degrade" answers from the fallback path, "reject" returns
+# 429/503 with Retry-After
+MAX_CONCURRENT_INFERENCES = int(os.getenv("AI_MAX_CONCURRENT_INFERENCES", "2"))
+MAX_QUEUED_INFERENCES = int(os.getenv("AI_MAX_QUEUED_INFERENCES", "32"))
+INFERENCE_QUEUE_TIMEOUT = float(os.getenv("AI_INFERENCE_QUEUE_TIMEOUT", "5"))
+SATURATION_POLICY = os.getenv("AI_SATURATION_POLICY", "degrade").lower()
+
+FALLBACK_MODELS = {"fallback", "fallback_truncation", "keyword_based_fallback", "error_fallback"}
+
+# In-flight coalescing of identical analyses
+COALESCE_LOCK_TTL = int(os.getenv("AI_COALESCE_LOCK_TTL", "120"))
+COALESCE_WAIT_TIMEOUT = float(os.getenv("AI_COALESCE_WAIT_TIMEOUT", "60"))
+COALESCE_POLL_INTERVAL = float(os.getenv("AI_COALESCE_POLL_INTERVAL", "0.1"))
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+inflight_analyses: Dict[str, asyncio.Future] = {}
+
 # Cache utilities
+def normalize_text(text: str) -> str:
+    """Canonical form of a text so Unicode and whitespace variants share a hash"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+def content_hash(text: str) -> str:
+    """Content address of a text: BLAKE2b of its canonical form"""
+    return hashlib.blake2b(normalize_text(text).encode(), digest_size=16).hexdigest()
+
 def generate_cache_key(prefix: str, data: str) -> str:
-    """Generate cache key from data hash"""
-    data_hash = hashlib.md5(data.encode()).hexdigest()
-    return f"ai:{prefix}:{data_hash}"
+    """Generate cache key from the normalized data hash"""
+    return f"ai:{prefix}:{content_hash(data)}"
+
+def analysis_cache_key(analysis: str, text: str, params: str = "") -> str:
+    """Content-addressed key for one analysis of a text, shared by all endpoints"""
+    return generate_cache_key(f"{analysis}:{MODEL_VERSIONS[analysis]}:{params}", text)
 
 async def get_from_cache(key: str) -> Optional[Dict]:
     """Get data from Redis cache"""
@@ -121,11 +317,16 @@ async def get_from_cache(key: str) -> Optional[Dict]:
         return None
     
     try:
+        start_time = time.perf_counter()
         cached_data = redis_client.get(key)
+        REDIS_SECONDS.labels("get").observe(time.perf_counter() - start_time)
         if cached_data:
+            CACHE_REQUESTS.labels("hit").inc()
             return json.loads(cached_data)
+        CACHE_REQUESTS.labels("miss").inc()
         return None
     except Exception as e:
+        CACHE_REQUESTS.labels("error").inc()
         logger.error(f"AI Cache read error for key {key}: {e}")
         return None
 
@@ -135,74 +336,378 @@ async def set_cache(key: str, data: Dict, ttl: int = CACHE_TTL) -> bool:
         return False
     
     try:
+        start_time = time.perf_counter()
         redis_client.setex(key, ttl, json.dumps(data, default=str))
+        REDIS_SECONDS.labels("setex").observe(time.perf_counter() - start_time)
         return True
     except Exception as e:
         logger.error(f"AI Cache write error for key {key}: {e}")
         return False
 
+async def get_many_from_cache(keys: List[str]) -> List[Optional[Dict]]:
+    """Get several keys from Redis cache in one round trip"""
+    if not redis_client or not keys:
+        return [None] * len(keys)
+    
+    try:
+        start_time = time.perf_counter()
+        values = redis_client.mget(keys)
+        REDIS_SECONDS.labels("mget").observe(time.perf_counter() - start_time)
+        hits = sum(1 for value in values if value)
+        CACHE_REQUESTS.labels("hit").inc(hits)
+        CACHE_REQUESTS.labels("miss").inc(len(keys) - hits)
+        return [json.loads(value) if value else None for value in values]
+    except Exception as e:
+        logger.error(f"AI Cache multi-read error for {len(keys)} keys: {e}")
+        return [None] * len(keys)
+
 # AI Model Management
+model_server_client = None
+
+def get_model_server_client() -> httpx.Client:
+    """Get the shared client for the local model server"""
+    global model_server_client
+    if model_server_client is None:
+        model_server_client = httpx.Client(
+            transport=httpx.HTTPTransport(uds=MODEL_SERVER_SOCKET),
+            base_url="http://model-server",
+            timeout=MODEL_SERVER_TIMEOUT
+        )
+    return model_server_client
+
+class RemoteModel:
+    """Pipeline proxy that runs inference in the shared model server process"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __call__(self, *args, **kwargs):
+        response = get_model_server_client().post(
+            f"/infer/{self.name}",
+            json={"args": list(args), "kwargs": kwargs}
+        )
+        response.raise_for_status()
+        return response.json()["result"]
+
+def create_pipeline(*args, **kwargs):
+    """Build a transformers pipeline, importing transformers on first use"""
+    from transformers import pipeline
+    return pipeline(*args, **kwargs)
+
+# Per-model lifecycle: pending -> loading -> loaded -> warming -> ready | failed,
+# or disabled when the feature that needs the model can't run
+model_status = {
+    name: {"state": "pending", "load_time": None, "error": None}
+    for name in ("sentiment", "summarization", "classification", "embedding")
+}
+if hnswlib is None:
+    model_status["embedding"].update(state="disabled", error="hnswlib is not installed")
+model_load_locks = {name: threading.Lock() for name in model_status}
+
+def set_model_state(name: str, state: str, **details):
+    """Record a model lifecycle transition for the readiness endpoint"""
+    model_status[name]["state"] = state
+    model_status[name].update(details)
+
 def load_sentiment_model():
     """Load sentiment analysis model"""
     global sentiment_model
     if sentiment_model is None:
-        try:
-            sentiment_model = pipeline(
-                "sentiment-analysis",
-                model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                return_all_scores=True
-            )
-            logger.info("✅ Sentiment model loaded")
-        except Exception as e:
-            logger.error(f"❌ Failed to load sentiment model: {e}")
-            sentiment_model = pipeline("sentiment-analysis")
+        with model_load_locks["sentiment"]:
+            if sentiment_model is None:
+                set_model_state("sentiment", "loading")
+                start_time = time.monotonic()
+                if MODEL_HOST_MODE == "server":
+                    sentiment_model = RemoteModel("sentiment")
+                else:
+                    try:
+                        sentiment_model = create_pipeline(
+                            "sentiment-analysis",
+                            model="cardiffnlp/twitter-roberta-base-sentiment-latest",
+                            return_all_scores=True
+                        )
+                        logger.info("✅ Sentiment model loaded")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to load sentiment model: {e}")
+                        sentiment_model = create_pipeline("sentiment-analysis")
+                set_model_state("sentiment", "loaded", load_time=round(time.monotonic() - start_time, 3))
     return sentiment_model
 
 def load_summarization_model():
     """Load text summarization model"""
     global summarization_model
     if summarization_model is None:
-        try:
-            summarization_model = pipeline(
-                "summarization",
-                model="facebook/bart-large-cnn",
-                max_length=130,
-                min_length=30,
-                do_sample=False
-            )
-            logger.info("✅ Summarization model loaded")
-        except Exception as e:
-            logger.error(f"❌ Failed to load summarization model: {e}")
-            summarization_model = pipeline("summarization")
+        with model_load_locks["summarization"]:
+            if summarization_model is None:
+                set_model_state("summarization", "loading")
+                start_time = time.monotonic()
+                if MODEL_HOST_MODE == "server":
+                    summarization_model = RemoteModel("summarization")
+                else:
+                    try:
+                        summarization_model = create_pipeline(
+                            "summarization",
+                            model=SUMMARIZATION_MODEL_NAME,
+                            max_length=130,
+                            min_length=30,
+                            do_sample=False
+                        )
+                        logger.info("✅ Summarization model loaded")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to load summarization model: {e}")
+                        summarization_model = create_pipeline("summarization")
+                set_model_state("summarization", "loaded", load_time=round(time.monotonic() - start_time, 3))
     return summarization_model
 
 def load_classification_model():
     """Load text classification model"""
     global classification_model
-    if classification_model is None:
+    if classification_model is None and model_status["classification"]["state"] != "failed":
+        with model_load_locks["classification"]:
+            if classification_model is None and model_status["classification"]["state"] != "failed":
+                set_model_state("classification", "loading")
+                start_time = time.monotonic()
+                if MODEL_HOST_MODE == "server":
+                    classification_model = RemoteModel("classification")
+                else:
+                    try:
+                        classification_model = create_pipeline(
+                            "zero-shot-classification",
+                            model="facebook/bart-large-mnli"
+                        )
+                        logger.info("✅ Classification model loaded")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to load classification model: {e}")
+                        classification_model = None
+                        set_model_state("classification", "failed", error=str(e))
+                        return None
+                set_model_state("classification", "loaded", load_time=round(time.monotonic() - start_time, 3))
+    return classification_model
+
+class SentenceEmbedder:
+    """sentence-transformers model returning normalized embeddings as lists
+    (JSON-safe, so the model server can return them too)"""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    def __call__(self, texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> List[List[float]]:
+        return self.model.encode(texts, batch_size=batch_size, normalize_embeddings=True).tolist()
+
+def load_embedding_model():
+    """Load sentence embedding model"""
+    global embedding_model
+    if embedding_model is None and model_status["embedding"]["state"] not in ("failed", "disabled"):
+        with model_load_locks["embedding"]:
+            if embedding_model is None and model_status["embedding"]["state"] not in ("failed", "disabled"):
+                set_model_state("embedding", "loading")
+                start_time = time.monotonic()
+                if MODEL_HOST_MODE == "server":
+                    embedding_model = RemoteModel("embedding")
+                else:
+                    try:
+                        embedding_model = SentenceEmbedder(EMBEDDING_MODEL_NAME)
+                        logger.info("✅ Embedding model loaded")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to load embedding model: {e}")
+                        embedding_model = None
+                        set_model_state("embedding", "failed", error=str(e))
+                        return None
+                set_model_state("embedding", "loaded", load_time=round(time.monotonic() - start_time, 3))
+    return embedding_model
+
+summarization_tokenizer = None
+summarization_tokenizer_state = {"failed": False}
+summarization_tokenizer_lock = threading.Lock()
+
+def load_summarization_tokenizer():
+    """Load the summarization tokenizer used to split long texts into chunks; None
+    in server mode (the API worker doesn't import transformers) or after a failed load"""
+    global summarization_tokenizer
+    if MODEL_HOST_MODE == "server" or summarization_tokenizer_state["failed"]:
+        return None
+    if summarization_tokenizer is None:
+        with summarization_tokenizer_lock:
+            if summarization_tokenizer is None and not summarization_tokenizer_state["failed"]:
+                try:
+                    from transformers import AutoTokenizer
+                    summarization_tokenizer = AutoTokenizer.from_pretrained(SUMMARIZATION_MODEL_NAME)
+                except Exception as e:
+                    logger.error(f"❌ Failed to load summarization tokenizer: {e}")
+                    summarization_tokenizer_state["failed"] = True
+    return summarization_tokenizer
+
+MODEL_LOADERS = {
+    "sentiment": load_sentiment_model,
+    "summarization": load_summarization_model,
+    "classification": load_classification_model,
+    "embedding": load_embedding_model
+}
+
+# One small inference per model so the first real request doesn't pay for
+# lazy initialisation inside the pipeline
+MODEL_WARMUP_CALLS = {
+    "sentiment": (("KaiTech warm-up request",), {}),
+    "summarization": (
+        ("KaiTech AI Service is warming up its summarization model. " * 4,),
+        {"max_length": 30, "min_length": 5, "do_sample": False}
+    ),
+    "classification": (("KaiTech warm-up request", ["technology", "business"]), {}),
+    "embedding": ((["KaiTech warm-up request"],), {})
+}
+
+def warm_up_model(name: str) -> bool:
+    """Load a model and run its warm-up inference (blocking, call off the event loop)"""
+    if model_status[name]["state"] == "disabled":
+        return False
+    try:
+        model = MODEL_LOADERS[name]()
+        if model is None:
+            return False
+
+        set_model_state(name, "warming")
+        args, kwargs = MODEL_WARMUP_CALLS[name]
+        model(*args, **kwargs)
+        set_model_state(name, "ready", error=None)
+        return True
+    except Exception as e:
+        logger.error(f"❌ Failed to warm up {name} model: {e}")
+        set_model_state(name, "failed", error=str(e))
+        return False
+
+def models_ready() -> bool:
+    """Whether every model has finished warming up (or failed and uses its fallback)"""
+    return all(status["state"] in ("ready", "failed", "disabled") for status in model_status.values())
+
+if MODEL_HOST_MODE == "preload":
+    # Load weights before the server forks workers, then move everything into
+    # the permanent GC generation so refcount updates don't dirty shared pages
+    logger.info("🔄 Preloading AI models before fork...")
+    for name in MODEL_LOADERS:
+        warm_up_model(name)
+    gc.freeze()
+    logger.info("✅ AI models preloaded for shared workers")
+
+# Admission control
+class ModelSaturated(Exception):
+    """Raised when a model's wait queue is full or its queue deadline passes"""
+
+    def __init__(self, model: str, reason: str, retry_after: int):
+        super().__init__(f"{model} model saturated ({reason})")
+        self.model = model
+        self.reason = reason
+        self.retry_after = retry_after
+        self.status_code = 429 if reason == "queue_full" else 503
+
+class AdmissionGate:
+    """Per-model concurrency limit with a bounded, deadline-aware wait queue"""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.degraded = 0
+        self.avg_service_time = 1.0
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free, from the average service time"""
+        return max(1, math.ceil(self.avg_service_time * (self.waiting + 1) / self.max_concurrent))
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        """Hold one inference slot, waiting in the bounded queue if needed"""
+        if self.semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                ADMISSION_REJECTIONS.labels(self.name, "queue_full").inc()
+                raise ModelSaturated(self.name, "queue_full", self.retry_after())
+            self.waiting += 1
+            QUEUE_DEPTH.labels(self.name).set(self.waiting)
+            try:
+                await asyncio.wait_for(self.semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                ADMISSION_REJECTIONS.labels(self.name, "queue_timeout").inc()
+                raise ModelSaturated(self.name, "queue_timeout", self.retry_after())
+            finally:
+                self.waiting -= 1
+                QUEUE_DEPTH.labels(self.name).set(self.waiting)
+        else:
+            await self.semaphore.acquire()
+        
+        self.active += 1
+        INFERENCES_ACTIVE.labels(self.name).set(self.active)
+        start_time = time.monotonic()
         try:
-            classification_model = pipeline(
-                "zero-shot-classification",
-                model="facebook/bart-large-mnli"
+            yield
+        finally:
+            self.active -= 1
+            INFERENCES_ACTIVE.labels(self.name).set(self.active)
+            self.semaphore.release()
+            self.avg_service_time = 0.8 * self.avg_service_time + 0.2 * (time.monotonic() - start_time)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current gate state for the queue endpoint"""
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+            "degraded": self.degraded,
+            "avg_service_time": round(self.avg_service_time, 3)
+        }
+
+model_gates = {
+    name: AdmissionGate(
+        name,
+        max_concurrent=int(os.getenv(f"AI_MAX_CONCURRENT_{name.upper()}", str(MAX_CONCURRENT_INFERENCES))),
+        max_queue=MAX_QUEUED_INFERENCES,
+        queue_timeout=INFERENCE_QUEUE_TIMEOUT
+    )
+    for name in ("sentiment", "summarization", "classification", "embedding")
+}
+
+async def admit(model_name: str, compute, degrade) -> Dict[str, Any]:
+    """Run an inference through its model gate, degrading or rejecting when saturated"""
+    gate = model_gates[model_name]
+    try:
+        async with gate.slot():
+            return await compute()
+    except ModelSaturated as e:
+        logger.warning(f"⚠️ {e}")
+        if SATURATION_POLICY != "degrade":
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
             )
-            logger.info("✅ Classification model loaded")
-        except Exception as e:
-            logger.error(f"❌ Failed to load classification model: {e}")
-            classification_model = None
-    return classification_model
+        
+        gate.degraded += 1
+        result = degrade()
+        if asyncio.iscoroutine(result):
+            result = await result
+        return {**result, "degraded": True}
 
 # AI Processing Functions
+@instrumented("analyze_sentiment_ai")
 async def analyze_sentiment_ai(text: str) -> Dict[str, Any]:
     """Analyze sentiment using local AI model"""
     try:
-        start_time = datetime.utcnow()
-        model = load_sentiment_model()
+        start_time = time.perf_counter()
+        model = await run_in_threadpool(load_sentiment_model)
         
         # Truncate text if too long
         if len(text) > 500:
             text = text[:497] + "..."
         
-        result = model(text)
+        result = await run_in_threadpool(model, text)
         
         # Process results
         if isinstance(result, list) and len(result) > 0:
@@ -233,7 +738,7 @@ async def analyze_sentiment_ai(text: str) -> Dict[str, Any]:
                 dominant = (dominant_label, result[0]['score'])
                 processed_scores = {dominant_label: result[0]['score']}
         
-        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        processing_time = time.perf_counter() - start_time
         
         return {
             "sentiment": dominant[0],
@@ -254,10 +759,78 @@ async def analyze_sentiment_ai(text: str) -> Dict[str, Any]:
             "error": str(e)
         }
 
+SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+def split_text_by_words(text: str, max_tokens: int) -> List[str]:
+    """Tokenizer-free splitter: whole sentences packed into chunks of about
+    max_tokens tokens, assuming roughly four tokens per three English words"""
+    max_words = max(1, max_tokens * 3 // 4)
+    chunks, current = [], []
+    for sentence in SENTENCE_BOUNDARY_PATTERN.split(text):
+        words = sentence.split()
+        if current and len(current) + len(words) > max_words:
+            chunks.append(" ".join(current))
+            current = []
+        current.extend(words)
+        while len(current) > max_words:
+            chunks.append(" ".join(current[:max_words]))
+            current = current[max_words:]
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+def split_text_into_chunks(text: str, max_tokens: int = SUMMARY_CHUNK_TOKENS) -> List[str]:
+    """Split text on tokenizer boundaries into chunks of at most max_tokens tokens"""
+    tokenizer = load_summarization_tokenizer()
+    if tokenizer is None:
+        return split_text_by_words(text, max_tokens)
+    
+    offsets = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]
+    chunks = []
+    start = 0
+    while start < len(offsets):
+        end = min(start + max_tokens, len(offsets))
+        if end < len(offsets):
+            # Prefer ending the chunk on a sentence boundary in its second half
+            for i in range(end - 1, start + max_tokens // 2, -1):
+                if text[offsets[i][1] - 1:offsets[i][1]] in ".!?":
+                    end = i + 1
+                    break
+        chunk = text[offsets[start][0]:offsets[end - 1][1]].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end
+    return chunks
+
+async def summarize_chunks(model, chunks: List[str], max_length: int) -> tuple:
+    """Summarize chunks in one batch, reusing cached per-chunk summaries"""
+    keys = [analysis_cache_key("summary", chunk, f"chunk:{max_length}") for chunk in chunks]
+    cached = await get_many_from_cache(keys)
+    summaries = [entry["summary"] if entry else None for entry in cached]
+    missing = [i for i, summary in enumerate(summaries) if summary is None]
+    
+    if missing:
+        BATCH_SIZE.labels("summarization").observe(len(missing))
+        results = await run_in_threadpool(
+            model,
+            [chunks[i] for i in missing],
+            max_length=max_length,
+            min_length=min(30, max_length // 2),
+            do_sample=False,
+            truncation=True,
+            batch_size=SUMMARY_BATCH_SIZE
+        )
+        for i, result in zip(missing, results):
+            summaries[i] = result['summary_text']
+            await set_cache(keys[i], {"summary": summaries[i]})
+    
+    return summaries, len(chunks) - len(missing)
+
+@instrumented("summarize_text_ai")
 async def summarize_text_ai(text: str, max_length: int = 130) -> Dict[str, Any]:
-    """Summarize text using local AI model"""
+    """Summarize text using local AI model (map-reduce over token chunks)"""
     try:
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
         
         # Check text length
         if len(text) < 50:
@@ -268,51 +841,59 @@ async def summarize_text_ai(text: str, max_length: int = 130) -> Dict[str, Any]:
                 "compression_ratio": 1.0
             }
         
-        model = load_summarization_model()
+        model = await run_in_threadpool(load_summarization_model)
         
-        # Truncate text if too long (BART has token limits)
-        if len(text) > 1000:
-            text = text[:997] + "..."
+        # Map: summarize every chunk of the full text, not just its head
+        chunks = await run_in_threadpool(split_text_into_chunks, text)
+        summaries, chunks_cached = await summarize_chunks(model, chunks, max_length)
         
-        result = model(text, max_length=max_length, min_length=30, do_sample=False)
+        # Reduce: summarize the joined partial summaries until one remains
+        depth = 0
+        while len(summaries) > 1 and depth < SUMMARY_MAX_REDUCE_DEPTH:
+            combined_chunks = await run_in_threadpool(split_text_into_chunks, " ".join(summaries))
+            summaries, _ = await summarize_chunks(model, combined_chunks, max_length)
+            depth += 1
         
-        summary = result[0]['summary_text']
-        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        summary = " ".join(summaries)
+        processing_time = time.perf_counter() - start_time
         compression_ratio = len(summary) / len(text)
         
         return {
             "summary": summary,
-            "model": "facebook/bart-large-cnn",
+            "model": SUMMARIZATION_MODEL_NAME,
             "processing_time": processing_time,
             "compression_ratio": round(compression_ratio, 3),
             "original_length": len(text),
-            "summary_length": len(summary)
+            "summary_length": len(summary),
+            "chunks": len(chunks),
+            "chunks_cached": chunks_cached
         }
         
     except Exception as e:
         logger.error(f"Local summarization error: {e}")
         # Fallback to simple truncation
-        fallback_summary = text[:max_length] + "..." if len(text) > max_length else text
-        return {
-            "summary": fallback_summary,
-            "model": "fallback_truncation",
-            "processing_time": 0.0,
-            "compression_ratio": len(fallback_summary) / len(text),
-            "error": str(e)
-        }
+        return {**truncate_summary(text, max_length), "error": str(e)}
+
+def truncate_summary(text: str, max_length: int = 130) -> Dict[str, Any]:
+    """Fallback summary by simple truncation"""
+    fallback_summary = text[:max_length] + "..." if len(text) > max_length else text
+    return {
+        "summary": fallback_summary,
+        "model": "fallback_truncation",
+        "processing_time": 0.0,
+        "compression_ratio": len(fallback_summary) / len(text)
+    }
 
+@instrumented("classify_text_ai")
 async def classify_text_ai(text: str, categories: List[str] = None) -> Dict[str, Any]:
     """Classify text into categories using AI"""
     try:
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
         
         if categories is None:
-            categories = [
-                "technology", "business", "politics", "sports", "entertainment",
-                "health", "science", "world news", "cryptocurrency", "ai & machine learning"
-            ]
+            categories = DEFAULT_CATEGORIES
         
-        model = load_classification_model()
+        model = await run_in_threadpool(load_classification_model)
         if model is None:
             # Fallback to keyword-based classification
             return await classify_text_keywords(text, categories)
@@ -321,9 +902,9 @@ async def classify_text_ai(text: str, categories: List[str] = None) -> Dict[str,
         if len(text) > 500:
             text = text[:497] + "..."
         
-        result = model(text, categories)
+        result = await run_in_threadpool(model, text, categories)
         
-        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        processing_time = time.perf_counter() - start_time
         
         # Process results
         classified_categories = []
@@ -378,36 +959,243 @@ async def classify_text_keywords(text: str, categories: List[str]) -> Dict[str,
         "processing_time": 0.0
     }
 
+def analyze_sentiment_lexical(text: str) -> Dict[str, Any]:
+    """Fast lexical sentiment; confidence is the word-count margin"""
+    words = SENTIMENT_WORD_PATTERN.findall(text.lower())
+    positive = sum(1 for word in words if word in POSITIVE_WORDS)
+    negative = sum(1 for word in words if word in NEGATIVE_WORDS)
+    
+    if positive > negative:
+        sentiment = "positive"
+    elif negative > positive:
+        sentiment = "negative"
+    else:
+        sentiment = "neutral"
+    confidence = abs(positive - negative) / (positive + negative + 1)
+    
+    return {
+        "sentiment": sentiment,
+        "confidence": round(confidence, 3),
+        "scores": {sentiment: round(confidence, 3)},
+        "model": "lexical",
+        "processing_time": 0.0
+    }
+
+def record_cascade(task: str, tier: str, elapsed: float):
+    """Count a cascade decision and its latency"""
+    stats = cascade_stats[task][tier]
+    stats["count"] += 1
+    stats["total_time"] += elapsed
+
+async def route_sentiment(text: str) -> Dict[str, Any]:
+    """Sentiment via the cascade: lexical first, transformer on low confidence"""
+    if not CASCADE_ENABLED:
+        return await admit("sentiment", lambda: analyze_sentiment_ai(text), lambda: analyze_sentiment_lexical(text))
+    
+    start_time = time.monotonic()
+    result = analyze_sentiment_lexical(text)
+    if result["confidence"] >= CASCADE_SENTIMENT_THRESHOLD:
+        record_cascade("sentiment", "fast", time.monotonic() - start_time)
+        return {**result, "tier": "fast"}
+    
+    fast_result = result
+    result = await admit("sentiment", lambda: analyze_sentiment_ai(text), lambda: fast_result)
+    record_cascade("sentiment", "escalated", time.monotonic() - start_time)
+    return {**result, "tier": "escalated"}
+
+async def route_classification(text: str, categories: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Classification via the cascade: keywords first, zero-shot on low confidence"""
+    if not CASCADE_ENABLED:
+        return await admit(
+            "classification",
+            lambda: classify_text_ai(text, categories),
+            lambda: classify_text_keywords(text, categories or DEFAULT_CATEGORIES)
+        )
+    
+    start_time = time.monotonic()
+    result = await classify_text_keywords(text, categories or DEFAULT_CATEGORIES)
+    if result["confidence"] >= CASCADE_CLASSIFY_THRESHOLD:
+        record_cascade("classification", "fast", time.monotonic() - start_time)
+        return {**result, "tier": "fast"}
+    
+    fast_result = result
+    result = await admit("classification", lambda: classify_text_ai(text, categories), lambda: fast_result)
+    record_cascade("classification", "escalated", time.monotonic() - start_time)
+    return {**result, "tier": "escalated"}
+
+def tokenize_keywords(text: str) -> tuple:
+    """Tokenize text; returns (all words, candidate keyword terms)"""
+    words = KEYWORD_TOKEN_PATTERN.findall(text.lower())
+    return words, [word for word in words if word not in KEYWORD_STOP_WORDS and len(word) > 3]
+
+def get_document_frequencies(terms: List[str]) -> tuple:
+    """Look up corpus document frequencies; returns ({term: df}, corpus size)"""
+    if redis_client and terms:
+        try:
+            pipe = redis_client.pipeline()
+            pipe.hmget(KEYWORD_DF_KEY, terms)
+            pipe.get(KEYWORD_DOCS_KEY)
+            frequencies, n_docs = pipe.execute()
+            return {term: int(df or 0) for term, df in zip(terms, frequencies)}, int(n_docs or 0)
+        except Exception as e:
+            logger.error(f"Keyword corpus read error: {e}")
+    return {term: keyword_document_frequencies[term] for term in terms}, keyword_corpus_size["documents"]
+
+def update_document_frequencies(documents_terms: List[List[str]]):
+    """Add documents to the corpus document-frequency table"""
+    increments = Counter(term for terms in documents_terms for term in set(terms))
+    if redis_client:
+        try:
+            pipe = redis_client.pipeline()
+            for term, count in increments.items():
+                pipe.hincrby(KEYWORD_DF_KEY, term, count)
+            pipe.incrby(KEYWORD_DOCS_KEY, len(documents_terms))
+            pipe.execute()
+            return
+        except Exception as e:
+            logger.error(f"Keyword corpus update error: {e}")
+    keyword_document_frequencies.update(increments)
+    keyword_corpus_size["documents"] += len(documents_terms)
+
+def keyword_corpus_generation() -> int:
+    """Coarse corpus state for keyword result cache keys; moves on each time the corpus
+    doubles. The shared document count is read from Redis at most every KEYWORD_GENERATION_TTL"""
+    if time.monotonic() < keyword_generation_cache["expires"]:
+        return keyword_generation_cache["generation"]
+    
+    n_docs = keyword_corpus_size["documents"]
+    if redis_client:
+        try:
+            n_docs = int(redis_client.get(KEYWORD_DOCS_KEY) or 0)
+        except Exception as e:
+            logger.error(f"Keyword corpus read error: {e}")
+    keyword_generation_cache["generation"] = int(math.log2(n_docs + 1))
+    keyword_generation_cache["expires"] = time.monotonic() + KEYWORD_GENERATION_TTL
+    return keyword_generation_cache["generation"]
+
+def add_articles_to_keyword_corpus(articles: List[Dict]) -> int:
+    """Count news articles not seen before into the document-frequency table; returns how many"""
+    ids = [article["id"] for article in articles if article.get("id")]
+    if redis_client:
+        try:
+            pipe = redis_client.pipeline()
+            for article_id in ids:
+                pipe.sadd(KEYWORD_CORPUS_IDS_KEY, article_id)
+            new_ids = {article_id for article_id, added in zip(ids, pipe.execute()) if added}
+        except Exception as e:
+            logger.error(f"Keyword corpus update error: {e}")
+            return 0
+    else:
+        new_ids = set(ids) - keyword_corpus_ids
+        keyword_corpus_ids.update(new_ids)
+    
+    documents = []
+    for article in articles:
+        if article.get("id") in new_ids:
+            new_ids.discard(article["id"])
+            documents.append(tokenize_keywords(embedding_text(article))[1])
+    if documents:
+        update_document_frequencies(documents)
+        keyword_generation_cache["expires"] = 0.0
+    return len(documents)
+
+def inverse_document_frequency(df: int, n_docs: int) -> float:
+    """Smoothed IDF, so terms unseen in the corpus still score"""
+    return math.log((1 + n_docs) / (1 + df)) + 1.0
+
+def position_weight(first_index: int) -> float:
+    """YAKE-style boost for terms that appear early in the document"""
+    return 1.0 + 1.0 / math.log2(2 + first_index)
+
+def keyword_result(words: List[str], scored: List[tuple]) -> Dict[str, Any]:
+    """Format (term, frequency, score) tuples as a keyword extraction result"""
+    return {
+        "keywords": [{"keyword": term, "frequency": freq, "score": round(score, 6)} for term, freq, score in scored],
+        "total_words": len(words),
+        "unique_words": len(set(words)),
+        "model": "tfidf",
+        "processing_time": 0.0
+    }
+
+def score_keywords(text: str, num_keywords: int) -> Dict[str, Any]:
+    """Score one document's keywords by TF-IDF and position"""
+    words, terms = tokenize_keywords(text)
+    counts = Counter(terms)
+    first_index = {}
+    for i, term in enumerate(terms):
+        first_index.setdefault(term, i)
+    
+    frequencies, n_docs = get_document_frequencies(list(counts))
+    scored = [
+        (term, freq, freq / len(terms) * inverse_document_frequency(frequencies[term], n_docs) * position_weight(first_index[term]))
+        for term, freq in counts.items()
+    ]
+    scored.sort(key=lambda item: item[2], reverse=True)
+    return keyword_result(words, scored[:num_keywords])
+
+def score_keywords_batch(texts: List[str], num_keywords: int, update_corpus: bool = True) -> List[Dict[str, Any]]:
+    """Score keywords for many documents at once with sparse-matrix TF-IDF"""
+    tokenized = [tokenize_keywords(text) for text in texts]
+    if update_corpus:
+        update_document_frequencies([terms for _, terms in tokenized])
+    
+    try:
+        import numpy as np
+        from scipy import sparse
+    except ImportError:
+        return [score_keywords(text, num_keywords) for text in texts]
+    
+    vocabulary = {}
+    rows, cols, first_positions = [], [], []
+    for row, (_, terms) in enumerate(tokenized):
+        seen = set()
+        for i, term in enumerate(terms):
+            col = vocabulary.setdefault(term, len(vocabulary))
+            rows.append(row)
+            cols.append(col)
+            if col not in seen:
+                seen.add(col)
+                first_positions.append((row, col, i))
+    
+    shape = (len(texts), len(vocabulary))
+    # Duplicate (row, col) entries are summed, giving a term count matrix
+    counts = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=shape)
+    counts.sum_duplicates()
+    lengths = np.maximum(np.asarray(counts.sum(axis=1)).ravel(), 1)
+    
+    terms_list = list(vocabulary)
+    frequencies, n_docs = get_document_frequencies(terms_list)
+    idf = np.array([inverse_document_frequency(frequencies[term], n_docs) for term in terms_list])
+    
+    position_rows, position_cols, position_index = zip(*first_positions) if first_positions else ((), (), ())
+    positions = sparse.csr_matrix(
+        (1.0 + 1.0 / np.log2(2 + np.array(position_index, dtype=float)), (position_rows, position_cols)),
+        shape=shape
+    )
+    
+    scores = sparse.diags(1.0 / lengths) @ counts @ sparse.diags(idf)
+    scores = scores.multiply(positions).tocsr()
+    # Same sparsity pattern as counts, so row slices of both line up
+    scores.sort_indices()
+    
+    results = []
+    for row, (words, _) in enumerate(tokenized):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        row_cols, row_scores = scores.indices[start:end], scores.data[start:end]
+        row_counts = counts.data[counts.indptr[row]:counts.indptr[row + 1]]
+        top = np.argsort(-row_scores, kind="stable")[:num_keywords]
+        scored = [
+            (terms_list[row_cols[i]], int(row_counts[i]), float(row_scores[i]))
+            for i in top
+        ]
+        results.append(keyword_result(words, scored))
+    return results
+
+@instrumented("extract_keywords_ai")
 async def extract_keywords_ai(text: str, num_keywords: int = 10) -> Dict[str, Any]:
     """Extract keywords from text"""
     try:
-        # Simple keyword extraction using word frequency
-        import re
-        from collections import Counter
-        
-        # Clean and tokenize text
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-        
-        # Remove common stop words
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'its', 'our', 'their', 'what', 'where', 'when', 'why', 'how'
-        }
-        
-        filtered_words = [word for word in words if word not in stop_words and len(word) > 3]
-        word_freq = Counter(filtered_words)
-        
-        # Get top keywords
-        top_keywords = word_freq.most_common(num_keywords)
-        
-        keywords = [{"keyword": word, "frequency": freq, "score": freq / len(filtered_words)} for word, freq in top_keywords]
-        
-        return {
-            "keywords": keywords,
-            "total_words": len(words),
-            "unique_words": len(set(words)),
-            "model": "frequency_based",
-            "processing_time": 0.0
-        }
+        return await run_in_threadpool(score_keywords, text, num_keywords)
         
     except Exception as e:
         logger.error(f"Keyword extraction error: {e}")
@@ -417,27 +1205,318 @@ async def extract_keywords_ai(text: str, num_keywords: int = 10) -> Dict[str, An
             "error": str(e)
         }
 
+chat_http_client = None
+news_digest_memo = {"digest": None, "fetched_at": float("-inf")}
+
+# Semantic search (HNSW vector index)
+HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+def embedding_text(article: Dict) -> str:
+    """Text embedded for an article: title plus its description without markup"""
+    description = HTML_TAG_PATTERN.sub(" ", article.get("description") or "")
+    return " ".join(f"{article.get('title', '')}. {description}".split())[:2000]
+
+class VectorIndex:
+    """HNSW index (cosine) of article embeddings, saved to disk, with the
+    article metadata for results in a SQLite file alongside"""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.index_path = directory / "articles.hnsw"
+        self.lock = threading.RLock()
+        self.index = None
+        self.loaded_mtime = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(directory / "articles.db", check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                label INTEGER PRIMARY KEY,
+                article_id TEXT UNIQUE NOT NULL,
+                url TEXT, title TEXT, source TEXT, category TEXT, published_at TEXT
+            )
+        """)
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.db.commit()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def reload_if_changed(self):
+        """Load the saved index if another process wrote a newer one"""
+        with self.lock:
+            mtime = self.index_path.stat().st_mtime if self.index_path.exists() else None
+            if mtime is None or mtime == self.loaded_mtime:
+                return
+            index = hnswlib.Index(space="cosine", dim=int(self.get_meta("dim")))
+            index.load_index(str(self.index_path), max_elements=int(self.get_meta("capacity")))
+            index.set_ef(VECTOR_HNSW_EF_SEARCH)
+            self.index = index
+            self.loaded_mtime = mtime
+
+    def count(self) -> int:
+        return self.index.get_current_count() if self.index is not None else 0
+
+    def missing_ids(self, article_ids: List[str]) -> set:
+        """Ids of these articles that are not indexed yet"""
+        known = set()
+        with self.lock:
+            for i in range(0, len(article_ids), 500):
+                chunk = article_ids[i:i + 500]
+                rows = self.db.execute(
+                    f"SELECT article_id FROM articles WHERE article_id IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                known.update(row[0] for row in rows)
+        return set(article_ids) - known
+
+    def add(self, articles: List[Dict], vectors):
+        """Append articles and their embeddings (rows of vectors) to the index"""
+        with self.lock:
+            if self.index is None:
+                self.index = hnswlib.Index(space="cosine", dim=vectors.shape[1])
+                self.index.init_index(
+                    max_elements=VECTOR_INDEX_CAPACITY, M=VECTOR_HNSW_M, ef_construction=VECTOR_HNSW_EF_CONSTRUCTION
+                )
+                self.index.set_ef(VECTOR_HNSW_EF_SEARCH)
+                self.set_meta("dim", str(vectors.shape[1]))
+            
+            if self.count() + len(articles) > self.index.get_max_elements():
+                self.index.resize_index(max(self.index.get_max_elements() * 2, self.count() + len(articles)))
+            # Never hand out a label a metadata row already holds
+            max_label = self.db.execute("SELECT MAX(label) FROM articles").fetchone()[0]
+            start = max(self.count(), max_label + 1 if max_label is not None else 0)
+            labels = np.arange(start, start + len(articles))
+            self.index.add_items(vectors, labels)
+            self.db.executemany(
+                "INSERT OR IGNORE INTO articles (label, article_id, url, title, source, category, published_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (int(label), a["id"], a.get("url"), a.get("title"), a.get("source"),
+                     a.get("ai_category") or a.get("category"), str(a.get("published_at") or ""))
+                    for label, a in zip(labels, articles)
+                ]
+            )
+            self.set_meta("capacity", str(self.index.get_max_elements()))
+
+    def save(self):
+        """Replace the index file atomically, then commit the new metadata, so committed
+        rows only ever name labels in the saved index; readers ignore index labels
+        that have no metadata row yet"""
+        with self.lock:
+            tmp_path = self.index_path.with_suffix(".tmp")
+            self.index.save_index(str(tmp_path))
+            os.replace(tmp_path, self.index_path)
+            self.loaded_mtime = self.index_path.stat().st_mtime
+            self.db.commit()
+
+    def discard_unindexed(self) -> int:
+        """Drop metadata rows for labels missing from the loaded index (left by a crash
+        between writes), so their articles are indexed again; writer only"""
+        with self.lock:
+            deleted = self.db.execute("DELETE FROM articles WHERE label >= ?", (self.count(),)).rowcount
+            self.db.commit()
+        return deleted
+
+    def search(self, vector: List[float], limit: int, category: Optional[str] = None,
+               exclude_label: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Nearest articles to a normalized embedding, best first"""
+        query = np.asarray([vector], dtype=np.float32)
+        with self.lock:
+            count = self.count()
+            k = min(count, limit + (1 if exclude_label is not None else 0))
+            while k:
+                labels, distances = self.index.knn_query(query, k=k)
+                scores = {int(label): 1.0 - float(distance) for label, distance in zip(labels[0], distances[0])}
+                scores.pop(exclude_label, None)
+                rows = self.db.execute(
+                    f"SELECT label, article_id, url, title, source, category, published_at FROM articles "
+                    f"WHERE label IN ({','.join('?' * len(scores))})", list(scores)
+                ).fetchall() if scores else []
+                if category:
+                    rows = [row for row in rows if row[5] == category]
+                # A category filter applies after the ANN lookup: widen the search until it fills
+                if len(rows) >= limit or k >= count:
+                    break
+                k = min(count, k * 4)
+            else:
+                return []
+        
+        results = [
+            {"id": article_id, "url": url, "title": title, "source": source, "category": row_category,
+             "published_at": published_at, "score": round(scores[label], 4)}
+            for label, article_id, url, title, source, row_category, published_at in rows
+        ]
+        results.sort(key=lambda r: r["score"], reverse=True)
+        return results[:limit]
+
+    def related(self, article_id: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Articles nearest to an indexed article; None if it is not indexed"""
+        with self.lock:
+            row = self.db.execute("SELECT label FROM articles WHERE article_id = ?", (article_id,)).fetchone()
+            if row is None or row[0] >= self.count():
+                return None
+            vector = self.index.get_items([row[0]])[0]
+        return self.search(vector, limit, exclude_label=row[0])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "articles": self.count(),
+            "capacity": self.index.get_max_elements() if self.index is not None else 0,
+            "model": EMBEDDING_MODEL_NAME
+        }
+
+class RemoteVectorIndex:
+    """VectorIndex proxy for the index owned by the model server"""
+
+    def call(self, operation: str, **payload):
+        response = get_model_server_client().post(f"/vectors/{operation}", json=payload)
+        response.raise_for_status()
+        return response.json()["result"]
+
+    def reload_if_changed(self):
+        pass
+
+    def search(self, vector: List[float], limit: int, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.call("search", vector=[float(v) for v in vector], limit=limit, category=category)
+
+    def related(self, article_id: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        return self.call("related", article_id=article_id, limit=limit)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.call("stats")
+
+vector_index = None
+
+def get_vector_index():
+    """The article vector index (one directory per embedding model), or None without hnswlib"""
+    global vector_index
+    if vector_index is None and hnswlib is not None:
+        if MODEL_HOST_MODE == "server":
+            vector_index = RemoteVectorIndex()
+        else:
+            vector_index = VectorIndex(VECTOR_INDEX_DIR / re.sub(r"\W+", "-", EMBEDDING_MODEL_NAME))
+    return vector_index
+
+async def embed_texts(texts: List[str]):
+    """Normalized float32 embeddings, one row per text; None if the model is unavailable"""
+    model = await run_in_threadpool(load_embedding_model)
+    if model is None:
+        return None
+    
+    start_time = time.perf_counter()
+    vectors = await run_in_threadpool(model, texts)
+    INFERENCE_SECONDS.labels("embed_texts").observe(time.perf_counter() - start_time)
+    BATCH_SIZE.labels("embedding").observe(len(texts))
+    return np.asarray(vectors, dtype=np.float32)
+
+async def sync_vector_index(snapshot: Dict) -> int:
+    """Embed and index the snapshot's articles that are not indexed yet; returns how many"""
+    index = get_vector_index()
+    if index is None:
+        return 0
+    
+    await run_in_threadpool(index.reload_if_changed)
+    discarded = await run_in_threadpool(index.discard_unindexed)
+    if discarded:
+        logger.warning(f"⚠️ Dropped {discarded} vector index rows with no saved embedding")
+    articles = {a["id"]: a for a in snapshot["articles"] if a.get("id")}
+    missing = await run_in_threadpool(index.missing_ids, list(articles))
+    pending = [articles[article_id] for article_id in articles if article_id in missing]
+    
+    for i in range(0, len(pending), EMBEDDING_BATCH_SIZE):
+        batch = pending[i:i + EMBEDDING_BATCH_SIZE]
+        async with model_gates["embedding"].slot():
+            vectors = await embed_texts([embedding_text(a) for a in batch])
+        if vectors is None:
+            return 0
+        await run_in_threadpool(index.add, batch, vectors)
+    
+    if pending:
+        await run_in_threadpool(index.save)
+        logger.info(f"🧭 Indexed {len(pending)} articles ({index.count()} total)")
+    return len(pending)
+
+async def news_sync_loop():
+    """Feed new snapshot articles into the keyword corpus and the vector index as
+    news-service publishes them; one worker syncs at a time"""
+    last_version = None
+    while True:
+        try:
+            version = await get_from_cache(NEWS_VERSION_KEY)
+            if version and version.get("version") != last_version:
+                token = uuid.uuid4().hex
+                if acquire_compute_lock(VECTOR_SYNC_LOCK, token):
+                    try:
+                        snapshot = await get_from_cache(NEWS_SNAPSHOT_KEY)
+                        if snapshot:
+                            added = await run_in_threadpool(add_articles_to_keyword_corpus, snapshot["articles"])
+                            if added:
+                                logger.info(f"🔑 Added {added} articles to the keyword corpus")
+                            await sync_vector_index(snapshot)
+                        last_version = version.get("version")
+                    finally:
+                        release_compute_lock(VECTOR_SYNC_LOCK, token)
+        except Exception as e:
+            logger.error(f"News snapshot sync error: {e}")
+        await asyncio.sleep(VECTOR_SYNC_INTERVAL)
+
+def get_chat_http_client() -> httpx.AsyncClient:
+    """Get the pooled HTTP client shared by all chat upstream calls"""
+    global chat_http_client
+    if chat_http_client is None:
+        chat_http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(CHAT_TIMEOUT, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=CHAT_MAX_CONNECTIONS,
+                max_keepalive_connections=CHAT_MAX_CONNECTIONS
+            )
+        )
+    return chat_http_client
+
+def resolve_chat_upstream(model: str) -> Optional[Dict[str, str]]:
+    """Pick the OpenAI-compatible upstream for a model, or None in demo mode"""
+    # Try Grok API first if available
+    if GROK_API_KEY and "grok" in model.lower():
+        return {"base_url": GROK_API_BASE, "api_key": GROK_API_KEY, "model": "grok-beta"}
+    # Try OpenAI if available
+    if OPENAI_API_KEY:
+        return {"base_url": OPENAI_API_BASE, "api_key": OPENAI_API_KEY, "model": model}
+    return None
+
+def build_chat_payload(upstream: Dict[str, str], messages: List[Dict], **kwargs) -> Dict[str, Any]:
+    """Build a chat completions request body"""
+    return {
+        "model": upstream["model"],
+        "messages": messages,
+        "max_tokens": kwargs.get("max_tokens", 1000),
+        "temperature": kwargs.get("temperature", 0.7)
+    }
+
+DEMO_MODE_RESPONSE = "I'm currently running in demo mode. Please configure an AI API key to enable full chat functionality."
+
+@instrumented("chat_with_ai")
 async def chat_with_ai(messages: List[Dict], model: str = "gpt-3.5-turbo", **kwargs) -> Dict[str, Any]:
     """Chat with AI using external API"""
     try:
-        start_time = datetime.utcnow()
-        
-        # Try Grok API first if available
-        if GROK_API_KEY and "grok" in model.lower():
-            response = await chat_with_grok(messages, **kwargs)
-        # Try OpenAI if available
-        elif OPENAI_API_KEY:
-            response = await chat_with_openai(messages, model, **kwargs)
-        else:
+        start_time = time.perf_counter()
+        
+        upstream = resolve_chat_upstream(model)
+        if upstream is None:
             # Fallback response
             return {
-                "response": "I'm currently running in demo mode. Please configure an AI API key to enable full chat functionality.",
+                "response": DEMO_MODE_RESPONSE,
                 "model": "demo_mode",
                 "processing_time": 0.0,
                 "token_usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
             }
         
-        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        response = await chat_completion(upstream, messages, **kwargs)
+        
+        processing_time = time.perf_counter() - start_time
         response["processing_time"] = processing_time
         
         return response
@@ -451,58 +1530,64 @@ async def chat_with_ai(messages: List[Dict], model: str = "gpt-3.5-turbo", **kwa
             "error": str(e)
         }
 
-async def chat_with_grok(messages: List[Dict], **kwargs) -> Dict[str, Any]:
-    """Chat with Grok API"""
+async def chat_completion(upstream: Dict[str, str], messages: List[Dict], **kwargs) -> Dict[str, Any]:
+    """Chat with an OpenAI-compatible API (Grok or OpenAI) over the pooled client"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                "https://api.x.ai/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {GROK_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "grok-beta",
-                    "messages": messages,
-                    "max_tokens": kwargs.get("max_tokens", 1000),
-                    "temperature": kwargs.get("temperature", 0.7)
-                }
-            )
-            response.raise_for_status()
-            
+        response = await get_chat_http_client().post(
+            f"{upstream['base_url']}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {upstream['api_key']}",
+                "Content-Type": "application/json"
+            },
+            json=build_chat_payload(upstream, messages, **kwargs)
+        )
+        response.raise_for_status()
         data = response.json()
         
         return {
             "response": data["choices"][0]["message"]["content"],
-            "model": "grok-beta",
+            "model": upstream["model"],
             "token_usage": data.get("usage", {})
         }
         
     except Exception as e:
-        logger.error(f"Grok API error: {e}")
+        logger.error(f"Chat API error ({upstream['base_url']}): {e}")
         raise e
 
-async def chat_with_openai(messages: List[Dict], model: str, **kwargs) -> Dict[str, Any]:
-    """Chat with OpenAI API"""
-    try:
-        openai.api_key = OPENAI_API_KEY
-        
-        response = await openai.ChatCompletion.acreate(
-            model=model,
-            messages=messages,
-            max_tokens=kwargs.get("max_tokens", 1000),
-            temperature=kwargs.get("temperature", 0.7)
-        )
-        
-        return {
-            "response": response.choices[0].message.content,
-            "model": model,
-            "token_usage": dict(response.usage)
-        }
-        
-    except Exception as e:
-        logger.error(f"OpenAI API error: {e}")
-        raise e
+async def stream_chat_with_ai(messages: List[Dict], model: str = "gpt-3.5-turbo", **kwargs):
+    """Stream chat completion text deltas from the upstream API"""
+    upstream = resolve_chat_upstream(model)
+    if upstream is None:
+        yield DEMO_MODE_RESPONSE
+        return
+    
+    payload = build_chat_payload(upstream, messages, **kwargs)
+    payload["stream"] = True
+    
+    async with get_chat_http_client().stream(
+        "POST",
+        f"{upstream['base_url']}/chat/completions",
+        headers={
+            "Authorization": f"Bearer {upstream['api_key']}",
+            "Content-Type": "application/json"
+        },
+        json=payload
+    ) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+            if delta:
+                yield delta
+
+def format_sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format a server-sent event"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, default=str)}\n\n"
 
 # API Routes
 @app.get("/", response_model=Dict)
@@ -519,16 +1604,24 @@ async def root():
             "content_classification",
             "keyword_extraction",
             "ai_chat",
-            "comprehensive_analysis"
+            "comprehensive_analysis",
+            "semantic_search"
         ],
         "endpoints": {
             "health": "/health",
+            "ready": "/ready",
+            "metrics": "/metrics",
             "sentiment": "/api/ai/sentiment",
             "summarize": "/api/ai/summarize",
             "classify": "/api/ai/classify",
             "keywords": "/api/ai/keywords",
+            "keywords_batch": "/api/ai/keywords/batch",
+            "cascade_stats": "/api/ai/cascade/stats",
+            "queue": "/api/ai/queue",
             "chat": "/api/ai/chat",
-            "analyze": "/api/ai/analyze"
+            "analyze": "/api/ai/analyze",
+            "semantic_search": "/api/news/semantic-search",
+            "related": "/api/news/{id}/related"
         }
     }
 
@@ -549,159 +1642,420 @@ async def health_check():
             "hugging_face": bool(HUGGING_FACE_API_KEY)
         },
         "models": {
+            "host_mode": MODEL_HOST_MODE,
             "sentiment_loaded": sentiment_model is not None,
             "summarization_loaded": summarization_model is not None,
-            "classification_loaded": classification_model is not None
-        }
+            "classification_loaded": classification_model is not None,
+            "embedding_loaded": embedding_model is not None,
+            "status": model_status
+        },
+        "vector_index": vector_index.stats() if isinstance(vector_index, VectorIndex) else None
     }
 
-@app.post("/api/ai/sentiment", response_model=AIResponse)
-async def analyze_sentiment(input_data: TextInput):
-    """Analyze sentiment of text"""
-    cache_key = generate_cache_key("sentiment", input_data.text)
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics (aggregated across workers when PROMETHEUS_MULTIPROC_DIR is set)"""
+    return metrics_response()
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint reporting each model's warm-up state"""
+    ready = models_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "warming_up",
+            "host_mode": MODEL_HOST_MODE,
+            "models": model_status,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    )
+
+def acquire_compute_lock(lock_key: str, token: str) -> bool:
+    """Try to become the worker that computes a result; True without Redis"""
+    if not redis_client:
+        return True
     
-    # Try cache first
-    cached_result = await get_from_cache(cache_key)
-    if cached_result:
-        return AIResponse(
-            result=cached_result["result"],
-            model_used=cached_result.get("model_used"),
-            cached=True
-        )
+    try:
+        return bool(redis_client.set(lock_key, token, nx=True, ex=COALESCE_LOCK_TTL))
+    except Exception as e:
+        logger.error(f"AI compute lock error for key {lock_key}: {e}")
+        return True
+
+def release_compute_lock(lock_key: str, token: str):
+    """Release a compute lock if this worker still owns it"""
+    if not redis_client:
+        return
     
-    # Perform analysis
-    start_time = datetime.utcnow()
-    result = await analyze_sentiment_ai(input_data.text)
-    processing_time = (datetime.utcnow() - start_time).total_seconds()
+    try:
+        redis_client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+    except Exception as e:
+        logger.error(f"AI compute lock release error for key {lock_key}: {e}")
+
+def compute_lock_held(lock_key: str) -> bool:
+    """Whether another worker still holds a compute lock"""
+    try:
+        return bool(redis_client.exists(lock_key))
+    except Exception:
+        return False
+
+async def compute_analysis(cache_key: str, compute) -> tuple:
+    """Compute and store a result, or wait for the worker that already is"""
+    lock_key = f"lock:{cache_key}"
+    token = uuid.uuid4().hex
+    acquired = acquire_compute_lock(lock_key, token)
     
-    # Cache result
-    cache_data = {
-        "result": result,
-        "model_used": result.get("model"),
-        "timestamp": datetime.utcnow().isoformat()
-    }
-    await set_cache(cache_key, cache_data)
+    if not acquired:
+        # Another worker is running the same inference; poll for its result
+        deadline = time.monotonic() + COALESCE_WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(COALESCE_POLL_INTERVAL)
+            cached_result = await get_from_cache(cache_key)
+            if cached_result:
+                return cached_result["result"], True
+            if not compute_lock_held(lock_key):
+                break
     
-    return AIResponse(
-        result=result,
-        model_used=result.get("model"),
-        processing_time=processing_time
-    )
+    try:
+        result = await compute()
+        
+        # Fallback results should not outlive the failure that produced them
+        if "error" not in result and result.get("model") not in FALLBACK_MODELS and not result.get("degraded"):
+            await set_cache(cache_key, {
+                "result": result,
+                "model_used": result.get("model"),
+                "timestamp": datetime.utcnow().isoformat()
+            })
+        return result, False
+    finally:
+        if acquired:
+            release_compute_lock(lock_key, token)
 
-@app.post("/api/ai/summarize", response_model=AIResponse)
-async def summarize_text(input_data: TextInput, max_length: int = Query(130, ge=50, le=500)):
-    """Summarize text"""
-    cache_key = generate_cache_key(f"summarize:{max_length}", input_data.text)
+async def cached_analysis(analysis: str, text: str, params: str, compute) -> tuple:
+    """Read or fill the shared result store for one analysis; returns (result, cached)
+
+    Concurrent identical requests share one computation: within a worker they
+    await the same future, across workers they wait on a Redis lock. If the
+    request computing it is cancelled, a waiting request takes over.
+    """
+    cache_key = analysis_cache_key(analysis, text, params)
     
     # Try cache first
     cached_result = await get_from_cache(cache_key)
     if cached_result:
-        return AIResponse(
-            result=cached_result["result"],
-            model_used=cached_result.get("model_used"),
-            cached=True
-        )
+        return cached_result["result"], True
     
-    # Perform summarization
-    start_time = datetime.utcnow()
-    result = await summarize_text_ai(input_data.text, max_length)
-    processing_time = (datetime.utcnow() - start_time).total_seconds()
+    inflight = inflight_analyses.get(cache_key)
+    while inflight is not None:
+        try:
+            # Coalesced onto a fresh computation, so not a cache hit
+            return await asyncio.shield(inflight), False
+        except asyncio.CancelledError:
+            if not inflight.cancelled() or asyncio.current_task().cancelling():
+                raise
+        inflight = inflight_analyses.get(cache_key)
     
-    # Cache result
-    cache_data = {
-        "result": result,
-        "model_used": result.get("model"),
-        "timestamp": datetime.utcnow().isoformat()
-    }
-    await set_cache(cache_key, cache_data)
+    future = asyncio.get_running_loop().create_future()
+    inflight_analyses[cache_key] = future
+    try:
+        result, cached = await compute_analysis(cache_key, compute)
+        future.set_result(result)
+        return result, cached
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved in case nobody was waiting
+        raise
+    finally:
+        del inflight_analyses[cache_key]
+
+def sentiment_analysis(text: str):
+    """Cached sentiment analysis"""
+    params = f"cascade:{CASCADE_SENTIMENT_THRESHOLD}" if CASCADE_ENABLED else ""
+    return cached_analysis("sentiment", text, params, lambda: route_sentiment(text))
+
+def summary_analysis(text: str, max_length: int = 130):
+    """Cached summarization"""
+    return cached_analysis("summary", text, str(max_length), lambda: admit(
+        "summarization",
+        lambda: summarize_text_ai(text, max_length),
+        lambda: truncate_summary(text, max_length)
+    ))
+
+def classification_analysis(text: str, categories: Optional[List[str]] = None):
+    """Cached classification"""
+    params = ",".join(sorted(categories)) if categories else "default"
+    if CASCADE_ENABLED:
+        params += f":cascade:{CASCADE_CLASSIFY_THRESHOLD}"
+    return cached_analysis("classification", text, params, lambda: route_classification(text, categories))
+
+def keywords_analysis(text: str, num_keywords: int = 10):
+    """Cached keyword extraction"""
+    # Scores depend on the corpus, so cached results expire with its generation
+    params = f"{num_keywords}:corpus:{keyword_corpus_generation()}"
+    return cached_analysis("keywords", text, params, lambda: extract_keywords_ai(text, num_keywords))
+
+async def analysis_response(analysis) -> AIResponse:
+    """Run a cached analysis and wrap it in an AIResponse"""
+    start_time = time.perf_counter()
+    result, cached = await analysis
+    processing_time = time.perf_counter() - start_time
     
     return AIResponse(
         result=result,
         model_used=result.get("model"),
-        processing_time=processing_time
+        cached=cached,
+        processing_time=0.0 if cached else processing_time
     )
 
+@app.post("/api/ai/sentiment", response_model=AIResponse)
+async def analyze_sentiment(input_data: TextInput):
+    """Analyze sentiment of text"""
+    return await analysis_response(sentiment_analysis(input_data.text))
+
+@app.post("/api/ai/summarize", response_model=AIResponse)
+async def summarize_text(input_data: TextInput, max_length: int = Query(130, ge=50, le=500)):
+    """Summarize text"""
+    return await analysis_response(summary_analysis(input_data.text, max_length))
+
 @app.post("/api/ai/classify", response_model=AIResponse)
 async def classify_text(input_data: TextInput, categories: List[str] = Query(None)):
     """Classify text into categories"""
-    cache_key = generate_cache_key(f"classify:{categories}", input_data.text)
-    
-    # Try cache first
-    cached_result = await get_from_cache(cache_key)
-    if cached_result:
-        return AIResponse(
-            result=cached_result["result"],
-            model_used=cached_result.get("model_used"),
-            cached=True
-        )
-    
-    # Perform classification
-    start_time = datetime.utcnow()
-    result = await classify_text_ai(input_data.text, categories)
-    processing_time = (datetime.utcnow() - start_time).total_seconds()
-    
-    # Cache result
-    cache_data = {
-        "result": result,
-        "model_used": result.get("model"),
-        "timestamp": datetime.utcnow().isoformat()
-    }
-    await set_cache(cache_key, cache_data)
+    return await analysis_response(classification_analysis(input_data.text, categories))
+
+@app.post("/api/ai/keywords", response_model=AIResponse)
+async def extract_keywords(input_data: TextInput, num_keywords: int = Query(10, ge=1, le=50)):
+    """Extract keywords from text"""
+    return await analysis_response(keywords_analysis(input_data.text, num_keywords))
+
+@app.post("/api/ai/keywords/batch", response_model=AIResponse)
+async def extract_keywords_batch(input_data: BatchTextInput, num_keywords: int = Query(10, ge=1, le=50)):
+    """Extract keywords from a batch of documents, optionally growing the corpus"""
+    start_time = time.perf_counter()
+    BATCH_SIZE.labels("keywords").observe(len(input_data.texts))
+    documents = await run_in_threadpool(score_keywords_batch, input_data.texts, num_keywords, input_data.update_corpus)
+    processing_time = time.perf_counter() - start_time
     
     return AIResponse(
-        result=result,
-        model_used=result.get("model"),
+        result={"documents": documents, "total": len(documents)},
+        model_used="tfidf",
         processing_time=processing_time
     )
 
-@app.post("/api/ai/keywords", response_model=AIResponse)
-async def extract_keywords(input_data: TextInput, num_keywords: int = Query(10, ge=1, le=50)):
-    """Extract keywords from text"""
-    cache_key = generate_cache_key(f"keywords:{num_keywords}", input_data.text)
+@app.get("/api/ai/queue")
+async def get_queue_status():
+    """Per-model inference queue depth for this worker (autoscaling signal)"""
+    gates = {name: gate.snapshot() for name, gate in model_gates.items()}
+    return {
+        "status": "success",
+        "policy": SATURATION_POLICY,
+        "queue_depth": sum(gate["waiting"] for gate in gates.values()),
+        "models": gates,
+        "timestamp": datetime.utcnow()
+    }
+
+@app.get("/api/ai/cascade/stats")
+async def get_cascade_stats():
+    """Cascade escalation rates and per-tier latency for this worker"""
+    report = {}
+    for task, tiers in cascade_stats.items():
+        total = sum(tier["count"] for tier in tiers.values())
+        report[task] = {
+            "requests": total,
+            "escalation_rate": round(tiers["escalated"]["count"] / total, 3) if total else 0.0,
+            "tiers": {
+                name: {
+                    "count": tier["count"],
+                    "avg_latency": round(tier["total_time"] / tier["count"], 4) if tier["count"] else 0.0
+                }
+                for name, tier in tiers.items()
+            }
+        }
     
-    # Try cache first
-    cached_result = await get_from_cache(cache_key)
-    if cached_result:
-        return AIResponse(
-            result=cached_result["result"],
-            model_used=cached_result.get("model_used"),
-            cached=True
-        )
+    return {
+        "status": "success",
+        "enabled": CASCADE_ENABLED,
+        "thresholds": {
+            "sentiment": CASCADE_SENTIMENT_THRESHOLD,
+            "classification": CASCADE_CLASSIFY_THRESHOLD
+        },
+        "stats": report,
+        "timestamp": datetime.utcnow()
+    }
+
+def require_vector_index():
+    """The vector index, or 503 when semantic search is not set up here"""
+    index = get_vector_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Semantic search needs hnswlib")
+    return index
+
+@app.get("/api/news/semantic-search", response_model=AIResponse)
+async def semantic_search(
+    q: str = Query(..., min_length=2, max_length=500),
+    limit: int = Query(10, ge=1, le=50),
+    category: Optional[str] = Query(None)
+):
+    """Articles closest in meaning to a query (approximate nearest neighbours)"""
+    start_time = time.perf_counter()
+    index = require_vector_index()
     
-    # Perform keyword extraction
-    start_time = datetime.utcnow()
-    result = await extract_keywords_ai(input_data.text, num_keywords)
-    processing_time = (datetime.utcnow() - start_time).total_seconds()
+    try:
+        async with model_gates["embedding"].slot():
+            vectors = await embed_texts([q])
+    except ModelSaturated as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    if vectors is None:
+        raise HTTPException(status_code=503, detail="Embedding model unavailable")
     
-    # Cache result
-    cache_data = {
-        "result": result,
-        "model_used": result.get("model"),
-        "timestamp": datetime.utcnow().isoformat()
-    }
-    await set_cache(cache_key, cache_data)
+    await run_in_threadpool(index.reload_if_changed)
+    articles = await run_in_threadpool(index.search, vectors[0], limit, category)
+    return AIResponse(
+        result={"query": q, "articles": articles, "count": len(articles)},
+        model_used=EMBEDDING_MODEL_NAME,
+        processing_time=time.perf_counter() - start_time
+    )
+
+@app.get("/api/news/{article_id}/related", response_model=AIResponse)
+async def related_articles(article_id: str, limit: int = Query(10, ge=1, le=50)):
+    """Articles closest in meaning to an indexed article"""
+    start_time = time.perf_counter()
+    index = require_vector_index()
     
+    await run_in_threadpool(index.reload_if_changed)
+    articles = await run_in_threadpool(index.related, article_id, limit)
+    if articles is None:
+        raise HTTPException(status_code=404, detail=f"Article {article_id} is not indexed")
     return AIResponse(
-        result=result,
-        model_used=result.get("model"),
-        processing_time=processing_time
+        result={"id": article_id, "articles": articles, "count": len(articles)},
+        model_used=EMBEDDING_MODEL_NAME,
+        processing_time=time.perf_counter() - start_time
     )
 
+def chat_cache_key(messages: List[Dict], input_data: ChatInput, context_version: Optional[str]) -> Optional[str]:
+    """Cache key for an opt-in deterministic chat request, or None if not cacheable"""
+    if not input_data.cache or input_data.temperature != 0:
+        return None
+    
+    canonical = json.dumps({
+        "messages": [{"role": m["role"], "content": " ".join(m["content"].split())} for m in messages],
+        "model": input_data.model,
+        "max_tokens": input_data.max_tokens,
+        "context": context_version
+    }, sort_keys=True, separators=(",", ":"))
+    return generate_cache_key("chat", canonical)
+
+async def get_news_digest() -> Optional[Dict]:
+    """Get the headline digest precomputed by news-service, memoized per process"""
+    if time.monotonic() - news_digest_memo["fetched_at"] < NEWS_DIGEST_REFRESH:
+        return news_digest_memo["digest"]
+    
+    digest = await get_from_cache(NEWS_DIGEST_KEY)
+    news_digest_memo.update(digest=digest, fetched_at=time.monotonic())
+    return digest
+
+async def add_news_context(messages: List[Dict]) -> tuple:
+    """Prepend the news digest as a system message; returns (messages, digest version)"""
+    digest = await get_news_digest()
+    if not digest:
+        return messages, None
+    
+    # The digest goes first and is byte-identical between calls, so upstream
+    # prompt-prefix caching can reuse it across conversations
+    context_message = {
+        "role": "system",
+        "content": f"Current news headlines (updated {digest['last_updated']}):\n{digest['text']}"
+    }
+    return [context_message] + messages, digest["version"]
+
+async def stream_chat_events(messages: List[Dict], input_data: ChatInput, cache_key: Optional[str] = None):
+    """Relay upstream chat deltas as SSE events, ending with a done event"""
+    start_time = time.monotonic()
+    try:
+        cached_result = await get_from_cache(cache_key) if cache_key else None
+        if cached_result:
+            yield format_sse({"delta": cached_result["result"]["response"]})
+            yield format_sse({
+                "model": cached_result.get("model_used"),
+                "cached": True,
+                "processing_time": round(time.monotonic() - start_time, 3)
+            }, event="done")
+            return
+        
+        deltas = []
+        async for delta in stream_chat_with_ai(
+            messages=messages,
+            model=input_data.model,
+            temperature=input_data.temperature,
+            max_tokens=input_data.max_tokens
+        ):
+            deltas.append(delta)
+            yield format_sse({"delta": delta})
+        
+        # Report the model that answered, as the non-stream path does
+        upstream = resolve_chat_upstream(input_data.model)
+        model_used = upstream["model"] if upstream else "demo_mode"
+        if cache_key and upstream:
+            await set_cache(cache_key, {
+                "result": {"response": "".join(deltas), "model": model_used},
+                "model_used": model_used,
+                "timestamp": datetime.utcnow().isoformat()
+            }, ttl=CHAT_CACHE_TTL)
+        yield format_sse({
+            "model": model_used,
+            "cached": False,
+            "processing_time": round(time.monotonic() - start_time, 3)
+        }, event="done")
+    except Exception as e:
+        logger.error(f"Chat stream error: {e}")
+        yield format_sse({"message": str(e)}, event="error")
+
 @app.post("/api/ai/chat", response_model=AIResponse)
 async def chat_with_ai_endpoint(input_data: ChatInput):
     """Chat with AI"""
     # Convert Pydantic models to dict for processing
     messages = [{"role": msg.role, "content": msg.content} for msg in input_data.messages]
     
-    # For chat, we don't cache as conversations are unique
-    start_time = datetime.utcnow()
+    context_version = None
+    if input_data.include_context:
+        messages, context_version = await add_news_context(messages)
+    
+    # Conversations are usually unique, so only opted-in temperature=0 requests are cached
+    cache_key = chat_cache_key(messages, input_data, context_version)
+    
+    if input_data.stream:
+        return StreamingResponse(
+            stream_chat_events(messages, input_data, cache_key),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    if cache_key:
+        cached_result = await get_from_cache(cache_key)
+        if cached_result:
+            return AIResponse(
+                result=cached_result["result"],
+                model_used=cached_result.get("model_used"),
+                cached=True
+            )
+    
+    start_time = time.perf_counter()
     result = await chat_with_ai(
         messages=messages,
         model=input_data.model,
         temperature=input_data.temperature,
         max_tokens=input_data.max_tokens
     )
-    processing_time = (datetime.utcnow() - start_time).total_seconds()
+    processing_time = time.perf_counter() - start_time
+    
+    if cache_key and result.get("model") not in ("error_fallback", "demo_mode"):
+        await set_cache(cache_key, {
+            "result": result,
+            "model_used": result.get("model"),
+            "timestamp": datetime.utcnow().isoformat()
+        }, ttl=CHAT_CACHE_TTL)
     
     return AIResponse(
         result=result,
@@ -712,73 +2066,53 @@ async def chat_with_ai_endpoint(input_data: ChatInput):
 @app.post("/api/ai/analyze", response_model=AIResponse)
 async def comprehensive_analysis(input_data: AnalysisInput):
     """Comprehensive text analysis"""
-    cache_key = generate_cache_key(f"analysis:{input_data.analysis_type}", input_data.text)
+    if input_data.analysis_type != "comprehensive":
+        analysis = {
+            "sentiment": sentiment_analysis,
+            "summary": summary_analysis,
+            "category": classification_analysis,
+            "keywords": keywords_analysis
+        }.get(input_data.analysis_type)
+        if analysis is None:
+            raise HTTPException(status_code=400, detail="Invalid analysis type")
+        return await analysis_response(analysis(input_data.text))
     
-    # Try cache first
-    cached_result = await get_from_cache(cache_key)
-    if cached_result:
-        return AIResponse(
-            result=cached_result["result"],
-            model_used=cached_result.get("model_used"),
-            cached=True
-        )
+    start_time = time.perf_counter()
     
-    start_time = datetime.utcnow()
+    # Run multiple analyses, each reading and filling the per-analysis store
+    tasks = [
+        sentiment_analysis(input_data.text),
+        summary_analysis(input_data.text),
+        classification_analysis(input_data.text),
+        keywords_analysis(input_data.text)
+    ]
     
-    if input_data.analysis_type == "comprehensive":
-        # Run multiple analyses
-        tasks = [
-            analyze_sentiment_ai(input_data.text),
-            summarize_text_ai(input_data.text),
-            classify_text_ai(input_data.text),
-            extract_keywords_ai(input_data.text)
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        result = {
-            "sentiment": results[0] if not isinstance(results[0], Exception) else {"error": str(results[0])},
-            "summary": results[1] if not isinstance(results[1], Exception) else {"error": str(results[1])},
-            "classification": results[2] if not isinstance(results[2], Exception) else {"error": str(results[2])},
-            "keywords": results[3] if not isinstance(results[3], Exception) else {"error": str(results[3])},
-            "text_stats": {
-                "length": len(input_data.text),
-                "words": len(input_data.text.split()),
-                "sentences": len(input_data.text.split('.')),
-                "characters": len(input_data.text.replace(' ', ''))
-            }
-        }
-        
-        model_used = "comprehensive_analysis"
-    
-    elif input_data.analysis_type == "sentiment":
-        result = await analyze_sentiment_ai(input_data.text)
-        model_used = result.get("model")
-    elif input_data.analysis_type == "summary":
-        result = await summarize_text_ai(input_data.text)
-        model_used = result.get("model")
-    elif input_data.analysis_type == "category":
-        result = await classify_text_ai(input_data.text)
-        model_used = result.get("model")
-    elif input_data.analysis_type == "keywords":
-        result = await extract_keywords_ai(input_data.text)
-        model_used = result.get("model")
-    else:
-        raise HTTPException(status_code=400, detail="Invalid analysis type")
+    results = await asyncio.gather(*tasks, return_exceptions=True)
     
-    processing_time = (datetime.utcnow() - start_time).total_seconds()
+    def unpack(outcome):
+        if isinstance(outcome, BaseException):
+            return {"error": str(outcome) or type(outcome).__name__}
+        return outcome[0]
     
-    # Cache result
-    cache_data = {
-        "result": result,
-        "model_used": model_used,
-        "timestamp": datetime.utcnow().isoformat()
+    result = {
+        "sentiment": unpack(results[0]),
+        "summary": unpack(results[1]),
+        "classification": unpack(results[2]),
+        "keywords": unpack(results[3]),
+        "text_stats": {
+            "length": len(input_data.text),
+            "words": len(input_data.text.split()),
+            "sentences": len(input_data.text.split('.')),
+            "characters": len(input_data.text.replace(' ', ''))
+        }
     }
-    await set_cache(cache_key, cache_data)
+    cached = all(not isinstance(outcome, BaseException) and outcome[1] for outcome in results)
+    processing_time = time.perf_counter() - start_time
     
     return AIResponse(
         result=result,
-        model_used=model_used,
+        model_used="comprehensive_analysis",
+        cached=cached,
         processing_time=processing_time
     )
 
@@ -787,10 +2121,11 @@ async def comprehensive_analysis(input_data: AnalysisInput):
 async def http_exception_handler(request, exc):
     return JSONResponse(
         status_code=exc.status_code,
-        content=ErrorResponse(
+        content=jsonable_encoder(ErrorResponse(
             message=exc.detail,
             error_code=f"HTTP_{exc.status_code}"
-        ).dict()
+        )),
+        headers=getattr(exc, "headers", None)
     )
 
 @app.exception_handler(Exception)
@@ -798,32 +2133,44 @@ async def general_exception_handler(request, exc):
     logger.error(f"Unhandled AI service exception: {exc}")
     return JSONResponse(
         status_code=500,
-        content=ErrorResponse(
+        content=jsonable_encoder(ErrorResponse(
             message="Internal AI service error",
             error_code="INTERNAL_ERROR"
-        ).dict()
+        ))
     )
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled upstream connections"""
+    if chat_http_client is not None:
+        await chat_http_client.aclose()
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     """Initialize AI service on startup"""
     logger.info("🚀 Starting KaiTech AI Service...")
     
-    # Preload models in background
-    asyncio.create_task(preload_models())
+    # Warm up models in background (already resident in preload mode)
+    if MODEL_HOST_MODE != "preload":
+        asyncio.create_task(preload_models())
+    
+    # The model server syncs the keyword corpus and vector index itself in server mode
+    if MODEL_HOST_MODE != "server":
+        asyncio.create_task(news_sync_loop())
     
     logger.info("✅ KaiTech AI Service started successfully")
 
+def warm_up_models():
+    """Load and warm up every model in turn (blocking)"""
+    for name in MODEL_LOADERS:
+        warm_up_model(name)
+
 async def preload_models():
-    """Preload AI models in background"""
+    """Preload AI models in a worker thread so the event loop keeps serving"""
     try:
         logger.info("🔄 Preloading AI models...")
-        load_sentiment_model()
-        await asyncio.sleep(1)  # Prevent blocking
-        load_summarization_model()
-        await asyncio.sleep(1)
-        load_classification_model()
+        await run_in_threadpool(warm_up_models)
         logger.info("✅ AI models preloaded successfully")
     except Exception as e:
         logger.error(f"❌ Failed to preload some AI models: {e}")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+KaiTech Mock Chat Upstream
+Local OpenAI-compatible /chat/completions stub for tests and benchmarks.
+It replies deterministically and streams word by word, so chat latency can be
+measured without calling Grok or OpenAI:
+
+    uvicorn mock_upstream:app --port 8089
+    GROK_API_BASE=http://localhost:8089/v1 OPENAI_API_BASE=http://localhost:8089/v1 \\
+        OPENAI_API_KEY=test python main.py
+"""
+
+import os
+import json
+import time
+import asyncio
+from typing import List, Dict, Any
+
+from fastapi import FastAPI, Body
+from fastapi.responses import StreamingResponse
+
+# Simulated upstream behaviour
+MOCK_FIRST_TOKEN_DELAY = float(os.getenv("MOCK_FIRST_TOKEN_DELAY", "0.05"))
+MOCK_TOKEN_DELAY = float(os.getenv("MOCK_TOKEN_DELAY", "0.01"))
+
+app = FastAPI(
+    title="KaiTech Mock Chat Upstream",
+    description="OpenAI-compatible chat completions stub",
+    version="2.0.0"
+)
+
+def mock_reply(messages: List[Dict[str, Any]]) -> str:
+    """Deterministic reply derived from the last user message"""
+    last_user = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+    return f"Mock reply to: {last_user}"
+
+def usage_for(messages: List[Dict[str, Any]], reply: str) -> Dict[str, int]:
+    """Approximate token usage by word count"""
+    prompt_tokens = sum(len(m.get("content", "").split()) for m in messages)
+    completion_tokens = len(reply.split())
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens
+    }
+
+async def stream_reply(model: str, reply: str):
+    """Yield the reply as OpenAI-style SSE chunks"""
+    await asyncio.sleep(MOCK_FIRST_TOKEN_DELAY)
+    for i, word in enumerate(reply.split(" ")):
+        if i > 0:
+            await asyncio.sleep(MOCK_TOKEN_DELAY)
+        chunk = {
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}]
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+@app.post("/v1/chat/completions")
+async def chat_completions(payload: Dict[str, Any] = Body(...)):
+    """OpenAI-compatible chat completions"""
+    model = payload.get("model", "mock")
+    messages = payload.get("messages", [])
+    reply = mock_reply(messages)
+
+    if payload.get("stream"):
+        return StreamingResponse(stream_reply(model, reply), media_type="text/event-stream")
+
+    words = reply.split(" ")
+    await asyncio.sleep(MOCK_FIRST_TOKEN_DELAY + MOCK_TOKEN_DELAY * (len(words) - 1))
+    return {
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+        "usage": usage_for(messages, reply)
+    }
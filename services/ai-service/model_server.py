@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+KaiTech Model Server
+Hosts the AI service transformer pipelines in a single process so API workers
+share one copy of the weights. Serve it on the Unix socket the API workers use:
+
+    uvicorn model_server:app --uds /tmp/kaitech-models.sock
+
+and start the API with AI_MODEL_HOST_MODE=server.
+"""
+
+import os
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional
+
+# The model server always holds the weights itself
+os.environ["AI_MODEL_HOST_MODE"] = "local"
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+
+import main as ai_service
+
+logger = logging.getLogger(__name__)
+
+app = FastAPI(
+    title="KaiTech Model Server",
+    description="Shared transformer inference for KaiTech AI Service workers",
+    version="2.0.0"
+)
+
+class InferenceInput(BaseModel):
+    args: List[Any] = Field([])
+    kwargs: Dict[str, Any] = Field({})
+
+class VectorSearchInput(BaseModel):
+    vector: List[float]
+    limit: int = Field(10, ge=1, le=50)
+    category: Optional[str] = None
+
+class RelatedInput(BaseModel):
+    article_id: str
+    limit: int = Field(10, ge=1, le=50)
+
+@app.on_event("startup")
+def load_models():
+    """Load every model once before accepting requests"""
+    logger.info("🔄 Loading shared AI models...")
+    ai_service.warm_up_models()
+    logger.info("✅ Shared AI models loaded")
+
+@app.on_event("startup")
+async def start_news_sync():
+    """The model server owns the article vector index and feeds the keyword corpus"""
+    asyncio.create_task(ai_service.news_sync_loop())
+
+@app.get("/health")
+def health_check():
+    """Health check endpoint"""
+    return {
+        "status": "healthy",
+        "service": "KaiTech Model Server",
+        "models": ai_service.model_status
+    }
+
+@app.post("/infer/{model_name}")
+def infer(model_name: str, input_data: InferenceInput):
+    """Run a pipeline call; sync handler so inference runs in the threadpool"""
+    loader = ai_service.MODEL_LOADERS.get(model_name)
+    if loader is None:
+        raise HTTPException(status_code=404, detail=f"Unknown model {model_name}")
+
+    model = loader()
+    if model is None:
+        raise HTTPException(status_code=503, detail=f"Model {model_name} unavailable")
+
+    return {"result": model(*input_data.args, **input_data.kwargs)}
+
+def get_vector_index():
+    index = ai_service.get_vector_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Vector index unavailable")
+    return index
+
+@app.post("/vectors/search")
+def vector_search(input_data: VectorSearchInput):
+    """Nearest indexed articles to an embedding"""
+    return {"result": get_vector_index().search(input_data.vector, input_data.limit, input_data.category)}
+
+@app.post("/vectors/related")
+def vector_related(input_data: RelatedInput):
+    """Nearest indexed articles to an indexed article (null if it is not indexed)"""
+    return {"result": get_vector_index().related(input_data.article_id, input_data.limit)}
+
+@app.post("/vectors/stats")
+def vector_stats():
+    return {"result": get_vector_index().stats()}
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+KaiTech micro benchmarks
+Times hot paths directly at growing corpus sizes: fetch_all_news against the
+fake feed server, calculate_trending_score, snapshot search and keyword
+extraction (per document and sparse batch):
+
+    python bench_micro.py --sizes 1000 10000 100000 --json micro.json
+"""
+
+import os
+import sys
+import json
+import random
+import asyncio
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/kaitech-bench.db")
+os.environ["REDIS_URL"] = os.getenv("BENCH_REDIS_URL", "redis://127.0.0.1:1")
+# Unpooled connections: each asyncio.run() below is a new event loop
+os.environ.setdefault("DB_POOL_SIZE", "0")
+# The fake feed server listens on localhost
+os.environ.setdefault("ALLOW_PRIVATE_DESTINATIONS", "true")
+
+from harness import BackgroundServer, load_service_module, use_local_redis, register_sources, time_call, print_report
+import fake_feeds
+
+def synthetic_articles(count: int, seed: int = 7):
+    """Articles shaped like fetch_rss_feed output"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    words = fake_feeds.TOPIC_WORDS + fake_feeds.FILLER_WORDS
+    articles = []
+    for i in range(count):
+        title = f"{rng.choice(fake_feeds.HEADLINE_PREFIXES)}{' '.join(rng.choices(words, k=8))}"
+        published_at = now - timedelta(minutes=rng.randint(0, 72 * 60))
+        articles.append({
+            "id": str(i),
+            "title": title,
+            "description": " ".join(rng.choices(words, k=60)),
+            "content": "",
+            "url": f"https://example.com/articles/{i}",
+            "source": f"Source {i % 50}",
+            "category": rng.choice(["world", "technology", "business"]),
+            "published_at": published_at,
+            "trending_score": 0.0
+        })
+    return articles
+
+def bench_fetch_all_news(news_service, feeds_url: str, size: int, entries: int) -> float:
+    """Aggregate `size` articles from size/entries fake feeds"""
+    asyncio.run(register_sources(news_service, [
+        {"name": f"Bench {i}", "url": f"{feeds_url}/feeds/bench-{i}.xml?entries={entries}", "category": "world"}
+        for i in range(max(1, size // entries))
+    ]))
+    return time_call(lambda: asyncio.run(news_service.fetch_all_news()), repeat=1)
+
+def bench_trending(news_service, articles) -> float:
+    """Score every article's trending value"""
+    return time_call(lambda: [news_service.calculate_trending_score(a["title"], a["published_at"]) for a in articles])
+
+def bench_search(news_service, redis_client, articles) -> float:
+    """Uncached search over a snapshot of `articles`"""
+    redis_client.set("news:all", json.dumps({
+        "articles": articles, "total": len(articles), "last_updated": datetime.utcnow().isoformat()
+    }, default=str))
+
+    def search():
+        for key in redis_client.scan_iter("news:search:*"):
+            redis_client.delete(key)
+        request = Request({"type": "http", "method": "GET", "path": "/api/news/search", "query_string": b"q=bitcoin&limit=30", "headers": []})
+        asyncio.run(news_service.search_news(request, Response(), q="bitcoin", limit=30, view="full", fields=None))
+    return time_call(search)
+
+def bench_keywords(ai_service, articles) -> float:
+    """Per-document keyword extraction"""
+    return time_call(lambda: [ai_service.score_keywords(a["description"], 10) for a in articles], repeat=1)
+
+def bench_keywords_batch(ai_service, articles, batch_size: int = 500) -> float:
+    """Sparse-matrix batch keyword extraction"""
+    texts = [a["description"] for a in articles]
+    return time_call(lambda: [
+        ai_service.score_keywords_batch(texts[i:i + batch_size], 10, update_corpus=False)
+        for i in range(0, len(texts), batch_size)
+    ], repeat=1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro benchmarks at several corpus sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--feed-entries", type=int, default=15, help="entries per fake feed (fetch_rss_feed keeps 15)")
+    parser.add_argument("--skip-fetch", action="store_true", help="skip the fetch_all_news benchmark")
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    news_service = load_service_module("news-service")
+    ai_service = load_service_module("ai-service")
+    redis_client = use_local_redis(news_service, ai_service)
+
+    rows = []
+    with BackgroundServer(fake_feeds.app) as feeds:
+        for size in args.sizes:
+            articles = synthetic_articles(size)
+            timings = {
+                "trending_score": bench_trending(news_service, articles),
+                "search": bench_search(news_service, redis_client, articles),
+                "keywords": bench_keywords(ai_service, articles),
+                "keywords_batch": bench_keywords_batch(ai_service, articles),
+            }
+            if not args.skip_fetch:
+                timings["fetch_all_news"] = bench_fetch_all_news(news_service, feeds.url, size, args.feed_entries)
+
+            for name, seconds in timings.items():
+                rows.append({
+                    "benchmark": name,
+                    "corpus": size,
+                    "total_ms": round(seconds * 1000, 2),
+                    "per_article_us": round(seconds / size * 1e6, 2)
+                })
+            print(f"  done: {size} articles", file=sys.stderr)
+
+    print_report("Micro benchmarks", rows, args.json)
+
+if __name__ == "__main__":
+    main()
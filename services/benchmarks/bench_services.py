@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+KaiTech service benchmarks
+Runs news-service and ai-service against local stand-ins (fake_feeds.py for
+RSS_SOURCES, fakeredis or BENCH_REDIS_URL, mock_upstream.py for Grok/OpenAI)
+and drives their HTTP endpoints with concurrent load, reporting throughput
+and p50/p95/p99 latency per scenario:
+
+    python bench_services.py --requests 500 --concurrency 32 --json results.json
+"""
+
+import os
+import sys
+import asyncio
+import argparse
+import tempfile
+
+# Local stand-ins only; configure before the service modules read their env
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/kaitech-bench.db")
+os.environ["REDIS_URL"] = os.getenv("BENCH_REDIS_URL", "redis://127.0.0.1:1")
+# Unpooled connections: the server threads and this script run separate event loops
+os.environ.setdefault("DB_POOL_SIZE", "0")
+# The fake feed server listens on localhost
+os.environ.setdefault("ALLOW_PRIVATE_DESTINATIONS", "true")
+
+from harness import BackgroundServer, load_service_module, use_local_redis, register_sources, drive_load, print_report
+import fake_feeds
+
+ARTICLE_TEXT = (
+    "Global markets rallied on Tuesday after the central bank signalled a pause in rate rises. "
+    "Technology shares led the gains as investors bet that artificial intelligence spending "
+    "would keep growing, while energy stocks slipped on lower oil prices. "
+) * 4
+
+def unique_text(i: int) -> str:
+    """Distinct article text per request so every call misses the result cache"""
+    return f"Report {i}: {ARTICLE_TEXT}"
+
+def news_scenarios(base_url: str):
+    """(name, method, url, body, params) for the news-service read endpoints"""
+    return [
+        ("news: GET /api/news", "GET", f"{base_url}/api/news", None, lambda i: {"limit": 50, "offset": (i % 4) * 50}),
+        ("news: GET /api/news?view=card", "GET", f"{base_url}/api/news", None, lambda i: {"limit": 200, "view": "card"}),
+        ("news: GET /api/news?fields=", "GET", f"{base_url}/api/news", None, lambda i: {"limit": 200, "fields": "id,title,url,source"}),
+        ("news: GET /api/news/breaking", "GET", f"{base_url}/api/news/breaking", None, None),
+        ("news: GET /api/news/trending", "GET", f"{base_url}/api/news/trending", None, None),
+        ("news: GET /api/news/search", "GET", f"{base_url}/api/news/search", None, lambda i: {"q": fake_feeds.TOPIC_WORDS[i % len(fake_feeds.TOPIC_WORDS)]}),
+        ("news: GET /api/news/categories", "GET", f"{base_url}/api/news/categories", None, None),
+    ]
+
+def ai_scenarios(base_url: str):
+    """(name, method, url, body, params) for the ai-service endpoints"""
+    return [
+        ("ai: sentiment (cached)", "POST", f"{base_url}/api/ai/sentiment", lambda i: {"text": ARTICLE_TEXT}, None),
+        ("ai: sentiment (unique)", "POST", f"{base_url}/api/ai/sentiment", lambda i: {"text": unique_text(i)}, None),
+        ("ai: summarize (unique)", "POST", f"{base_url}/api/ai/summarize", lambda i: {"text": unique_text(i)}, None),
+        ("ai: classify (unique)", "POST", f"{base_url}/api/ai/classify", lambda i: {"text": unique_text(i)}, None),
+        ("ai: keywords (unique)", "POST", f"{base_url}/api/ai/keywords", lambda i: {"text": unique_text(i)}, None),
+        ("ai: analyze comprehensive", "POST", f"{base_url}/api/ai/analyze", lambda i: {"text": unique_text(i)}, None),
+        ("ai: chat", "POST", f"{base_url}/api/ai/chat", lambda i: {"messages": [{"role": "user", "content": f"Question {i}"}]}, None),
+        ("ai: chat stream", "POST", f"{base_url}/api/ai/chat", lambda i: {"messages": [{"role": "user", "content": f"Question {i}"}], "stream": True}, None),
+    ]
+
+async def run(args):
+    news_service = load_service_module("news-service")
+    ai_service = load_service_module("ai-service")
+    mock_upstream = load_service_module("ai-service", "mock_upstream.py")
+    use_local_redis(news_service, ai_service)
+
+    with BackgroundServer(fake_feeds.app) as feeds, BackgroundServer(mock_upstream.app) as upstream:
+        for source in news_service.RSS_SOURCES:
+            source["url"] = f"{feeds.url}/feeds/{fake_feeds.slugify(source['name'])}.xml?entries={args.feed_entries}"
+        await register_sources(news_service, news_service.RSS_SOURCES)
+        ai_service.OPENAI_API_BASE = f"{upstream.url}/v1"
+        ai_service.OPENAI_API_KEY = "bench"
+
+        with BackgroundServer(news_service.app) as news, BackgroundServer(ai_service.app) as ai:
+            await news_service.fetch_all_news()
+
+            scenarios = []
+            if args.only in (None, "news"):
+                scenarios += news_scenarios(news.url)
+            if args.only in (None, "ai"):
+                scenarios += ai_scenarios(ai.url)
+
+            rows = []
+            for name, method, url, body, params in scenarios:
+                rows.append(await drive_load(name, method, url, args.requests, args.concurrency, body=body, params=params))
+                print(f"  done: {name}", file=sys.stderr)
+
+    print_report(f"Service benchmarks ({args.requests} requests, concurrency {args.concurrency})", rows, args.json)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark news-service and ai-service endpoints")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent clients")
+    parser.add_argument("--feed-entries", type=int, default=30, help="entries per fake feed")
+    parser.add_argument("--only", choices=["news", "ai"], help="run one service's scenarios")
+    parser.add_argument("--json", help="write results to this JSON file")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
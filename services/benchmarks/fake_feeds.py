@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+KaiTech Fake Feed Server
+Serves RSS feeds for benchmarks so news-service can be measured without the
+network. A feed is served from BENCH_FEED_DIR/<slug>.xml when a recorded copy
+exists there, otherwise a deterministic synthetic feed is generated per slug:
+
+    uvicorn fake_feeds:app --port 8090
+    curl http://localhost:8090/feeds/bbc-news.xml?entries=50
+"""
+
+import os
+import random
+import asyncio
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from fastapi import FastAPI, Query
+from fastapi.responses import Response
+
+FEED_DIR = Path(os.getenv("BENCH_FEED_DIR", Path(__file__).parent / "feeds"))
+FEED_LATENCY = float(os.getenv("BENCH_FEED_LATENCY", "0.0"))  # simulated server time per feed
+
+TOPIC_WORDS = [
+    "bitcoin", "election", "climate", "startup", "football", "vaccine", "quantum", "markets",
+    "government", "software", "hospital", "research", "blockchain", "economy", "innovation",
+    "security", "satellite", "energy", "inflation", "artificial", "intelligence", "olympic"
+]
+FILLER_WORDS = [
+    "report", "officials", "said", "new", "after", "week", "plan", "data", "shows", "people",
+    "global", "growth", "crisis", "update", "team", "launch", "analysis", "record", "city"
+]
+HEADLINE_PREFIXES = ["", "", "", "", "Breaking: ", "Live: ", "Exclusive: "]
+
+app = FastAPI(
+    title="KaiTech Fake Feed Server",
+    description="Recorded or synthetic RSS feeds for benchmarks",
+    version="2.0.0"
+)
+
+def slugify(name: str) -> str:
+    """Feed slug for a source name ("BBC News" -> "bbc-news")"""
+    return "-".join(name.lower().split())
+
+def generate_feed(slug: str, entries: int = 30, now: datetime = None) -> str:
+    """Deterministic synthetic RSS 2.0 feed for a slug"""
+    rng = random.Random(slug)
+    now = now or datetime.utcnow()
+    items = []
+    for i in range(entries):
+        topic = rng.sample(TOPIC_WORDS, 2)
+        title = f"{rng.choice(HEADLINE_PREFIXES)}{topic[0].title()} {' '.join(rng.sample(FILLER_WORDS, 4))} {topic[1]}"
+        paragraphs = "".join(
+            f"<p>{' '.join(rng.choices(TOPIC_WORDS + FILLER_WORDS, k=40))}.</p>" for _ in range(rng.randint(1, 3))
+        )
+        published = now - timedelta(minutes=i * rng.randint(5, 45))
+        items.append(f"""    <item>
+      <title>{escape(title)}</title>
+      <link>https://example.com/{slug}/articles/{i}</link>
+      <guid>https://example.com/{slug}/articles/{i}</guid>
+      <description>{escape(paragraphs)}</description>
+      <pubDate>{format_datetime(published.replace(tzinfo=None))}</pubDate>
+    </item>""")
+
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>{escape(slug)}</title>
+    <link>https://example.com/{slug}</link>
+    <description>Synthetic benchmark feed</description>
+{chr(10).join(items)}
+  </channel>
+</rss>
+"""
+
+@app.get("/feeds/{slug}.xml")
+async def get_feed(slug: str, entries: int = Query(30, ge=1, le=10000)):
+    """Serve a recorded feed if present, otherwise a synthetic one"""
+    if FEED_LATENCY:
+        await asyncio.sleep(FEED_LATENCY)
+
+    recorded = FEED_DIR / f"{slug}.xml"
+    body = recorded.read_text() if recorded.is_file() else generate_feed(slug, entries)
+    return Response(body, media_type="application/rss+xml")
@@ -0,0 +1,178 @@
+"""
+KaiTech benchmark harness
+Shared helpers for the service and micro benchmarks: loading the service
+modules, running ASGI apps on background threads, local Redis stand-ins, the
+concurrent load driver and latency statistics.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import threading
+import importlib.util
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any
+
+import httpx
+import uvicorn
+
+SERVICES_DIR = Path(__file__).resolve().parent.parent
+
+def load_service_module(service: str, filename: str = "main.py", module_name: Optional[str] = None):
+    """Import a service file under a unique module name (both services use main.py),
+    with its directory importable as when the service is run from it"""
+    path = SERVICES_DIR / service / filename
+    if str(path.parent) not in sys.path:
+        sys.path.append(str(path.parent))
+    module_name = module_name or f"{service.replace('-', '_')}_{path.stem}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def use_local_redis(*modules):
+    """Point service modules at BENCH_REDIS_URL if set, otherwise at a shared
+    fakeredis server (install fakeredis[lua]; ai-service releases locks with EVAL)"""
+    if os.getenv("BENCH_REDIS_URL"):
+        import redis
+        import redis.asyncio
+        client = redis.from_url(os.environ["BENCH_REDIS_URL"], decode_responses=True)
+        async_client = redis.asyncio.from_url(os.environ["BENCH_REDIS_URL"], decode_responses=True)
+    else:
+        import fakeredis
+        server = fakeredis.FakeServer()
+        client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        async_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+
+    client.flushdb()
+    for module in modules:
+        module.redis_client = client
+        if hasattr(module, "async_redis_client"):
+            module.async_redis_client = async_client
+    return client
+
+async def register_sources(news_service, sources: List[Dict]):
+    """Migrate news-service's database and replace its source registry with these sources"""
+    from sqlalchemy import delete
+
+    await news_service.run_migrations()
+    async with news_service.get_sessionmaker()() as db:
+        await db.execute(delete(news_service.Source))
+        db.add_all(news_service.Source(**source) for source in sources)
+        await db.commit()
+
+def free_port() -> int:
+    """Pick an unused localhost port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class BackgroundServer:
+    """Run an ASGI app with uvicorn on a daemon thread"""
+
+    def __init__(self, app, port: Optional[int] = None):
+        self.port = port or free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        deadline = time.monotonic() + 30
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Server on port {self.port} did not start")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def summarize_latencies(name: str, latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Throughput and latency percentiles (milliseconds) for one scenario"""
+    ordered = sorted(latencies)
+    return {
+        "scenario": name,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0
+    }
+
+async def drive_load(
+    name: str,
+    method: str,
+    url: str,
+    total: int,
+    concurrency: int,
+    body: Optional[Callable[[int], Any]] = None,
+    params: Optional[Callable[[int], Dict]] = None
+) -> Dict[str, Any]:
+    """Send `total` requests with `concurrency` workers; body/params build request i"""
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async with httpx.AsyncClient(timeout=60.0, limits=httpx.Limits(max_connections=concurrency)) as client:
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                start_time = time.perf_counter()
+                try:
+                    response = await client.request(
+                        method,
+                        url,
+                        json=body(i) if body else None,
+                        params=params(i) if params else None
+                    )
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - start_time)
+                except Exception:
+                    errors += 1
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start_time
+
+    return summarize_latencies(name, latencies, errors, elapsed)
+
+def time_call(func: Callable, repeat: int = 3) -> float:
+    """Best-of-N wall time of a zero-argument callable, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+def print_report(title: str, rows: List[Dict[str, Any]], json_path: Optional[str] = None):
+    """Print rows as an aligned table and optionally write them as JSON"""
+    print(f"\n{title}")
+    if rows:
+        columns = list(rows[0])
+        widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns}
+        print("  ".join(c.ljust(widths[c]) for c in columns))
+        for row in rows:
+            print("  ".join(str(row.get(c, "")).ljust(widths[c]) for c in columns))
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump({"title": title, "results": rows}, f, indent=2)
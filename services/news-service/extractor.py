@@ -0,0 +1,78 @@
+"""
+KaiTech article text extractor
+Main-text extraction for article pages, kept apart from main.py so the
+extraction worker processes import only this module (and trafilatura)
+"""
+
+from html.parser import HTMLParser
+
+# trafilatura is used when installed, otherwise a plain paragraph extractor
+try:
+    import trafilatura
+except ImportError:
+    trafilatura = None
+
+READABLE_BLOCK_TAGS = {"p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "blockquote", "pre"}
+READABLE_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form", "figure", "button"}
+READABLE_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+class ReadableTextParser(HTMLParser):
+    """Paragraph-level text of a page, outside navigation, scripts and other chrome;
+    when the page has an <article> element only its blocks are kept"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []
+        self.skip_depth = 0
+        self.article_depth = 0
+        self.block = None
+        self.blocks = []
+        self.article_blocks = []
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in READABLE_VOID_TAGS:
+            if tag == "br":
+                self.handle_data(" ")
+            return
+        self.stack.append(tag)
+        if tag in READABLE_SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == "article":
+            self.article_depth += 1
+        elif tag in READABLE_BLOCK_TAGS and self.block is None and not self.skip_depth:
+            self.block = (len(self.stack), [])
+    
+    def handle_endtag(self, tag):
+        if tag not in self.stack:
+            return
+        while self.stack:
+            open_tag = self.stack.pop()
+            if self.block is not None and len(self.stack) < self.block[0]:
+                text = " ".join("".join(self.block[1]).split())
+                if text:
+                    self.blocks.append(text)
+                    if self.article_depth:
+                        self.article_blocks.append(text)
+                self.block = None
+            if open_tag in READABLE_SKIP_TAGS:
+                self.skip_depth -= 1
+            elif open_tag == "article":
+                self.article_depth -= 1
+            if open_tag == tag:
+                break
+    
+    def handle_data(self, data):
+        if self.block is not None and not self.skip_depth:
+            self.block[1].append(data)
+    
+    def text(self) -> str:
+        return "\n\n".join(self.article_blocks or self.blocks)
+
+def extract_readable_text(page: str, url: str) -> str:
+    """Main text of an article page (runs in the extraction worker pool)"""
+    if trafilatura is not None:
+        return trafilatura.extract(page, url=url, include_comments=False, include_tables=False) or ""
+    parser = ReadableTextParser()
+    parser.feed(page)
+    parser.close()
+    return parser.text()
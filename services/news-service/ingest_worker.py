@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+KaiTech Feed Ingestion Worker
+Consumes feed fetch jobs from the ingest:feed-jobs Redis Stream so RSS
+fetching scales out across processes. Start the API with
+INGESTION_MODE=stream and run as many workers as needed:
+
+    python ingest_worker.py --consumer worker-1 --concurrency 8
+
+Jobs are acknowledged only after the source's articles are stored, so a
+crashed worker's jobs are reclaimed by the others; jobs that keep failing
+are moved to ingest:feed-jobs:dead.
+"""
+
+import os
+import json
+import socket
+import asyncio
+import argparse
+import logging
+from typing import List, Tuple, Dict
+
+import main as news_service
+
+logger = logging.getLogger(__name__)
+
+async def process_job(job_id: str, fields: Dict) -> bool:
+    """Fetch one source and store its articles; True when the job can be acked"""
+    source = json.loads(fields["source"])
+    try:
+        articles = await news_service.fetch_and_parse_feed(source)
+        await asyncio.to_thread(news_service.store_ingested_articles, source, articles)
+        return True
+    except news_service.FeedCircuitOpen as e:
+        # Drop the job rather than burn deliveries; the next cycle re-enqueues it
+        logger.warning(f"⏭️ Feed job {job_id} for {source['name']} skipped: {e}")
+        await asyncio.to_thread(news_service.redis_client.delete, f"{news_service.FEED_JOB_MARKER_PREFIX}{source['name']}")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Feed job {job_id} for {source['name']} failed: {e}")
+        return False
+
+def dead_letter_exhausted(jobs: List[Tuple[str, Dict]]) -> List[Tuple[str, Dict]]:
+    """Move jobs delivered too many times to the dead-letter stream; return the rest"""
+    client = news_service.redis_client
+    remaining = []
+    for job_id, fields in jobs:
+        pending = client.xpending_range(
+            news_service.FEED_JOBS_STREAM, news_service.FEED_JOBS_GROUP, min=job_id, max=job_id, count=1
+        )
+        if pending and pending[0]["times_delivered"] > news_service.FEED_JOB_MAX_DELIVERIES:
+            source = json.loads(fields["source"])
+            pipe = client.pipeline()
+            pipe.xadd(news_service.FEED_JOBS_DEAD_STREAM, fields, maxlen=news_service.STREAM_MAXLEN, approximate=True)
+            pipe.xack(news_service.FEED_JOBS_STREAM, news_service.FEED_JOBS_GROUP, job_id)
+            pipe.delete(f"{news_service.FEED_JOB_MARKER_PREFIX}{source['name']}")
+            pipe.execute()
+            logger.warning(f"⚠️ Feed job {job_id} for {source['name']} dead-lettered")
+        else:
+            remaining.append((job_id, fields))
+    return remaining
+
+def next_jobs(consumer: str, batch_size: int, claim_cursor: str = "0-0") -> Tuple[List[Tuple[str, Dict]], str]:
+    """Reclaim jobs stuck on dead consumers first, otherwise block for new ones.
+    Returns (jobs, claim_cursor); pass the cursor back in to continue the pending
+    list scan where it stopped (it wraps to 0-0 at the end)"""
+    client = news_service.redis_client
+    claim_cursor, claimed, *_ = client.xautoclaim(
+        news_service.FEED_JOBS_STREAM,
+        news_service.FEED_JOBS_GROUP,
+        consumer,
+        min_idle_time=news_service.FEED_JOB_CLAIM_IDLE_MS,
+        start_id=claim_cursor,
+        count=batch_size
+    )
+    # Jobs trimmed from the stream by STREAM_MAXLEN come back without fields
+    # (Redis 6.2; 7.x drops them itself): acknowledge them so they leave the pending list
+    trimmed = [job_id for job_id, fields in claimed if job_id and not fields]
+    if trimmed:
+        client.xack(news_service.FEED_JOBS_STREAM, news_service.FEED_JOBS_GROUP, *trimmed)
+    claimed = [(job_id, fields) for job_id, fields in claimed if job_id and fields]
+    if claimed:
+        return dead_letter_exhausted(claimed), claim_cursor
+
+    response = client.xreadgroup(
+        news_service.FEED_JOBS_GROUP,
+        consumer,
+        {news_service.FEED_JOBS_STREAM: ">"},
+        count=batch_size,
+        block=5000
+    )
+    return (response[0][1] if response else []), claim_cursor
+
+async def run_worker(consumer: str, batch_size: int = 8):
+    """Process feed jobs until cancelled"""
+    await asyncio.to_thread(news_service.check_redis)
+    if not news_service.redis_client:
+        raise RuntimeError("Redis is required for stream ingestion")
+
+    news_service.ensure_feed_job_group()
+    logger.info(f"🚀 Ingestion worker {consumer} started")
+
+    claim_cursor = "0-0"
+    while True:
+        try:
+            jobs, claim_cursor = await asyncio.to_thread(next_jobs, consumer, batch_size, claim_cursor)
+        except Exception as e:
+            logger.error(f"Feed job read error: {e}")
+            await asyncio.sleep(1)
+            continue
+
+        if not jobs:
+            continue
+
+        results = await asyncio.gather(*(process_job(job_id, fields) for job_id, fields in jobs))
+        await news_service.flush_source_states()
+        done = [job_id for (job_id, _), ok in zip(jobs, results) if ok]
+        if done:
+            # Failed jobs stay pending and are reclaimed after FEED_JOB_CLAIM_IDLE_MS
+            news_service.redis_client.xack(news_service.FEED_JOBS_STREAM, news_service.FEED_JOBS_GROUP, *done)
+
+def main():
+    parser = argparse.ArgumentParser(description="Consume KaiTech feed ingestion jobs")
+    parser.add_argument("--consumer", default=f"{socket.gethostname()}-{os.getpid()}", help="consumer name within the group")
+    parser.add_argument("--concurrency", type=int, default=8, help="feed jobs fetched concurrently")
+    args = parser.parse_args()
+    asyncio.run(run_worker(args.consumer, args.concurrency))
+
+if __name__ == "__main__":
+    main()
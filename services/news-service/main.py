@@ -5,24 +5,54 @@ High-performance news aggregation service with AI enhancement
 """
 
 import os
+import sys
+import re
+import random
 import asyncio
+import multiprocessing
 import logging
-from datetime import datetime, timedelta
+from contextlib import aclosing, asynccontextmanager
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from typing import List, Optional, Dict, Any
 import json
+import base64
+import xml.etree.ElementTree as ET
+import time
+import hashlib
+import html
+import ipaddress
+import socket
+from urllib.parse import urlparse
 
 import redis
-from fastapi import FastAPI, HTTPException, Depends, Query, BackgroundTasks
+import redis.asyncio
+from fastapi import FastAPI, HTTPException, Depends, Query, BackgroundTasks, Header, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse, Response
 from pydantic import BaseModel, Field
 import httpx
 import feedparser
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Float, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Float, Boolean, Index, UniqueConstraint, and_, or_, func, text, select, delete
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 import uuid
+from pathlib import Path
+
+
+# Helpers shared by the Python services live in services/shared
+sys.path.append(str(Path(__file__).resolve().parent.parent / "shared"))
+from observability import LATENCY_BUCKETS, create_metric, install_profiling, metrics_response
+# The page extractor is its own module so extraction workers import only it
+from extractor import extract_readable_text, trafilatura
 
 # Configure logging
 logging.basicConfig(
@@ -38,20 +68,223 @@ NEWS_API_KEY = os.getenv("NEWS_API_KEY", "")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 GROK_API_KEY = os.getenv("GROK_API_KEY", "")
 CACHE_TTL = int(os.getenv("CACHE_TTL", "300"))  # 5 minutes default
+NEWS_DIGEST_SIZE = int(os.getenv("NEWS_DIGEST_SIZE", "20"))  # headlines in the AI chat context
+
+# Snapshot refresh: one worker per interval (Redis lock) rebuilds news:all well
+# before CACHE_TTL expires it; cache misses trigger at most one extra refresh
+NEWS_REFRESH_INTERVAL = int(os.getenv("NEWS_REFRESH_INTERVAL", str(max(30, CACHE_TTL // 2))))
+NEWS_REFRESH_LOCK = "news:refresh:lock"
+NEWS_REFRESHING_KEY = "news:refreshing"
+
+# HTTP caching of snapshot-backed responses: strong ETags from the snapshot
+# version, so clients, CDNs and reverse proxies revalidate with a 304
+NEWS_CACHE_MAX_AGE = int(os.getenv("NEWS_CACHE_MAX_AGE", "30"))
+NEWS_STALE_WHILE_REVALIDATE = int(os.getenv("NEWS_STALE_WHILE_REVALIDATE", str(CACHE_TTL)))
+NEWS_STALE_IF_ERROR = int(os.getenv("NEWS_STALE_IF_ERROR", "86400"))
+
+# Lean list payloads: view=card serves precomputed cards (plain-text summary,
+# no content or HTML) from news:cards; fields= projects any view
+CARD_SUMMARY_LENGTH = int(os.getenv("CARD_SUMMARY_LENGTH", "200"))
+CARD_FIELDS = (
+    "id", "title", "url", "source", "category", "ai_category", "sentiment",
+    "published_at", "trending_score", "summary"
+)
+
+# Ingestion: "inline" fetches every source in this process, "stream" queues
+# fetch jobs on a Redis Stream for ingest_worker.py processes. Keys live
+# under ingest: so the news:* cache invalidation on refresh leaves them alone
+INGESTION_MODE = os.getenv("INGESTION_MODE", "inline").lower()
+FEED_JOBS_STREAM = "ingest:feed-jobs"
+FEED_JOBS_GROUP = "ingest-workers"
+FEED_JOBS_DEAD_STREAM = "ingest:feed-jobs:dead"
+ARTICLES_STREAM = "ingest:articles"
+INGESTED_ARTICLES_KEY = "ingest:articles:latest"
+FEED_JOB_MARKER_PREFIX = "ingest:feed-job:"
+FEED_JOB_MARKER_TTL = int(os.getenv("FEED_JOB_MARKER_TTL", "300"))
+FEED_JOB_MAX_DELIVERIES = int(os.getenv("FEED_JOB_MAX_DELIVERIES", "5"))
+FEED_JOB_CLAIM_IDLE_MS = int(os.getenv("FEED_JOB_CLAIM_IDLE_MS", "60000"))
+STREAM_MAXLEN = int(os.getenv("STREAM_MAXLEN", "100000"))
+
+# Push delivery: each snapshot's new or changed articles are published on one
+# Redis channel; every worker holds a single subscription and fans updates out
+# to its SSE and WebSocket clients. Keys live outside news:* for the same reason
+NEWS_UPDATES_CHANNEL = "stream:news-updates"
+NEWS_UPDATES_VERSION_KEY = "stream:news-updates:version"
+ARTICLE_FINGERPRINTS_KEY = "stream:article-fingerprints"
+STREAM_CLIENT_QUEUE = int(os.getenv("STREAM_CLIENT_QUEUE", "32"))  # undelivered updates before a slow client is dropped
+STREAM_HEARTBEAT = float(os.getenv("STREAM_HEARTBEAT", "15"))
+STREAM_REPLAY = int(os.getenv("STREAM_REPLAY", "50"))  # recent updates kept for Last-Event-ID resume
+
+# Source registry: sources are read from the database in pages of this size
+SOURCE_PAGE_SIZE = int(os.getenv("SOURCE_PAGE_SIZE", "200"))
+SOURCE_LATENCY_ALPHA = 0.2  # weight of the newest fetch in the moving average latency
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")  # registry writes are refused until this is set
+# Feed and article page fetches refuse private, loopback and link-local
+# destinations; only enable this for local development against local feeds
+ALLOW_PRIVATE_DESTINATIONS = os.getenv("ALLOW_PRIVATE_DESTINATIONS", "false").lower() == "true"
+
+# Article archive: every published snapshot is upserted into the articles table
+ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "true").lower() == "true"
+SEARCH_LANGUAGE = os.getenv("SEARCH_LANGUAGE", "english")  # PostgreSQL text search configuration
+
+# Archive storage: daily range partitions on PostgreSQL, dropped after
+# ARCHIVE_RETENTION_DAYS (0 keeps everything) once rolled up into article_daily_stats
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "90"))
+ARCHIVE_PARTITION_DAYS_AHEAD = int(os.getenv("ARCHIVE_PARTITION_DAYS_AHEAD", "3"))
+ARCHIVE_ROLLUP_DAYS = int(os.getenv("ARCHIVE_ROLLUP_DAYS", "3"))  # recent days re-rolled each maintenance run
+ARCHIVE_MAINTENANCE_INTERVAL = int(os.getenv("ARCHIVE_MAINTENANCE_INTERVAL", "3600"))
+ARCHIVE_MAINTENANCE_LOCK = "archive:maintenance"
+ARCHIVED_FINGERPRINTS_KEY = "archive:fingerprints"  # url -> fingerprint of the archived row
+
+# Feed fetch deadlines: each source gets FEED_DEADLINE_FACTOR x its average
+# latency, clamped to [FEED_MIN_DEADLINE, FEED_MAX_DEADLINE] seconds
+FEED_CONNECT_TIMEOUT = float(os.getenv("FEED_CONNECT_TIMEOUT", "3"))
+FEED_MIN_DEADLINE = float(os.getenv("FEED_MIN_DEADLINE", "2"))
+FEED_MAX_DEADLINE = float(os.getenv("FEED_MAX_DEADLINE", "10"))
+FEED_DEADLINE_FACTOR = float(os.getenv("FEED_DEADLINE_FACTOR", "4"))
+FEED_RETRIES = int(os.getenv("FEED_RETRIES", "1"))
+FEED_RETRY_BACKOFF = float(os.getenv("FEED_RETRY_BACKOFF", "0.5"))
+FEED_CONCURRENCY = int(os.getenv("FEED_CONCURRENCY", "50"))
+FEED_MAX_ENTRIES = int(os.getenv("FEED_MAX_ENTRIES", "15"))  # articles kept per source
+FEED_MAX_BYTES = int(os.getenv("FEED_MAX_BYTES", str(5 * 1024 * 1024)))
+
+# Aggregation: publish what has arrived after FEED_PUBLISH_AFTER seconds, then
+# merge late feeds in until AGGREGATION_DEADLINE
+FEED_PUBLISH_AFTER = float(os.getenv("FEED_PUBLISH_AFTER", "3"))
+AGGREGATION_DEADLINE = float(os.getenv("AGGREGATION_DEADLINE", "20"))
+
+# Full-text extraction: after aggregation, fetch the pages of articles whose
+# feed carries only a teaser and extract their readable text into `content`
+EXTRACTION_ENABLED = os.getenv("EXTRACTION_ENABLED", "false").lower() == "true"
+EXTRACTION_CONCURRENCY = int(os.getenv("EXTRACTION_CONCURRENCY", "20"))  # pages in flight (and pooled connections)
+EXTRACTION_PER_HOST = int(os.getenv("EXTRACTION_PER_HOST", "2"))  # pages in flight per host
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "2"))  # extractor processes; 0 runs them on threads
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "10"))
+EXTRACTION_DEADLINE = float(os.getenv("EXTRACTION_DEADLINE", "60"))  # per aggregation run
+EXTRACTION_MAX_ARTICLES = int(os.getenv("EXTRACTION_MAX_ARTICLES", "200"))  # new pages per run
+EXTRACTION_MAX_BYTES = int(os.getenv("EXTRACTION_MAX_BYTES", str(2 * 1024 * 1024)))
+EXTRACTION_MIN_CHARS = int(os.getenv("EXTRACTION_MIN_CHARS", "500"))  # feed content shorter than this is a teaser
+EXTRACTION_CACHE_TTL = int(os.getenv("EXTRACTION_CACHE_TTL", str(7 * 86400)))
+EXTRACTION_FAILURE_TTL = int(os.getenv("EXTRACTION_FAILURE_TTL", "3600"))  # before a failed page is retried
+EXTRACTED_URL_PREFIX = "extract:url:"
+EXTRACTED_CONTENT_PREFIX = "extract:content:"
+
+# Per-host circuit breakers
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "30"))
+BREAKER_MAX_RESET_TIMEOUT = float(os.getenv("BREAKER_MAX_RESET_TIMEOUT", "600"))
+
+# Database setup: the asyncpg/aiosqlite engine is created on first use (the
+# lifespan handler, ingest workers, migrate.py), never at import time
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))  # 0 disables pooling, e.g. behind PgBouncer
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "30"))
+DB_STARTUP_TIMEOUT = float(os.getenv("DB_STARTUP_TIMEOUT", "10"))
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "false").lower() == "true"  # run migrate.py's steps at startup
 
-# Database setup
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+db_state = {"engine": None, "sessionmaker": None}
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its asyncio driver (asyncpg for PostgreSQL, aiosqlite for SQLite)"""
+    for prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgres://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+def get_engine() -> AsyncEngine:
+    """The shared async engine, created on first use"""
+    if db_state["engine"] is None:
+        url = async_database_url(DATABASE_URL)
+        options = {"pool_pre_ping": True}
+        if DB_POOL_SIZE <= 0:
+            options["poolclass"] = NullPool
+        elif not url.startswith("sqlite"):
+            options.update(
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_recycle=DB_POOL_RECYCLE
+            )
+        if url.startswith("postgresql+asyncpg"):
+            options["connect_args"] = {
+                "command_timeout": DB_COMMAND_TIMEOUT,
+                "server_settings": {"application_name": "kaitech-news-service"}
+            }
+        
+        db_state["engine"] = create_async_engine(url, **options)
+        db_state["sessionmaker"] = async_sessionmaker(db_state["engine"], expire_on_commit=False)
+    return db_state["engine"]
+
+def get_sessionmaker() -> async_sessionmaker:
+    get_engine()
+    return db_state["sessionmaker"]
 
-# Redis setup
-try:
-    redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-    redis_client.ping()
-    logger.info("✅ Redis connection established")
-except Exception as e:
-    logger.error(f"❌ Redis connection failed: {e}")
-    redis_client = None
+async def close_db():
+    """Dispose of the engine's pool; the next use creates a new engine"""
+    engine = db_state["engine"]
+    db_state["engine"] = db_state["sessionmaker"] = None
+    if engine is not None:
+        await engine.dispose()
+
+# Redis setup: the client connects on first use; check_redis() verifies it at startup
+redis_client = redis.from_url(REDIS_URL, decode_responses=True, socket_connect_timeout=5)
+# The article update subscription blocks on its socket, so it gets an asyncio client
+async_redis_client = redis.asyncio.from_url(REDIS_URL, decode_responses=True, socket_connect_timeout=5)
+
+def check_redis():
+    """Ping Redis, disabling caching for this process if it is unreachable"""
+    global redis_client
+    if redis_client is None:
+        return
+    try:
+        redis_client.ping()
+        logger.info("✅ Redis connection established")
+    except Exception as e:
+        logger.error(f"❌ Redis connection failed: {e}")
+        redis_client = None
+
+# Application lifespan: connections are checked lazily here, not at import
+lifespan_tasks: List[asyncio.Task] = []
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize app on startup and release connections on shutdown"""
+    logger.info("🚀 Starting KaiTech News Service...")
+    
+    await run_in_threadpool(check_redis)
+    try:
+        if AUTO_MIGRATE:
+            await asyncio.wait_for(run_migrations(), timeout=DB_STARTUP_TIMEOUT)
+        else:
+            await asyncio.wait_for(detect_archive_features(), timeout=DB_STARTUP_TIMEOUT)
+    except Exception as e:
+        # Serve from cache and feeds anyway; database features recover once it is reachable
+        logger.error(f"❌ Database startup check failed: {e or type(e).__name__}")
+    
+    if redis_client:
+        lifespan_tasks.append(asyncio.create_task(news_updates_listener()))
+    
+    # Initial news fetch, then periodic refreshes
+    lifespan_tasks.append(asyncio.create_task(news_refresh_loop()))
+    if ARCHIVE_ENABLED:
+        lifespan_tasks.append(asyncio.create_task(archive_maintenance_loop()))
+    
+    logger.info("✅ KaiTech News Service started successfully")
+    yield
+    
+    for task in lifespan_tasks:
+        task.cancel()
+    await close_extraction()
+    await async_redis_client.aclose()
+    await close_db()
 
 # FastAPI app
 app = FastAPI(
@@ -59,7 +292,8 @@ app = FastAPI(
     description="Advanced news aggregation with AI enhancement and caching",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -71,6 +305,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrics (series are labelled by bounded values only: outcome, operation, route)
+HTTP_REQUEST_SECONDS = create_metric("Histogram", "news_http_request_seconds", "HTTP request latency", ("method", "route", "status"), buckets=LATENCY_BUCKETS)
+CACHE_REQUESTS = create_metric("Counter", "news_cache_requests_total", "Cache lookups", ("result",))
+REDIS_SECONDS = create_metric("Histogram", "news_redis_seconds", "Redis command latency", ("operation",), buckets=LATENCY_BUCKETS)
+FEED_FETCH_SECONDS = create_metric("Histogram", "news_feed_fetch_seconds", "RSS feed download latency", ("outcome",), buckets=LATENCY_BUCKETS)
+FEED_PARSE_SECONDS = create_metric("Histogram", "news_feed_parse_seconds", "RSS feed body download and parse latency", buckets=LATENCY_BUCKETS)
+FEED_PARSER_FALLBACKS = create_metric("Counter", "news_feed_parser_fallbacks_total", "Feeds parsed with feedparser after the streaming parser failed")
+FEED_ARTICLES = create_metric("Counter", "news_feed_articles_total", "Articles parsed from feeds")
+AI_ENHANCE_SECONDS = create_metric("Histogram", "news_ai_enhance_seconds", "AI enhancement latency per run", buckets=LATENCY_BUCKETS)
+AI_ENHANCE_BATCH = create_metric("Histogram", "news_ai_enhance_batch_size", "Articles per AI enhancement run", buckets=(1, 5, 10, 20, 30, 50, 100, 200, 500))
+AGGREGATION_SECONDS = create_metric("Histogram", "news_aggregation_seconds", "Full news aggregation latency", buckets=LATENCY_BUCKETS)
+STREAM_CLIENTS = create_metric("Gauge", "news_stream_clients", "Connected push clients", ("transport",), multiprocess_mode="livesum")
+STREAM_UPDATES = create_metric("Counter", "news_stream_updates_total", "Article updates published to push clients")
+FEED_BREAKER_OPENS = create_metric("Counter", "news_feed_breaker_opens_total", "Feed host circuit breaker trips")
+EXTRACTION_PAGES = create_metric("Counter", "news_extraction_pages_total", "Article pages considered for full-text extraction", ("outcome",))
+EXTRACTION_SECONDS = create_metric("Histogram", "news_extraction_seconds", "Article page fetch and extraction latency", ("outcome",), buckets=LATENCY_BUCKETS)
+SNAPSHOT_ARTICLES = create_metric("Gauge", "news_snapshot_articles", "Articles in the news:all snapshot", multiprocess_mode="max")
+
+@app.middleware("http")
+async def record_request_metrics(request, call_next):
+    """Record request latency per route template"""
+    start_time = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    HTTP_REQUEST_SECONDS.labels(
+        request.method,
+        getattr(route, "path", "unmatched"),
+        str(response.status_code)
+    ).observe(time.perf_counter() - start_time)
+    return response
+
+profiler = install_profiling(app, "news-service")
+
 # Pydantic models
 class NewsArticle(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -100,39 +367,174 @@ class ErrorResponse(BaseModel):
     message: str
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
+class ArchiveSearchResponse(BaseModel):
+    status: str = "success"
+    articles: List[NewsArticle]
+    count: int
+    next_cursor: Optional[str] = None
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+class SourceInput(BaseModel):
+    name: str = Field(..., min_length=1, max_length=200)
+    url: str = Field(..., regex=r"^https?://", max_length=2000)
+    category: str = "general"
+    language: str = "en"
+    weight: float = Field(1.0, ge=0.0, le=10.0)
+    priority: int = 0
+    enabled: bool = True
+
+class SourceUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=200)
+    url: Optional[str] = Field(None, regex=r"^https?://", max_length=2000)
+    category: Optional[str] = None
+    language: Optional[str] = None
+    weight: Optional[float] = Field(None, ge=0.0, le=10.0)
+    priority: Optional[int] = None
+    enabled: Optional[bool] = None
+
+class SourceResponse(SourceInput):
+    id: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    last_fetched_at: Optional[datetime] = None
+    last_status: Optional[str] = None
+    error_count: int = 0
+    avg_latency_ms: Optional[float] = None
+    
+    class Config:
+        orm_mode = True
+
 # Database Models
 class Article(Base):
     __tablename__ = "articles"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    title = Column(String, nullable=False, index=True)
+    title = Column(String, nullable=False)
     description = Column(Text)
     content = Column(Text)
-    url = Column(String, unique=True, nullable=False, index=True)
-    source = Column(String, nullable=False, index=True)
-    category = Column(String, default="general", index=True)
-    ai_category = Column(String, index=True)
-    sentiment = Column(String, default="neutral", index=True)
+    url = Column(String, nullable=False)
+    source = Column(String, nullable=False)
+    category = Column(String, default="general")
+    ai_category = Column(String)
+    sentiment = Column(String, default="neutral")
     ai_summary = Column(Text)
-    published_at = Column(DateTime, nullable=False, index=True)
+    published_at = Column(DateTime, primary_key=True)
     trending_score = Column(Float, default=0.0)
     enhanced = Column(Boolean, default=False)
     language = Column(String, default="en")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Range-partitioned by day on PostgreSQL, so the primary key and unique
+    # constraint include published_at; indexes match the archive query shapes
+    __table_args__ = (
+        UniqueConstraint("url", "published_at", name="uq_articles_url_published_at"),
+        Index("ix_articles_category_published_at", "category", published_at.desc()),
+        Index("ix_articles_source_published_at", "source", published_at.desc()),
+        Index("ix_articles_published_at_id", published_at.desc(), id.desc()),
+        {"postgresql_partition_by": "RANGE (published_at)"},
+    )
+
+class ArticleDailyStats(Base):
+    __tablename__ = "article_daily_stats"
+    
+    day = Column(Date, primary_key=True)
+    category = Column(String, primary_key=True)
+    source = Column(String, primary_key=True)
+    sentiment = Column(String, primary_key=True)
+    articles = Column(Integer, nullable=False, default=0)
+    avg_trending_score = Column(Float)
+
+class Source(Base):
+    __tablename__ = "sources"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, unique=True, nullable=False)
+    url = Column(String, unique=True, nullable=False)
+    category = Column(String, default="general", index=True)
+    language = Column(String, default="en")
+    weight = Column(Float, default=1.0)
+    priority = Column(Integer, default=0)
+    enabled = Column(Boolean, default=True)
+    etag = Column(String)
+    last_modified = Column(String)
+    last_fetched_at = Column(DateTime)
+    last_status = Column(String)
+    error_count = Column(Integer, default=0)
+    avg_latency_ms = Column(Float)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Ingestion pages through enabled sources by (priority desc, id)
+    __table_args__ = (Index("ix_sources_enabled_priority_id", "enabled", priority.desc(), "id"),)
+
+# Archive full-text search (PostgreSQL only): a generated, weighted tsvector
+# with a GIN index, plus a pg_trgm title index when the extension is available
+ARCHIVE_SEARCH_DDL = [
+    f"""ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(ai_summary, '')), 'C') ||
+        setweight(to_tsvector('{SEARCH_LANGUAGE}', left(coalesce(content, ''), 100000)), 'D')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING GIN (search_vector)",
+]
+TRIGRAM_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_articles_title_trgm ON articles USING GIN (title gin_trgm_ops)",
+]
+archive_search = {"fulltext": False, "trigram": False}
+archive_storage = {"partitioned": False}
+
+async def run_migrations():
+    """Create or upgrade the schema and seed the default sources (python migrate.py)"""
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    if engine.dialect.name == "postgresql":
+        for feature, statements in (("fulltext", ARCHIVE_SEARCH_DDL), ("trigram", TRIGRAM_DDL)):
+            try:
+                async with engine.begin() as conn:
+                    for statement in statements:
+                        await conn.execute(text(statement))
+            except Exception as e:
+                logger.error(f"Archive search migration ({feature}) failed: {e}")
+    
+    await seed_sources()
+    await detect_archive_features()
+    logger.info("✅ Database migrations applied")
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+async def detect_archive_features():
+    """Record which archive search and partitioning features the migrated schema has"""
+    engine = get_engine()
+    if engine.dialect.name != "postgresql":
+        logger.warning("Archive search needs PostgreSQL; /api/news/archive/search is disabled")
+        return
+    
+    async with engine.connect() as conn:
+        features = (await conn.execute(text("""
+            SELECT
+                EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('articles')) AS partitioned,
+                EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'articles' AND column_name = 'search_vector'
+                ) AS fulltext,
+                to_regclass('ix_articles_title_trgm') IS NOT NULL AS trigram
+        """))).mappings().one()
+    
+    archive_storage["partitioned"] = features["partitioned"]
+    archive_search["fulltext"] = features["fulltext"]
+    archive_search["trigram"] = features["trigram"]
+    if not features["partitioned"]:
+        logger.warning("articles is not partitioned (created before partitioning); partition management is disabled")
 
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with get_sessionmaker()() as db:
         yield db
-    finally:
-        db.close()
 
-# RSS sources configuration
+# Default RSS sources, seeded into the sources table on first start
 RSS_SOURCES = [
     {"name": "BBC News", "url": "https://feeds.bbci.co.uk/news/rss.xml", "category": "world"},
     {"name": "Reuters", "url": "https://feeds.reuters.com/reuters/topNews", "category": "world"},
@@ -144,6 +546,302 @@ RSS_SOURCES = [
     {"name": "Hacker News", "url": "https://hnrss.org/frontpage", "category": "technology"}
 ]
 
+# Source registry
+def source_to_dict(source: Source) -> Dict:
+    """Plain dict of the fields ingestion needs (safe to pass between threads and to workers)"""
+    return {
+        "id": source.id,
+        "name": source.name,
+        "url": source.url,
+        "category": source.category,
+        "language": source.language,
+        "weight": source.weight,
+        "priority": source.priority,
+        "etag": source.etag,
+        "last_modified": source.last_modified,
+        "avg_latency_ms": source.avg_latency_ms
+    }
+
+async def seed_sources(sources: List[Dict] = RSS_SOURCES) -> int:
+    """Insert the default sources when the registry is empty; returns rows added"""
+    async with get_sessionmaker()() as db:
+        try:
+            if (await db.execute(select(Source.id).limit(1))).first() is not None:
+                return 0
+            db.add_all(Source(**source) for source in sources)
+            await db.commit()
+            logger.info(f"🌱 Seeded {len(sources)} news sources")
+            return len(sources)
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Source seeding error: {e}")
+            return 0
+
+async def load_source_page(after: Optional[tuple], page_size: int) -> List[Dict]:
+    """Next page of enabled sources after the (priority, id) keyset cursor"""
+    query = select(Source).where(Source.enabled.is_(True))
+    if after:
+        priority, source_id = after
+        query = query.where(or_(
+            Source.priority < priority,
+            and_(Source.priority == priority, Source.id > source_id)
+        ))
+    
+    async with get_sessionmaker()() as db:
+        sources = await db.scalars(query.order_by(Source.priority.desc(), Source.id).limit(page_size))
+        return [source_to_dict(s) for s in sources]
+
+async def iter_source_pages(page_size: int = SOURCE_PAGE_SIZE):
+    """Stream enabled sources from the registry page by page, highest priority first"""
+    after = None
+    while True:
+        try:
+            page = await load_source_page(after, page_size)
+        except Exception as e:
+            logger.error(f"Source registry read error: {e}")
+            if after is None:
+                # Registry unavailable: fall back to the built-in defaults
+                yield RSS_SOURCES
+            return
+        
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        after = (page[-1]["priority"], page[-1]["id"])
+
+# Article archive
+ARCHIVE_FIELDS = (
+    "id", "title", "description", "content", "url", "source", "category", "ai_category",
+    "sentiment", "ai_summary", "published_at", "trending_score", "enhanced", "language"
+)
+ARCHIVE_DEFAULTS = {"category": "general", "sentiment": "neutral", "trending_score": 0.0, "enhanced": False, "language": "en"}
+
+known_partitions: set = set()
+
+def partition_name(day) -> str:
+    return f"articles_p{day:%Y%m%d}"
+
+def day_start(day) -> datetime:
+    return datetime(day.year, day.month, day.day)
+
+async def ensure_article_partitions(days) -> None:
+    """Create any missing daily partitions of articles (PostgreSQL)"""
+    if not archive_storage["partitioned"]:
+        return
+    
+    for day in sorted(set(days) - known_partitions):
+        try:
+            async with get_engine().begin() as conn:
+                await conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(day)} PARTITION OF articles "
+                    f"FOR VALUES FROM ('{day_start(day)}') TO ('{day_start(day) + timedelta(days=1)}')"
+                ))
+            known_partitions.add(day)
+        except Exception as e:
+            # Another worker may have created it concurrently
+            logger.error(f"Partition {partition_name(day)} create error: {e}")
+
+async def archive_articles(articles: List[Dict]) -> int:
+    """Upsert snapshot articles into the archive by URL; returns rows written"""
+    if not ARCHIVE_ENABLED or not articles:
+        return 0
+    
+    # Only archive inside the retention window and the pre-created partitions ahead
+    today = datetime.utcnow().date()
+    oldest = today - timedelta(days=ARCHIVE_RETENTION_DAYS) if ARCHIVE_RETENTION_DAYS else None
+    newest = today + timedelta(days=ARCHIVE_PARTITION_DAYS_AHEAD)
+    rows = [
+        {field: article.get(field, ARCHIVE_DEFAULTS.get(field)) for field in ARCHIVE_FIELDS}
+        for article in articles
+        if (oldest is None or article["published_at"].date() >= oldest) and article["published_at"].date() <= newest
+    ]
+    for row in rows:
+        # The snapshot's stable id, so archive results work with ai-service's related-articles lookup
+        row["id"] = uuid.UUID(row["id"] or article_id(row["url"]))
+    if not rows:
+        return 0
+    
+    async with get_sessionmaker()() as db:
+        try:
+            # The unique key is (url, published_at): reuse the stored published_at of known URLs
+            # so undated entries, stamped with the fetch time, update instead of duplicating
+            stored = dict((await db.execute(
+                select(Article.url, Article.published_at).where(Article.url.in_([row["url"] for row in rows]))
+            )).all())
+            for row in rows:
+                row["published_at"] = stored.get(row["url"], row["published_at"])
+            await ensure_article_partitions(row["published_at"].date() for row in rows)
+            
+            insert = pg_insert if get_engine().dialect.name == "postgresql" else sqlite_insert
+            statement = insert(Article).values(rows)
+            updated = {field: statement.excluded[field] for field in ARCHIVE_FIELDS if field not in ("url", "published_at")}
+            for field in ("ai_category", "ai_summary"):
+                # A snapshot published before AI enhancement must not erase earlier results
+                updated[field] = func.coalesce(statement.excluded[field], Article.__table__.c[field])
+            updated["updated_at"] = datetime.utcnow()
+            statement = statement.on_conflict_do_update(index_elements=["url", "published_at"], set_=updated)
+            
+            await db.execute(statement)
+            await db.commit()
+            return len(rows)
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Article archive write error: {e}")
+            return 0
+
+async def archive_changed_articles(articles: List[Dict]) -> int:
+    """Archive only the articles that are new or changed since they were last archived"""
+    if not ARCHIVE_ENABLED or not articles:
+        return 0
+    if not redis_client:
+        return await archive_articles(articles)
+    
+    fingerprints = {article["url"]: article_fingerprint(article) for article in articles}
+    try:
+        archived = dict(zip(fingerprints, redis_client.hmget(ARCHIVED_FINGERPRINTS_KEY, list(fingerprints))))
+    except Exception as e:
+        logger.error(f"Archive fingerprint read error: {e}")
+        archived = {}
+    
+    changed = [article for article in articles if archived.get(article["url"]) != fingerprints[article["url"]]]
+    written = await archive_articles(changed)
+    if written:
+        try:
+            pipe = redis_client.pipeline()
+            pipe.hset(ARCHIVED_FINGERPRINTS_KEY, mapping={article["url"]: fingerprints[article["url"]] for article in changed})
+            pipe.expire(ARCHIVED_FINGERPRINTS_KEY, 2 * 86400)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Archive fingerprint write error: {e}")
+    return written
+
+async def rollup_article_day(day) -> int:
+    """Recompute article_daily_stats for one day; returns groups written"""
+    async with get_sessionmaker()() as db:
+        groups = (await db.execute(
+            select(Article.category, Article.source, Article.sentiment, func.count(), func.avg(Article.trending_score))
+            .where(
+                Article.published_at >= day_start(day),
+                Article.published_at < day_start(day) + timedelta(days=1)
+            )
+            .group_by(Article.category, Article.source, Article.sentiment)
+        )).all()
+        if not groups:
+            # Nothing stored (or already dropped): keep whatever was rolled up before
+            return 0
+        
+        await db.execute(delete(ArticleDailyStats).where(ArticleDailyStats.day == day))
+        db.add_all(
+            ArticleDailyStats(
+                day=day, category=category or "general", source=source, sentiment=sentiment or "neutral",
+                articles=count, avg_trending_score=avg_score
+            )
+            for category, source, sentiment, count, avg_score in groups
+        )
+        await db.commit()
+        return len(groups)
+
+async def apply_archive_retention(cutoff) -> int:
+    """Roll up and remove archived days before cutoff; returns days removed"""
+    engine = get_engine()
+    if archive_storage["partitioned"]:
+        async with engine.connect() as conn:
+            partitions = (await conn.execute(text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = 'articles'"
+            ))).scalars().all()
+        
+        expired = sorted(
+            datetime.strptime(name[len("articles_p"):], "%Y%m%d").date()
+            for name in partitions if re.fullmatch(r"articles_p\d{8}", name)
+        )
+        expired = [day for day in expired if day < cutoff]
+        for day in expired:
+            await rollup_article_day(day)
+            async with engine.begin() as conn:
+                await conn.execute(text(f"ALTER TABLE articles DETACH PARTITION {partition_name(day)}"))
+                await conn.execute(text(f"DROP TABLE {partition_name(day)}"))
+            known_partitions.discard(day)
+            logger.info(f"🗑️ Dropped archive partition {partition_name(day)}")
+        return len(expired)
+    
+    async with get_sessionmaker()() as db:
+        oldest = await db.scalar(select(func.min(Article.published_at)))
+    if oldest is None or oldest.date() >= cutoff:
+        return 0
+    
+    days = (cutoff - oldest.date()).days
+    for offset in range(days):
+        await rollup_article_day(oldest.date() + timedelta(days=offset))
+    async with get_sessionmaker()() as db:
+        await db.execute(delete(Article).where(Article.published_at < day_start(cutoff)))
+        await db.commit()
+    return days
+
+async def maintain_archive():
+    """Create upcoming partitions, refresh recent rollups and apply retention"""
+    today = datetime.utcnow().date()
+    await ensure_article_partitions(today + timedelta(days=offset) for offset in range(ARCHIVE_PARTITION_DAYS_AHEAD + 1))
+    for offset in range(1, ARCHIVE_ROLLUP_DAYS + 1):
+        await rollup_article_day(today - timedelta(days=offset))
+    if ARCHIVE_RETENTION_DAYS:
+        await apply_archive_retention(today - timedelta(days=ARCHIVE_RETENTION_DAYS))
+
+async def archive_maintenance_loop():
+    """Run archive maintenance periodically; one worker per interval when Redis is shared"""
+    while True:
+        try:
+            if not redis_client or redis_client.set(ARCHIVE_MAINTENANCE_LOCK, 1, nx=True, ex=max(60, ARCHIVE_MAINTENANCE_INTERVAL - 60)):
+                await maintain_archive()
+        except Exception as e:
+            logger.error(f"Archive maintenance error: {e}")
+        await asyncio.sleep(ARCHIVE_MAINTENANCE_INTERVAL)
+
+# Per-source fetch state, buffered in memory and written back once per page
+source_fetch_states: Dict[int, Dict] = {}
+
+def record_source_fetch(source: Dict, status: str, latency: float, response: Optional[httpx.Response] = None):
+    """Buffer the outcome of one fetch for a registry source"""
+    if source.get("id") is None:
+        return
+    
+    state = {"status": status, "latency_ms": latency * 1000, "fetched_at": datetime.utcnow()}
+    if response is not None:
+        state["etag"] = response.headers.get("etag")
+        state["last_modified"] = response.headers.get("last-modified")
+    source_fetch_states[source["id"]] = state
+
+async def flush_source_states():
+    """Write buffered fetch state (last fetched, ETag, error count, average latency) to the registry"""
+    states = {source_id: source_fetch_states.pop(source_id) for source_id in list(source_fetch_states)}
+    if not states:
+        return
+    
+    async with get_sessionmaker()() as db:
+        try:
+            for source in await db.scalars(select(Source).where(Source.id.in_(list(states)))):
+                state = states[source.id]
+                source.last_fetched_at = state["fetched_at"]
+                source.last_status = state["status"]
+                if source.avg_latency_ms is None:
+                    source.avg_latency_ms = state["latency_ms"]
+                else:
+                    source.avg_latency_ms += SOURCE_LATENCY_ALPHA * (state["latency_ms"] - source.avg_latency_ms)
+                
+                if state["status"] == "error":
+                    source.error_count = (source.error_count or 0) + 1
+                else:
+                    source.error_count = 0
+                    if "etag" in state:
+                        source.etag = state["etag"]
+                        source.last_modified = state["last_modified"]
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Source state write error: {e}")
+
 # Cache utilities
 async def get_from_cache(key: str) -> Optional[Dict]:
     """Get data from Redis cache"""
@@ -151,11 +849,16 @@ async def get_from_cache(key: str) -> Optional[Dict]:
         return None
     
     try:
+        start_time = time.perf_counter()
         cached_data = redis_client.get(key)
+        REDIS_SECONDS.labels("get").observe(time.perf_counter() - start_time)
         if cached_data:
+            CACHE_REQUESTS.labels("hit").inc()
             return json.loads(cached_data)
+        CACHE_REQUESTS.labels("miss").inc()
         return None
     except Exception as e:
+        CACHE_REQUESTS.labels("error").inc()
         logger.error(f"Cache read error for key {key}: {e}")
         return None
 
@@ -165,7 +868,9 @@ async def set_cache(key: str, data: Dict, ttl: int = CACHE_TTL) -> bool:
         return False
     
     try:
+        start_time = time.perf_counter()
         redis_client.setex(key, ttl, json.dumps(data, default=str))
+        REDIS_SECONDS.labels("setex").observe(time.perf_counter() - start_time)
         return True
     except Exception as e:
         logger.error(f"Cache write error for key {key}: {e}")
@@ -185,37 +890,179 @@ async def invalidate_cache_pattern(pattern: str) -> bool:
         logger.error(f"Cache invalidation error for pattern {pattern}: {e}")
         return False
 
+# Feed host circuit breakers
+class FeedCircuitOpen(Exception):
+    """Raised instead of fetching from a host whose circuit is open"""
+
+class CircuitBreaker:
+    """Opens after consecutive failures to a host, then lets one trial request
+    through per reset timeout; the timeout doubles each time a trial fails"""
+    
+    def __init__(self, host: str):
+        self.host = host
+        self.failures = 0
+        self.opened_at = None
+        self.open_count = 0
+        self.trial_in_flight = False
+    
+    @property
+    def reset_timeout(self) -> float:
+        return min(BREAKER_MAX_RESET_TIMEOUT, BREAKER_RESET_TIMEOUT * 2 ** max(0, self.open_count - 1))
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+    
+    def allow(self) -> bool:
+        """Whether a request to the host may go ahead now"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self.trial_in_flight:
+            return False
+        self.trial_in_flight = True
+        return True
+    
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.open_count = 0
+        self.trial_in_flight = False
+    
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= BREAKER_FAILURE_THRESHOLD:
+            self.opened_at = time.monotonic()
+            self.open_count += 1
+            FEED_BREAKER_OPENS.inc()
+            logger.warning(f"⚡ Circuit open for {self.host} ({self.reset_timeout:.0f}s)")
+
+host_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_host_breaker(url: str) -> CircuitBreaker:
+    host = urlparse(url).hostname or url
+    if host not in host_breakers:
+        host_breakers[host] = CircuitBreaker(host)
+    return host_breakers[host]
+
+def is_host_failure(error: Exception) -> bool:
+    """Failures that say the host is unhealthy (network, timeouts, 5xx) rather than the feed"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError))
+
+def feed_deadline(source: Dict) -> float:
+    """Per-source fetch deadline learned from its average latency"""
+    avg_latency_ms = source.get("avg_latency_ms")
+    if not avg_latency_ms:
+        return FEED_MAX_DEADLINE
+    return min(FEED_MAX_DEADLINE, max(FEED_MIN_DEADLINE, avg_latency_ms / 1000 * FEED_DEADLINE_FACTOR))
+
+async def get_feed_response(client: httpx.AsyncClient, url: str, headers: Dict, deadline: float) -> httpx.Response:
+    """GET a feed within its deadline, retrying connection failures and 5xx with jittered
+    backoff; the response is streamed, so the caller must close it"""
+    give_up_at = time.monotonic() + deadline
+    attempt = 0
+    while True:
+        error = None
+        try:
+            response = await asyncio.wait_for(
+                client.send(client.build_request("GET", url, headers=headers), stream=True),
+                timeout=max(0.0, give_up_at - time.monotonic())
+            )
+            if response.status_code < 500:
+                return response
+        except (httpx.ConnectError, httpx.RemoteProtocolError) as e:
+            error = e
+        
+        backoff = FEED_RETRY_BACKOFF * 2 ** attempt * (0.5 + random.random())
+        attempt += 1
+        if attempt > FEED_RETRIES or time.monotonic() + backoff >= give_up_at:
+            if error:
+                raise error
+            return response
+        if error is None:
+            await response.aclose()
+        await asyncio.sleep(backoff)
+
 # News fetching utilities
 async def fetch_rss_feed(source: Dict) -> List[Dict]:
-    """Fetch and parse RSS feed"""
+    """Fetch and parse RSS feed, returning no articles on failure"""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                source["url"],
-                headers={"User-Agent": "KaiTech News Bot 2.0"}
-            )
-            response.raise_for_status()
-            
-        feed = feedparser.parse(response.text)
-        articles = []
-        
-        for entry in feed.entries[:15]:  # Limit to 15 articles per source
+        return await fetch_and_parse_feed(source)
+    except FeedCircuitOpen as e:
+        logger.warning(f"⏭️ Skipping {source['name']}: {e}")
+        return []
+    except Exception as e:
+        logger.error(f"❌ Error fetching RSS from {source['name']}: {str(e) or type(e).__name__}")
+        return []
+
+async def fetch_and_parse_feed(source: Dict) -> List[Dict]:
+    """Fetch and parse RSS feed, raising on fetch errors so callers can retry"""
+    breaker = get_host_breaker(source["url"])
+    if not breaker.allow():
+        FEED_FETCH_SECONDS.labels("circuit_open").observe(0)
+        raise FeedCircuitOpen(f"circuit open for {breaker.host}")
+    
+    headers = {"User-Agent": "KaiTech News Bot 2.0"}
+    
+    # Conditional request only when the previous articles are still stored to serve on 304
+    previous_articles = None
+    if source.get("etag") or source.get("last_modified"):
+        previous_articles = load_source_articles(source["name"])
+    if previous_articles is not None:
+        if source.get("etag"):
+            headers["If-None-Match"] = source["etag"]
+        if source.get("last_modified"):
+            headers["If-Modified-Since"] = source["last_modified"]
+    
+    deadline = feed_deadline(source)
+    start_time = time.perf_counter()
+    try:
+        async with httpx.AsyncClient(
+            timeout=httpx.Timeout(deadline, connect=min(FEED_CONNECT_TIMEOUT, deadline)),
+            event_hooks={"request": [check_public_destination]}
+        ) as client:
+            response = await get_feed_response(client, source["url"], headers, deadline)
             try:
-                published_at = datetime.now()
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published_at = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    published_at = datetime(*entry.updated_parsed[:6])
+                latency = time.perf_counter() - start_time
+                if response.status_code == 304 and previous_articles is not None:
+                    breaker.record_success()
+                    FEED_FETCH_SECONDS.labels("not_modified").observe(latency)
+                    record_source_fetch(source, "not_modified", latency)
+                    return previous_articles
+                response.raise_for_status()
+                
+                breaker.record_success()
+                FEED_FETCH_SECONDS.labels("success").observe(latency)
+                record_source_fetch(source, "success", latency, response)
                 
+                # The body streams into the parser, which stops reading once it has enough entries
+                parse_start = time.perf_counter()
+                entries = await asyncio.wait_for(
+                    parse_feed_stream(response, source),
+                    timeout=max(FEED_MIN_DEADLINE, deadline - latency)
+                )
+            finally:
+                await response.aclose()
+        
+        articles = []
+        for entry in entries:
+            try:
+                published_at = entry["published"] or datetime.now()
                 article = {
-                    "title": getattr(entry, 'title', 'No Title'),
-                    "description": getattr(entry, 'description', ''),
-                    "content": getattr(entry, 'content', [{}])[0].get('value', '') if hasattr(entry, 'content') else '',
-                    "url": getattr(entry, 'link', ''),
+                    "title": entry["title"] or "No Title",
+                    "description": entry["description"],
+                    "content": entry["content"],
+                    "url": entry["link"],
                     "source": source["name"],
                     "category": source["category"],
+                    "language": source.get("language") or "en",
                     "published_at": published_at,
-                    "trending_score": calculate_trending_score(entry.title, published_at)
+                    "trending_score": min(100, calculate_trending_score(entry["title"], published_at) * (source.get("weight") or 1.0))
                 }
                 
                 if article["url"] and article["title"]:
@@ -225,12 +1072,159 @@ async def fetch_rss_feed(source: Dict) -> List[Dict]:
                 logger.error(f"Error parsing article from {source['name']}: {e}")
                 continue
         
+        FEED_PARSE_SECONDS.observe(time.perf_counter() - parse_start)
+        FEED_ARTICLES.inc(len(articles))
         logger.info(f"✅ Fetched {len(articles)} articles from {source['name']}")
         return articles
         
+    except asyncio.CancelledError:
+        # Cut off by the aggregation deadline: count it as a timeout against the host
+        FEED_FETCH_SECONDS.labels("timeout").observe(time.perf_counter() - start_time)
+        record_source_fetch(source, "error", time.perf_counter() - start_time)
+        breaker.record_failure()
+        raise
     except Exception as e:
-        logger.error(f"❌ Error fetching RSS from {source['name']}: {e}")
-        return []
+        timed_out = isinstance(e, (asyncio.TimeoutError, httpx.TimeoutException))
+        FEED_FETCH_SECONDS.labels("timeout" if timed_out else "error").observe(time.perf_counter() - start_time)
+        record_source_fetch(source, "error", time.perf_counter() - start_time)
+        if is_host_failure(e):
+            breaker.record_failure()
+        elif breaker.trial_in_flight:
+            # The host answered; the feed itself is broken
+            breaker.record_success()
+        raise
+
+# Feed parsing: elements are matched by namespace-qualified tag, so extension
+# elements that share a local name (media:content, media:description) are ignored
+RSS1_NS = "{http://purl.org/rss/1.0/}"
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ATOM03_NS = "{http://purl.org/atom/ns#}"
+CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+DC_NS = "{http://purl.org/dc/elements/1.1/}"
+DCTERMS_NS = "{http://purl.org/dc/terms/}"
+FEED_ENTRY_TAGS = {"item", RSS1_NS + "item", ATOM_NS + "entry", ATOM03_NS + "entry"}
+FEED_ENTRY_FIELDS = {
+    "title": "title", RSS1_NS + "title": "title", ATOM_NS + "title": "title", ATOM03_NS + "title": "title",
+    "link": "link", RSS1_NS + "link": "link", ATOM_NS + "link": "link", ATOM03_NS + "link": "link",
+    "description": "description", RSS1_NS + "description": "description",
+    ATOM_NS + "summary": "description", ATOM03_NS + "summary": "description",
+    CONTENT_NS + "encoded": "content", ATOM_NS + "content": "content", ATOM03_NS + "content": "content",
+    "pubDate": "published", ATOM_NS + "published": "published", DC_NS + "date": "published",
+    ATOM03_NS + "issued": "published", DCTERMS_NS + "issued": "published",
+    ATOM_NS + "updated": "updated", ATOM03_NS + "modified": "updated", DCTERMS_NS + "modified": "updated",
+}
+
+# feedparser has no public sanitizer; if the private one goes away, entries fall
+# back to escaped plain text rather than unsanitized markup
+feedparser_sanitize_html = getattr(getattr(feedparser, "sanitizer", None), "_sanitize_html", None)
+
+def parse_feed_date(value: Optional[str]) -> Optional[datetime]:
+    """RFC 822 (RSS) or ISO 8601 (Atom, Dublin Core) date as naive UTC, like feedparser's"""
+    if not value or not value.strip():
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def sanitize_feed_html(value: str) -> str:
+    """Apply feedparser's HTML sanitizer so streamed entries match feedparser output"""
+    if not value:
+        return ""
+    if feedparser_sanitize_html is not None:
+        try:
+            return feedparser_sanitize_html(value, "utf-8", "text/html")
+        except TypeError:
+            pass
+    return html.escape(plain_text(value))
+
+def entry_from_element(element) -> Dict:
+    """Entry fields from an RSS <item> or Atom <entry> element"""
+    fields = {}
+    for child in element:
+        field = FEED_ENTRY_FIELDS.get(child.tag) if isinstance(child.tag, str) else None
+        if field is None or field in fields:
+            continue
+        if field == "link" and child.get("href") is not None:
+            if child.get("rel", "alternate") == "alternate" and child.get("href").strip():
+                fields["link"] = child.get("href").strip()
+            continue
+        value = "".join(child.itertext()).strip()
+        if value and field in ("published", "updated"):
+            value = parse_feed_date(value)
+        if value:
+            fields[field] = value
+    
+    return {
+        "title": fields.get("title", ""),
+        "link": fields.get("link", ""),
+        "description": sanitize_feed_html(fields.get("description", "")),
+        "content": sanitize_feed_html(fields.get("content", "")),
+        "published": fields.get("published") or fields.get("updated")
+    }
+
+def parse_feed_with_feedparser(body: bytes) -> List[Dict]:
+    """Lenient fallback for feeds the streaming parser rejects"""
+    feed = feedparser.parse(body)
+    entries = []
+    for entry in feed.entries[:FEED_MAX_ENTRIES]:
+        published = None
+        if entry.get("published_parsed"):
+            published = datetime(*entry.published_parsed[:6])
+        elif entry.get("updated_parsed"):
+            published = datetime(*entry.updated_parsed[:6])
+        
+        entries.append({
+            "title": entry.get("title", ""),
+            "link": entry.get("link", ""),
+            "description": entry.get("description", ""),
+            "content": entry["content"][0].get("value", "") if entry.get("content") else "",
+            "published": published
+        })
+    return entries
+
+async def parse_feed_stream(response: httpx.Response, source: Dict) -> List[Dict]:
+    """Incrementally parse entries from a streamed feed body, stopping at
+    FEED_MAX_ENTRIES entries or FEED_MAX_BYTES; malformed XML falls back to feedparser"""
+    parser = ET.XMLPullParser(events=("end",))
+    chunks = response.aiter_bytes()
+    body = bytearray()
+    entries = []
+    
+    try:
+        async for chunk in chunks:
+            body.extend(chunk)
+            if len(body) > FEED_MAX_BYTES:
+                if entries:
+                    break
+                raise ValueError(f"feed exceeds {FEED_MAX_BYTES} bytes")
+            
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                if element.tag in FEED_ENTRY_TAGS:
+                    entries.append(entry_from_element(element))
+                    element.clear()
+            if len(entries) >= FEED_MAX_ENTRIES:
+                break
+        else:
+            parser.close()
+    except ET.ParseError as e:
+        logger.info(f"↩️ Falling back to feedparser for {source['name']}: {e}")
+        FEED_PARSER_FALLBACKS.inc()
+        async for chunk in chunks:
+            body.extend(chunk)
+            if len(body) > FEED_MAX_BYTES:
+                raise ValueError(f"feed exceeds {FEED_MAX_BYTES} bytes")
+        return parse_feed_with_feedparser(bytes(body))
+    
+    return entries[:FEED_MAX_ENTRIES]
 
 def calculate_trending_score(title: str, published_at: datetime) -> float:
     """Calculate trending score based on keywords and recency"""
@@ -251,6 +1245,10 @@ async def enhance_with_ai(articles: List[Dict]) -> List[Dict]:
     enhanced_articles = []
     
     for i, article in enumerate(articles[:30]):  # Limit to avoid rate limits
+        if article.get("enhanced"):
+            # Enhanced by an earlier publish of the same articles
+            enhanced_articles.append(article)
+            continue
         try:
             # Add delay to respect rate limits
             if i > 0:
@@ -342,28 +1340,556 @@ async def generate_summary(title: str, description: str) -> str:
         logger.error(f"Summary generation error: {e}")
         return f"Summary: {title[:80]}..."
 
-# Background task to fetch news
-async def fetch_all_news():
-    """Background task to fetch and cache news"""
-    logger.info("🔄 Starting news aggregation...")
+def build_news_digest(articles: List[Dict], limit: int = NEWS_DIGEST_SIZE) -> Dict:
+    """Build the compact headline digest ai-service uses as chat context"""
+    top_articles = sorted(articles, key=lambda a: a.get('trending_score', 0), reverse=True)[:limit]
+    text = "\n".join(
+        f"- [{a.get('ai_category') or a.get('category', 'general')}] {a['title']} ({a['source']})"
+        for a in top_articles
+    )
+    return {
+        "text": text,
+        "version": hashlib.md5(text.encode()).hexdigest(),
+        "articles": len(top_articles),
+        "last_updated": datetime.utcnow().isoformat()
+    }
+
+# Feed ingestion work queue (Redis Streams)
+def ensure_feed_job_group():
+    """Create the feed job stream and its consumer group if missing"""
+    try:
+        redis_client.xgroup_create(FEED_JOBS_STREAM, FEED_JOBS_GROUP, id="0", mkstream=True)
+    except redis.exceptions.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+def enqueue_feed_jobs(sources: List[Dict]) -> int:
+    """Queue one fetch job per source, skipping sources whose job is still pending"""
+    if not redis_client:
+        return 0
+    
+    try:
+        ensure_feed_job_group()
+        enqueued = 0
+        for source in sources:
+            if redis_client.set(f"{FEED_JOB_MARKER_PREFIX}{source['name']}", 1, nx=True, ex=FEED_JOB_MARKER_TTL):
+                redis_client.xadd(
+                    FEED_JOBS_STREAM,
+                    {"source": json.dumps(source)},
+                    maxlen=STREAM_MAXLEN,
+                    approximate=True
+                )
+                enqueued += 1
+        return enqueued
+    except Exception as e:
+        logger.error(f"Feed job enqueue error: {e}")
+        return 0
+
+def parse_ingested_articles(payload: str) -> List[Dict]:
+    """Decode a stored article list, restoring published_at to datetime"""
+    articles = json.loads(payload)
+    for article in articles:
+        article["published_at"] = datetime.fromisoformat(article["published_at"])
+    return articles
+
+def load_source_articles(name: str) -> Optional[List[Dict]]:
+    """Latest stored articles for one source, or None when none are stored"""
+    if not redis_client:
+        return None
+    
+    try:
+        payload = redis_client.hget(INGESTED_ARTICLES_KEY, name)
+        return parse_ingested_articles(payload) if payload else None
+    except Exception as e:
+        logger.error(f"Ingested articles read error for {name}: {e}")
+        return None
+
+def load_many_source_articles(names: List[str]) -> Dict[str, List[Dict]]:
+    """Latest stored articles for several sources, keyed by source name"""
+    if not redis_client or not names:
+        return {}
+    
+    try:
+        payloads = redis_client.hmget(INGESTED_ARTICLES_KEY, names)
+        return {name: parse_ingested_articles(payload) for name, payload in zip(names, payloads) if payload}
+    except Exception as e:
+        logger.error(f"Ingested articles read error: {e}")
+        return {}
+
+def remember_source_articles(articles_by_source: Dict[str, List[Dict]]):
+    """Store the latest articles per source (inline ingestion)"""
+    if not redis_client or not articles_by_source:
+        return
+    
+    try:
+        redis_client.hset(INGESTED_ARTICLES_KEY, mapping={
+            name: json.dumps(articles, default=str) for name, articles in articles_by_source.items()
+        })
+    except Exception as e:
+        logger.error(f"Ingested articles write error: {e}")
+
+def store_ingested_articles(source: Dict, articles: List[Dict]):
+    """Record a source's latest articles and publish them on the articles stream"""
+    pipe = redis_client.pipeline()
+    pipe.hset(INGESTED_ARTICLES_KEY, source["name"], json.dumps(articles, default=str))
+    for article in articles:
+        pipe.xadd(ARTICLES_STREAM, {"article": json.dumps(article, default=str)}, maxlen=STREAM_MAXLEN, approximate=True)
+    pipe.delete(f"{FEED_JOB_MARKER_PREFIX}{source['name']}")
+    pipe.execute()
+
+def load_ingested_articles() -> List[Dict]:
+    """Latest articles stored by the ingestion workers, across all sources"""
+    if not redis_client:
+        return []
+    
+    try:
+        articles = []
+        for payload in redis_client.hvals(INGESTED_ARTICLES_KEY):
+            articles.extend(parse_ingested_articles(payload))
+        return articles
+    except Exception as e:
+        logger.error(f"Ingested articles read error: {e}")
+        return []
+
+# Push delivery (SSE and WebSocket)
+class NewsUpdate:
+    """One published change set, encoded once per category filter and shared by every client"""
+    
+    def __init__(self, update_id: int, articles: List[Dict], encoded: Optional[str] = None):
+        self.id = update_id
+        self.articles = articles
+        self.payloads = {None: encoded} if encoded else {}
+        self.frames = {}
+    
+    def payload(self, category: Optional[str] = None) -> Optional[str]:
+        """JSON message for clients following category (None for all); None if nothing matches"""
+        if category not in self.payloads:
+            articles = self.articles if category is None else [
+                a for a in self.articles if category in (a.get("category"), a.get("ai_category"))
+            ]
+            self.payloads[category] = json.dumps(
+                {"type": "articles", "id": self.id, "articles": articles}, default=str
+            ) if articles else None
+        return self.payloads[category]
+    
+    def sse_frame(self, category: Optional[str] = None) -> Optional[str]:
+        if category not in self.frames:
+            payload = self.payload(category)
+            self.frames[category] = f"id: {self.id}\nevent: articles\ndata: {payload}\n\n" if payload else None
+        return self.frames[category]
+
+class NewsBroadcaster:
+    """Fans updates from this worker's Redis subscription out to its stream clients"""
+    
+    def __init__(self):
+        self.clients = set()
+        self.recent = deque(maxlen=STREAM_REPLAY)
+    
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=STREAM_CLIENT_QUEUE)
+        self.clients.add(queue)
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.clients.discard(queue)
+    
+    def dispatch(self, update: NewsUpdate):
+        """Hand an update to every client without waiting on any of them"""
+        self.recent.append(update)
+        for queue in list(self.clients):
+            try:
+                queue.put_nowait(update)
+            except asyncio.QueueFull:
+                # Slow consumer: disconnect it; it resumes from recent updates with Last-Event-ID
+                self.clients.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+    
+    def missed(self, last_event_id: int) -> List[NewsUpdate]:
+        return [update for update in self.recent if update.id > last_event_id]
+
+news_broadcaster = NewsBroadcaster()
+article_fingerprints: Dict[str, str] = {}  # used when Redis is unavailable
+local_update_id = 0
+
+def article_fingerprint(article: Dict) -> str:
+    """Hash of the fields clients display; trending_score decays every snapshot,
+    so only crossing the breaking threshold counts as a change"""
+    fields = [article.get(field) for field in ("title", "description", "content", "ai_category", "sentiment", "ai_summary")]
+    fields.append(article.get("trending_score", 0) > 70)
+    return hashlib.md5(json.dumps(fields, default=str).encode()).hexdigest()
+
+async def publish_article_updates(articles: List[Dict]) -> int:
+    """Publish the snapshot's new or changed articles to stream clients; returns how many"""
+    global article_fingerprints, local_update_id
+    if not articles:
+        return 0
+    
+    fingerprints = {article["url"]: article_fingerprint(article) for article in articles}
+    if not redis_client:
+        changed = [a for a in articles if article_fingerprints.get(a["url"]) != fingerprints[a["url"]]]
+        article_fingerprints = fingerprints
+        if changed:
+            local_update_id += 1
+            news_broadcaster.dispatch(NewsUpdate(local_update_id, changed))
+        STREAM_UPDATES.inc(len(changed))
+        return len(changed)
+    
+    try:
+        previous = redis_client.hgetall(ARTICLE_FINGERPRINTS_KEY)
+        changed = [a for a in articles if previous.get(a["url"]) != fingerprints[a["url"]]]
+        
+        pipe = redis_client.pipeline()
+        pipe.delete(ARTICLE_FINGERPRINTS_KEY)
+        pipe.hset(ARTICLE_FINGERPRINTS_KEY, mapping=fingerprints)
+        pipe.expire(ARTICLE_FINGERPRINTS_KEY, 86400)
+        pipe.execute()
+        
+        if changed:
+            update_id = redis_client.incr(NEWS_UPDATES_VERSION_KEY)
+            redis_client.publish(
+                NEWS_UPDATES_CHANNEL,
+                json.dumps({"type": "articles", "id": update_id, "articles": changed}, default=str)
+            )
+        STREAM_UPDATES.inc(len(changed))
+        return len(changed)
+    except Exception as e:
+        logger.error(f"Article update publish error: {e}")
+        return 0
+
+async def news_updates_listener():
+    """This worker's single subscription to published article updates"""
+    while redis_client:
+        pubsub = async_redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(NEWS_UPDATES_CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    data = json.loads(message["data"])
+                    news_broadcaster.dispatch(NewsUpdate(data["id"], data["articles"], encoded=message["data"]))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Article update subscription error: {e}")
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
+
+async def iter_news_updates(last_event_id: Optional[int] = None):
+    """Updates for one stream client: those missed since last_event_id, then live
+    ones; yields None as a heartbeat when nothing arrived for STREAM_HEARTBEAT"""
+    queue = news_broadcaster.subscribe()
+    try:
+        last_id = 0
+        if last_event_id is not None:
+            for update in news_broadcaster.missed(last_event_id):
+                last_id = update.id
+                yield update
+        
+        while True:
+            try:
+                update = await asyncio.wait_for(queue.get(), timeout=STREAM_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if update is None:
+                return
+            if update.id > last_id:
+                last_id = update.id
+                yield update
+    finally:
+        news_broadcaster.unsubscribe(queue)
+
+async def news_stream_events(category: Optional[str], last_event_id: Optional[int]):
+    """Server-sent events for /api/news/stream"""
+    STREAM_CLIENTS.labels("sse").inc()
+    try:
+        yield "retry: 5000\n\n"
+        async with aclosing(iter_news_updates(last_event_id)) as updates:
+            async for update in updates:
+                if update is None:
+                    yield ": keepalive\n\n"
+                    continue
+                frame = update.sse_frame(category)
+                if frame:
+                    yield frame
+    finally:
+        STREAM_CLIENTS.labels("sse").dec()
+
+HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+def plain_text(value: Optional[str]) -> str:
+    """Text content of an HTML fragment with whitespace collapsed"""
+    return " ".join(html.unescape(HTML_TAG_PATTERN.sub(" ", value or "")).split())
+
+def truncate_text(text: str, length: int = CARD_SUMMARY_LENGTH) -> str:
+    """Cut text at a word boundary, marking the cut with an ellipsis"""
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(" ", 1)[0].rstrip(" ,.;:") + "…"
+
+def article_card(article: Dict) -> Dict:
+    """Compact view of an article for headline lists and tickers"""
+    card = {field: article.get(field) for field in CARD_FIELDS if field != "summary"}
+    if isinstance(card["published_at"], datetime):
+        card["published_at"] = card["published_at"].isoformat()
+    card["summary"] = truncate_text(plain_text(article.get("description")) or article.get("ai_summary") or "")
+    return card
+
+def article_id(url: str) -> str:
+    """Stable article id derived from its URL"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, url))
+
+# Full-text extraction
+class BlockedDestination(Exception):
+    """Raised instead of fetching a page on a private or local network"""
+
+def is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+async def check_public_destination(request: httpx.Request):
+    """Refuse feed and article URLs (and every redirect hop) that resolve to
+    private, loopback, link-local or otherwise non-public addresses.
+    
+    The connection resolves the host again, so a DNS record that changes between
+    the check and the connect (rebinding) can still reach a private address;
+    deployments that need a hard guarantee must also restrict egress at the network"""
+    if request.url.scheme not in ("http", "https"):
+        raise BlockedDestination(f"unsupported scheme {request.url.scheme}")
+    if ALLOW_PRIVATE_DESTINATIONS:
+        return
+    host = request.url.host
+    try:
+        addresses = [ipaddress.ip_address(host).compressed]
+    except ValueError:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, request.url.port or 443, type=socket.SOCK_STREAM)
+        addresses = [info[4][0] for info in infos]
+    if not addresses or not all(is_public_address(address) for address in addresses):
+        raise BlockedDestination(f"{host} is not a public address")
+
+extraction_state = {"client": None, "pool": None}
+host_extraction_limits: Dict[str, asyncio.Semaphore] = {}
+
+def get_extraction_client() -> httpx.AsyncClient:
+    """Connection pool shared by all page fetches, created on first use"""
+    if extraction_state["client"] is None:
+        extraction_state["client"] = httpx.AsyncClient(
+            timeout=httpx.Timeout(EXTRACTION_TIMEOUT, connect=FEED_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=EXTRACTION_CONCURRENCY, max_keepalive_connections=EXTRACTION_CONCURRENCY),
+            headers={"User-Agent": "KaiTech News Bot 2.0"},
+            follow_redirects=True,
+            event_hooks={"request": [check_public_destination]}
+        )
+    return extraction_state["client"]
+
+def get_extraction_pool() -> Optional[ProcessPoolExecutor]:
+    """Extractor processes, so parsing pages doesn't hold the event loop's GIL.
+    They start from a forkserver (spawn where unavailable) that preloads only the
+    extractor module: forking this process would copy its threads' held locks.
+    Python also re-imports the launching script in each worker, so run the
+    service as `uvicorn main:app` rather than `python main.py`"""
+    if extraction_state["pool"] is None and EXTRACTION_WORKERS > 0:
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(["extractor"])
+        else:
+            context = multiprocessing.get_context("spawn")
+        extraction_state["pool"] = ProcessPoolExecutor(max_workers=EXTRACTION_WORKERS, mp_context=context)
+    return extraction_state["pool"]
+
+def get_host_extraction_limit(url: str) -> asyncio.Semaphore:
+    host = urlparse(url).hostname or url
+    if host not in host_extraction_limits:
+        host_extraction_limits[host] = asyncio.Semaphore(EXTRACTION_PER_HOST)
+    return host_extraction_limits[host]
+
+async def close_extraction():
+    """Close the page connection pool and stop the extractor processes"""
+    client, pool = extraction_state["client"], extraction_state["pool"]
+    extraction_state["client"] = extraction_state["pool"] = None
+    host_extraction_limits.clear()
+    if client is not None:
+        await client.aclose()
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def extracted_url_key(url: str) -> str:
+    return EXTRACTED_URL_PREFIX + hashlib.sha1(url.encode()).hexdigest()
+
+def needs_extraction(article: Dict) -> bool:
+    """Articles whose feed content is missing or only a teaser"""
+    return bool(article.get("url")) and len(plain_text(article.get("content"))) < EXTRACTION_MIN_CHARS
+
+def load_extracted_content(urls: List[str]) -> Dict[str, Dict]:
+    """Cached extraction results (including recent failures) keyed by URL"""
+    if not redis_client or not urls:
+        return {}
+    
+    try:
+        payloads = redis_client.mget([extracted_url_key(url) for url in urls])
+        return {url: json.loads(payload) for url, payload in zip(urls, payloads) if payload}
+    except Exception as e:
+        logger.error(f"Extraction cache read error: {e}")
+        return {}
+
+def store_extracted_content(url: str, content_hash: Optional[str], content: str):
+    """Cache a page's text by URL and by content hash; failures are cached briefly"""
+    if not redis_client:
+        return
+    
+    try:
+        ttl = EXTRACTION_CACHE_TTL if content else EXTRACTION_FAILURE_TTL
+        pipe = redis_client.pipeline()
+        pipe.setex(extracted_url_key(url), ttl, json.dumps({"content": content, "content_hash": content_hash}))
+        if content_hash and content:
+            pipe.setex(EXTRACTED_CONTENT_PREFIX + content_hash, EXTRACTION_CACHE_TTL, content)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Extraction cache write error for {url}: {e}")
+
+async def fetch_article_page(url: str) -> Optional[str]:
+    """Download an article page within EXTRACTION_MAX_BYTES, or None if it isn't HTML"""
+    async with get_extraction_client().stream("GET", url) as response:
+        response.raise_for_status()
+        if "html" not in response.headers.get("content-type", "text/html"):
+            return None
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > EXTRACTION_MAX_BYTES:
+                raise ValueError(f"page exceeds {EXTRACTION_MAX_BYTES} bytes")
+        return body.decode(response.encoding or "utf-8", errors="replace")
+
+async def extract_article_page(url: str) -> str:
+    """Readable text of one article page, reusing the text of an identical page
+    seen under another URL; the result is cached either way"""
+    start_time = time.perf_counter()
+    content_hash = None
+    try:
+        async with get_host_extraction_limit(url):
+            page = await fetch_article_page(url)
+        if page is None:
+            EXTRACTION_SECONDS.labels("skipped").observe(time.perf_counter() - start_time)
+            store_extracted_content(url, None, "")
+            return ""
+        
+        content_hash = hashlib.sha256(page.encode()).hexdigest()
+        content = redis_client.get(EXTRACTED_CONTENT_PREFIX + content_hash) if redis_client else None
+        outcome = "duplicate"
+        if content is None:
+            outcome = "extracted"
+            content = await asyncio.get_running_loop().run_in_executor(
+                get_extraction_pool(), extract_readable_text, page, url
+            )
+    except Exception as e:
+        logger.info(f"📄 Extraction failed for {url}: {str(e) or type(e).__name__}")
+        EXTRACTION_SECONDS.labels("error").observe(time.perf_counter() - start_time)
+        store_extracted_content(url, content_hash, "")
+        return ""
+    
+    EXTRACTION_SECONDS.labels(outcome).observe(time.perf_counter() - start_time)
+    store_extracted_content(url, content_hash, content)
+    return content
+
+async def extract_article_content(articles: List[Dict], fetch: bool = True) -> List[Dict]:
+    """Fill teaser-only articles' content from the extraction cache and, with
+    fetch, extract up to EXTRACTION_MAX_ARTICLES uncached pages within
+    EXTRACTION_DEADLINE. Returns the articles that gained content."""
+    if not EXTRACTION_ENABLED:
+        return []
+    
+    candidates = {}
+    for article in articles:
+        if needs_extraction(article):
+            candidates.setdefault(article["url"], []).append(article)
+    
+    filled = []
+    cached = load_extracted_content(list(candidates))
+    for url, entry in cached.items():
+        EXTRACTION_PAGES.labels("cached").inc()
+        if entry["content"] and candidates[url][0].get("content") != entry["content"]:
+            for article in candidates[url]:
+                article["content"] = entry["content"]
+            filled.extend(candidates[url])
+    
+    pending_urls = [url for url in candidates if url not in cached][:EXTRACTION_MAX_ARTICLES]
+    if not fetch or not pending_urls:
+        return filled
     
-    all_articles = []
+    semaphore = asyncio.Semaphore(EXTRACTION_CONCURRENCY)
     
-    # Fetch from all RSS sources concurrently
-    tasks = [fetch_rss_feed(source) for source in RSS_SOURCES]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def extract_limited(url: str) -> str:
+        async with semaphore:
+            return await extract_article_page(url)
     
-    for result in results:
-        if isinstance(result, list):
-            all_articles.extend(result)
-        elif isinstance(result, Exception):
-            logger.error(f"RSS fetch error: {result}")
+    tasks = {asyncio.create_task(extract_limited(url)): url for url in pending_urls}
+    done, pending = await asyncio.wait(tasks, timeout=EXTRACTION_DEADLINE)
+    for task in pending:
+        task.cancel()
     
+    extracted = 0
+    for task in done:
+        content = task.result()
+        EXTRACTION_PAGES.labels("extracted" if content else "failed").inc()
+        if content:
+            for article in candidates[tasks[task]]:
+                article["content"] = content
+            filled.extend(candidates[tasks[task]])
+            extracted += 1
+    
+    logger.info(f"📄 Extracted {extracted} of {len(pending_urls)} article pages ({len(pending)} left for the next run)")
+    return filled
+
+async def publish_extracted_content(articles: List[Dict]) -> int:
+    """Write newly extracted content into the cached snapshot under a new version.
+    Unlike publish_snapshot this doesn't re-run AI enhancement, and only the
+    articles whose content changed are pushed to clients and re-archived."""
+    content = {article["url"]: article["content"] for article in articles}
+    snapshot = await get_from_cache("news:all")
+    if not snapshot or not content:
+        return 0
+    
+    patched = 0
+    for article in snapshot["articles"]:
+        if article["url"] in content and article.get("content") != content[article["url"]]:
+            article["content"] = content[article["url"]]
+            patched += 1
+    if not patched:
+        return 0
+    
+    last_updated = datetime.utcnow().isoformat()
+    version = hashlib.md5(json.dumps(snapshot["articles"], default=str).encode()).hexdigest()[:16]
+    snapshot.update(last_updated=last_updated, version=version)
+    await set_cache("news:all", snapshot, ttl=CACHE_TTL)
+    for key in ("news:breaking", "news:cards"):
+        derived = await get_from_cache(key)
+        if derived:
+            if key == "news:breaking":
+                for article in derived["articles"]:
+                    article["content"] = content.get(article["url"], article.get("content"))
+            derived.update(last_updated=last_updated, version=version)
+            await set_cache(key, derived, ttl=CACHE_TTL)
+    await set_cache("news:version", {"version": version, "last_updated": last_updated}, ttl=CACHE_TTL)
+    logger.info(f"📄 Published extracted content for {patched} articles")
+    
+    await publish_article_updates(snapshot["articles"])
+    await archive_changed_articles(articles)
+    return patched
+
+# Background task to fetch news
+async def publish_snapshot(all_articles: List[Dict], sources_count: int) -> List[Dict]:
+    """Deduplicate, sort, AI-enhance and cache a news snapshot"""
     # Remove duplicates by URL
     unique_articles = {}
     for article in all_articles:
         if article['url'] not in unique_articles:
             unique_articles[article['url']] = article
+            # Stable ids, so clients and ai-service's related-article lookup can refer to them
+            article.setdefault('id', article_id(article['url']))
     
     articles_list = list(unique_articles.values())
     
@@ -371,25 +1897,144 @@ async def fetch_all_news():
     articles_list.sort(key=lambda x: x['published_at'], reverse=True)
     
     # Enhance with AI
+    enhance_start = time.perf_counter()
     enhanced_articles = await enhance_with_ai(articles_list)
+    AI_ENHANCE_SECONDS.observe(time.perf_counter() - enhance_start)
+    AI_ENHANCE_BATCH.observe(len(articles_list))
     
-    # Cache the results
+    # Cache the results; the version changes only when the content does
+    last_updated = datetime.utcnow().isoformat()
+    version = hashlib.md5(json.dumps(enhanced_articles, default=str).encode()).hexdigest()[:16]
     cache_data = {
         "articles": enhanced_articles,
         "total": len(enhanced_articles),
-        "last_updated": datetime.utcnow().isoformat(),
-        "sources_count": len(RSS_SOURCES)
+        "last_updated": last_updated,
+        "sources_count": sources_count,
+        "version": version
     }
     
     await set_cache("news:all", cache_data, ttl=CACHE_TTL)
     await set_cache("news:breaking", {
         "articles": [a for a in enhanced_articles if a['trending_score'] > 70][:20],
-        "last_updated": datetime.utcnow().isoformat()
+        "last_updated": last_updated,
+        "version": version
+    }, ttl=CACHE_TTL)
+    await set_cache("news:cards", {
+        "articles": [article_card(a) for a in enhanced_articles],
+        "last_updated": last_updated,
+        "version": version
     }, ttl=CACHE_TTL)
+    await set_cache("news:digest", build_news_digest(enhanced_articles), ttl=CACHE_TTL)
+    # Written last: a request that sees this version finds its snapshot already cached
+    await set_cache("news:version", {"version": version, "last_updated": last_updated}, ttl=CACHE_TTL)
     
+    SNAPSHOT_ARTICLES.set(len(enhanced_articles))
     logger.info(f"✅ Cached {len(enhanced_articles)} articles")
+    
+    await publish_article_updates(enhanced_articles)
+    
+    await archive_changed_articles(enhanced_articles)
     return enhanced_articles
 
+def merge_source_articles(sources: List[Dict], fresh: Dict[str, List[Dict]]) -> List[Dict]:
+    """Fresh articles per source, falling back to each missing source's stored articles"""
+    missing = [source["name"] for source in sources if source["name"] not in fresh]
+    stored = load_many_source_articles(missing)
+    articles = []
+    for source in sources:
+        articles.extend(fresh.get(source["name"]) or stored.get(source["name"]) or [])
+    return articles
+
+async def fetch_all_news():
+    """Background task to fetch and cache news"""
+    logger.info("🔄 Starting news aggregation...")
+    aggregation_start = time.perf_counter()
+    
+    sources = []
+    enqueued = 0
+    tasks = {}
+    semaphore = asyncio.Semaphore(FEED_CONCURRENCY)
+    
+    async def fetch_limited(source: Dict) -> List[Dict]:
+        async with semaphore:
+            return await fetch_rss_feed(source)
+    
+    async for page in iter_source_pages():
+        sources.extend(page)
+        if INGESTION_MODE == "stream":
+            # Ingestion workers fetch the sources
+            enqueued += enqueue_feed_jobs(page)
+        else:
+            for source in page:
+                tasks[asyncio.create_task(fetch_limited(source))] = source
+    
+    if INGESTION_MODE == "stream":
+        # Publish what the workers have stored so far
+        logger.info(f"📤 Enqueued {enqueued} feed jobs")
+        articles = load_ingested_articles()
+        await extract_article_content(articles, fetch=False)
+        enhanced_articles = await publish_snapshot(articles, len(sources))
+        AGGREGATION_SECONDS.observe(time.perf_counter() - aggregation_start)
+        await publish_extracted_content(await extract_article_content(articles))
+        return enhanced_articles
+    
+    fresh = {}
+    
+    def collect(done):
+        for task in done:
+            if not task.cancelled() and task.result():
+                fresh[tasks[task]["name"]] = task.result()
+    
+    pending = set(tasks)
+    if pending:
+        done, pending = await asyncio.wait(pending, timeout=FEED_PUBLISH_AFTER)
+        collect(done)
+    
+    if pending:
+        # Publish the fast feeds now; slow sources keep their previous articles until they land
+        logger.info(f"⏳ Publishing {len(fresh)} fast feeds, waiting on {len(pending)}")
+        await publish_snapshot(merge_source_articles(sources, fresh), len(sources))
+        
+        remaining = AGGREGATION_DEADLINE - (time.perf_counter() - aggregation_start)
+        done, pending = await asyncio.wait(pending, timeout=max(0.0, remaining))
+        collect(done)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"⏱️ {len(pending)} feeds missed the aggregation deadline")
+    
+    remember_source_articles(fresh)
+    await flush_source_states()
+    
+    # Previously extracted text goes into this snapshot; new pages are patched in afterwards
+    articles = merge_source_articles(sources, fresh)
+    await extract_article_content(articles, fetch=False)
+    enhanced_articles = await publish_snapshot(articles, len(sources))
+    AGGREGATION_SECONDS.observe(time.perf_counter() - aggregation_start)
+    await publish_extracted_content(await extract_article_content(articles))
+    return enhanced_articles
+
+async def news_refresh_loop():
+    """Rebuild the snapshot every NEWS_REFRESH_INTERVAL; one worker per interval when Redis is shared"""
+    if NEWS_REFRESH_INTERVAL >= CACHE_TTL:
+        logger.warning(f"⚠️ NEWS_REFRESH_INTERVAL ({NEWS_REFRESH_INTERVAL}s) is not shorter than CACHE_TTL ({CACHE_TTL}s); the snapshot will expire between refreshes")
+    while True:
+        try:
+            if not redis_client or redis_client.set(NEWS_REFRESH_LOCK, 1, nx=True, ex=max(10, NEWS_REFRESH_INTERVAL - 10)):
+                await fetch_all_news()
+        except Exception as e:
+            logger.error(f"News refresh error: {e}")
+        await asyncio.sleep(NEWS_REFRESH_INTERVAL)
+
+def request_refresh(background_tasks: BackgroundTasks):
+    """Queue one fetch_all_news for a cache miss unless another request already has"""
+    try:
+        if redis_client and not redis_client.set(NEWS_REFRESHING_KEY, 1, nx=True, ex=int(AGGREGATION_DEADLINE) + 10):
+            return
+    except Exception as e:
+        logger.error(f"Refresh marker error: {e}")
+    background_tasks.add_task(fetch_all_news)
+
 # API Routes
 @app.get("/", response_model=Dict)
 async def root():
@@ -401,11 +2046,15 @@ async def root():
         "timestamp": datetime.utcnow(),
         "endpoints": {
             "health": "/health",
+            "metrics": "/metrics",
             "news": "/api/news",
             "breaking": "/api/news/breaking",
             "trending": "/api/news/trending",
             "categories": "/api/news/categories",
-            "search": "/api/news/search"
+            "search": "/api/news/search",
+            "archive_search": "/api/news/archive/search",
+            "stream": "/api/news/stream",
+            "sources": "/api/sources"
         }
     }
 
@@ -426,34 +2075,143 @@ async def health_check():
         "cache_info": {
             "redis_connected": bool(redis_client),
             "cache_ttl": CACHE_TTL
+        },
+        "stream_clients": len(news_broadcaster.clients),
+        "content_extraction": {
+            "enabled": EXTRACTION_ENABLED,
+            "extractor": "trafilatura" if trafilatura is not None else "paragraphs",
+            "workers": EXTRACTION_WORKERS
+        },
+        "circuit_breakers": {
+            host: breaker.state for host, breaker in host_breakers.items() if breaker.state != "closed"
         }
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics (aggregated across workers when PROMETHEUS_MULTIPROC_DIR is set)"""
+    return metrics_response()
+
+# Conditional responses for snapshot-backed endpoints
+def snapshot_etag(request: Request, version: str) -> str:
+    """Strong ETag: the snapshot version plus the request's path and query parameters"""
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    return '"' + hashlib.md5(f"{version}|{request.url.path}|{query}".encode()).hexdigest() + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match already names this ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+def snapshot_cache_headers(etag: str) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={NEWS_CACHE_MAX_AGE}, "
+            f"stale-while-revalidate={NEWS_STALE_WHILE_REVALIDATE}, stale-if-error={NEWS_STALE_IF_ERROR}"
+        )
+    }
+
+async def conditional_snapshot(request: Request) -> tuple:
+    """Current snapshot version for a request. Returns (version, last_updated,
+    not_modified); version is None when nothing is cached. Caching headers are
+    left to set_snapshot_headers once the snapshot body has been read"""
+    snapshot = await get_from_cache("news:version")
+    if not snapshot:
+        return None, None, None
+    
+    # Only responses carrying snapshot data get this ETag, so a match is safe to confirm
+    etag = snapshot_etag(request, snapshot["version"])
+    if etag_matches(request, etag):
+        return snapshot["version"], snapshot["last_updated"], Response(status_code=304, headers=snapshot_cache_headers(etag))
+    return snapshot["version"], snapshot["last_updated"], None
+
+def set_snapshot_headers(request: Request, response: Response, version: Optional[str]):
+    """Caching headers for a response built from snapshot `version`; None marks a
+    response without snapshot data, which a CDN or client must not hold on to"""
+    if version:
+        response.headers.update(snapshot_cache_headers(snapshot_etag(request, version)))
+    else:
+        response.headers["Cache-Control"] = "no-cache"
+
+# Article views and field projection for list endpoints
+VIEW_FIELDS = {"full": set(NewsArticle.__fields__), "card": set(CARD_FIELDS)}
+ViewQuery = Query("full", regex="^(full|card)$", description="card: precomputed summary view without content or HTML")
+
+def article_fields(
+    view: str = ViewQuery,
+    fields: Optional[str] = Query(None, description="Comma-separated article fields to return, e.g. id,title,url,source")
+) -> Optional[List[str]]:
+    """Parse and validate the fields= projection against the requested view's fields"""
+    if not fields:
+        return None
+    selected = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = set(selected) - VIEW_FIELDS[view]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown {view} view fields: {', '.join(sorted(unknown))}")
+    return selected
+
+def news_list_response(
+    articles: List[Dict],
+    total: int,
+    cached: bool,
+    timestamp,
+    view: str,
+    fields: Optional[List[str]],
+    response: Response
+):
+    """NewsResponse for the full view; for cards or a projection, the same
+    envelope serialized straight from the snapshot dicts"""
+    if view == "full" and not fields:
+        return NewsResponse(
+            articles=[NewsArticle(**article) for article in articles],
+            total=total,
+            cached=cached,
+            timestamp=timestamp or datetime.utcnow()
+        )
+    
+    if fields:
+        articles = [{field: article.get(field) for field in fields} for article in articles]
+    body = {
+        "status": "success",
+        "articles": articles,
+        "total": total,
+        "cached": cached,
+        "timestamp": timestamp or datetime.utcnow()
+    }
+    return Response(json.dumps(body, default=str), media_type="application/json", headers=dict(response.headers))
+
 @app.get("/api/news", response_model=NewsResponse)
 async def get_all_news(
+    request: Request,
+    response: Response,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     category: Optional[str] = Query(None),
+    view: str = ViewQuery,
+    fields: Optional[List[str]] = Depends(article_fields),
     background_tasks: BackgroundTasks = BackgroundTasks()
 ):
     """Get all news articles with caching"""
+    version, last_updated, not_modified = await conditional_snapshot(request)
+    if not_modified:
+        return not_modified
     
-    # Try to get from cache first
-    cache_key = f"news:all:{category}:{limit}:{offset}"
-    cached_data = await get_from_cache(cache_key)
+    # Try to get from cache first; per-query entries are keyed by snapshot version
+    cache_key = f"news:all:{version}:{view}:{category}:{limit}:{offset}"
+    cached_data = await get_from_cache(cache_key) if version else None
     
     if cached_data:
-        return NewsResponse(
-            articles=[NewsArticle(**article) for article in cached_data["articles"]],
-            total=cached_data["total"],
-            cached=True
+        set_snapshot_headers(request, response, version)
+        return news_list_response(
+            cached_data["articles"], cached_data["total"], True, last_updated, view, fields, response
         )
     
-    # If not in cache, fetch fresh data
-    background_tasks.add_task(fetch_all_news)
-    
     # Try to get from main cache
-    main_cache = await get_from_cache("news:all")
+    main_cache = await get_from_cache("news:cards" if view == "card" else "news:all")
     if main_cache:
         articles = main_cache["articles"]
         
@@ -469,60 +2227,73 @@ async def get_all_news(
             "articles": paginated_articles,
             "total": len(articles)
         }
-        await set_cache(cache_key, query_cache_data, ttl=CACHE_TTL // 2)
+        if main_cache.get("version") == version:
+            await set_cache(cache_key, query_cache_data, ttl=CACHE_TTL // 2)
         
-        return NewsResponse(
-            articles=[NewsArticle(**article) for article in paginated_articles],
-            total=len(articles),
-            cached=True
+        set_snapshot_headers(request, response, main_cache.get("version", version))
+        return news_list_response(
+            paginated_articles, len(articles), True, last_updated or main_cache["last_updated"], view, fields, response
         )
     
     # Fallback: return empty response and trigger background fetch
-    return NewsResponse(
-        articles=[],
-        total=0,
-        cached=False
-    )
+    request_refresh(background_tasks)
+    set_snapshot_headers(request, response, None)
+    return news_list_response([], 0, False, None, view, fields, response)
 
 @app.get("/api/news/breaking", response_model=NewsResponse)
 async def get_breaking_news(
-    limit: int = Query(20, ge=1, le=50)
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=50),
+    view: str = ViewQuery,
+    fields: Optional[List[str]] = Depends(article_fields)
 ):
     """Get breaking news"""
-    cache_key = f"news:breaking:{limit}"
-    cached_data = await get_from_cache(cache_key)
+    version, last_updated, not_modified = await conditional_snapshot(request)
+    if not_modified:
+        return not_modified
+    
+    # The snapshot precomputes the top 20 breaking articles
+    cached_data = await get_from_cache("news:breaking") if limit <= 20 and view == "full" else None
     
     if cached_data:
         articles = cached_data["articles"][:limit]
-        return NewsResponse(
-            articles=[NewsArticle(**article) for article in articles],
-            total=len(articles),
-            cached=True
+        set_snapshot_headers(request, response, cached_data.get("version", version))
+        return news_list_response(
+            articles, len(articles), True, last_updated or cached_data["last_updated"], view, fields, response
         )
     
     # Try main cache and filter
-    main_cache = await get_from_cache("news:all")
+    main_cache = await get_from_cache("news:cards" if view == "card" else "news:all")
     if main_cache:
         breaking_articles = [
             a for a in main_cache["articles"] 
             if a.get("trending_score", 0) > 70
         ][:limit]
         
-        return NewsResponse(
-            articles=[NewsArticle(**article) for article in breaking_articles],
-            total=len(breaking_articles),
-            cached=False
+        set_snapshot_headers(request, response, main_cache.get("version", version))
+        return news_list_response(
+            breaking_articles, len(breaking_articles), True, last_updated or main_cache["last_updated"], view, fields, response
         )
     
-    return NewsResponse(articles=[], total=0, cached=False)
+    set_snapshot_headers(request, response, None)
+    return news_list_response([], 0, False, None, view, fields, response)
 
 @app.get("/api/news/trending", response_model=NewsResponse)
 async def get_trending_news(
+    request: Request,
+    response: Response,
     limit: int = Query(30, ge=1, le=100),
-    min_score: float = Query(50.0, ge=0.0, le=100.0)
+    min_score: float = Query(50.0, ge=0.0, le=100.0),
+    view: str = ViewQuery,
+    fields: Optional[List[str]] = Depends(article_fields)
 ):
     """Get trending news"""
-    main_cache = await get_from_cache("news:all")
+    version, last_updated, not_modified = await conditional_snapshot(request)
+    if not_modified:
+        return not_modified
+    
+    main_cache = await get_from_cache("news:cards" if view == "card" else "news:all")
     if main_cache:
         trending_articles = [
             a for a in main_cache["articles"] 
@@ -531,29 +2302,37 @@ async def get_trending_news(
         trending_articles.sort(key=lambda x: x.get("trending_score", 0), reverse=True)
         trending_articles = trending_articles[:limit]
         
-        return NewsResponse(
-            articles=[NewsArticle(**article) for article in trending_articles],
-            total=len(trending_articles),
-            cached=True
+        set_snapshot_headers(request, response, main_cache.get("version", version))
+        return news_list_response(
+            trending_articles, len(trending_articles), True, last_updated or main_cache["last_updated"], view, fields, response
         )
     
-    return NewsResponse(articles=[], total=0, cached=False)
+    set_snapshot_headers(request, response, None)
+    return news_list_response([], 0, False, None, view, fields, response)
 
 @app.get("/api/news/search", response_model=NewsResponse)
 async def search_news(
+    request: Request,
+    response: Response,
     q: str = Query(..., min_length=2),
-    limit: int = Query(30, ge=1, le=100)
+    limit: int = Query(30, ge=1, le=100),
+    view: str = ViewQuery,
+    fields: Optional[List[str]] = Depends(article_fields)
 ):
     """Search news articles"""
-    cache_key = f"news:search:{q}:{limit}"
-    cached_data = await get_from_cache(cache_key)
+    version, last_updated, not_modified = await conditional_snapshot(request)
+    if not_modified:
+        return not_modified
+    
+    cache_key = f"news:search:{version}:{q}:{limit}"
+    cached_data = await get_from_cache(cache_key) if version else None
     
     if cached_data:
-        return NewsResponse(
-            articles=[NewsArticle(**article) for article in cached_data["articles"]],
-            total=cached_data["total"],
-            cached=True
-        )
+        articles = cached_data["articles"]
+        if view == "card":
+            articles = [article_card(article) for article in articles]
+        set_snapshot_headers(request, response, version)
+        return news_list_response(articles, cached_data["total"], True, last_updated, view, fields, response)
     
     main_cache = await get_from_cache("news:all")
     if main_cache:
@@ -568,19 +2347,135 @@ async def search_news(
             "articles": search_results,
             "total": len(search_results)
         }
-        await set_cache(cache_key, search_cache_data, ttl=CACHE_TTL // 4)
+        if main_cache.get("version") == version:
+            await set_cache(cache_key, search_cache_data, ttl=CACHE_TTL // 4)
         
-        return NewsResponse(
-            articles=[NewsArticle(**article) for article in search_results],
-            total=len(search_results),
-            cached=False
+        if view == "card":
+            search_results = [article_card(article) for article in search_results]
+        set_snapshot_headers(request, response, main_cache.get("version", version))
+        return news_list_response(
+            search_results, len(search_results), True, last_updated or main_cache["last_updated"], view, fields, response
         )
     
-    return NewsResponse(articles=[], total=0, cached=False)
+    set_snapshot_headers(request, response, None)
+    return news_list_response([], 0, False, None, view, fields, response)
+
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    """(rank, published_at, id) of the last row of the previous page; 400 if malformed"""
+    try:
+        rank, published_at, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if isinstance(rank, bool) or not isinstance(rank, (int, float)):
+            raise ValueError("rank is not a number")
+        return rank, datetime.fromisoformat(published_at), str(uuid.UUID(row_id))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@app.get("/api/news/archive/search", response_model=ArchiveSearchResponse)
+async def search_archive(
+    q: str = Query(..., min_length=2, max_length=200),
+    sort: str = Query("relevance", regex="^(relevance|recent)$"),
+    match: str = Query("fulltext", regex="^(fulltext|fuzzy)$", description="fuzzy matches titles by trigram similarity"),
+    category: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    limit: int = Query(30, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Ranked, keyset-paginated search over the article archive"""
+    if not archive_search["trigram" if match == "fuzzy" else "fulltext"]:
+        raise HTTPException(status_code=503, detail=f"Archive {match} search is not available on this database")
+    
+    params = {"q": q, "limit": limit}
+    if match == "fuzzy":
+        source_sql = "articles"
+        conditions = ["title % :q"]
+        rank_sql = "similarity(title, :q)::float8"
+    else:
+        source_sql = f"articles, websearch_to_tsquery('{SEARCH_LANGUAGE}', :q) AS query"
+        conditions = ["search_vector @@ query"]
+        rank_sql = "ts_rank_cd(search_vector, query)::float8"
+    
+    for column, value in (("category", category), ("source", source)):
+        if value:
+            conditions.append(f"{column} = :{column}")
+            params[column] = value
+    if since:
+        conditions.append("published_at >= :since")
+        params["since"] = since
+    if until:
+        conditions.append("published_at < :until")
+        params["until"] = until
+    
+    # Keyset pagination: continue strictly after the last row of the previous page
+    if sort == "relevance":
+        order_sql = "rank DESC, published_at DESC, id DESC"
+        if cursor:
+            params["after_rank"], params["after_published"], params["after_id"] = decode_cursor(cursor)
+            conditions.append(f"({rank_sql}, published_at, id) < (:after_rank, :after_published, CAST(:after_id AS uuid))")
+    else:
+        order_sql = "published_at DESC, id DESC"
+        if cursor:
+            _, params["after_published"], params["after_id"] = decode_cursor(cursor)
+            conditions.append("(published_at, id) < (:after_published, CAST(:after_id AS uuid))")
+    
+    rows = (await db.execute(text(f"""
+        SELECT id, title, description, content, url, source, category, ai_category, sentiment,
+               ai_summary, published_at, trending_score, enhanced, language, {rank_sql} AS rank
+        FROM {source_sql}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY {order_sql}
+        LIMIT :limit
+    """), params)).mappings().all()
+    
+    articles = [
+        NewsArticle(**{**{k: v for k, v in row.items() if k != "rank" and v is not None}, "id": str(row["id"])})
+        for row in rows
+    ]
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor([last["rank"], last["published_at"].isoformat(), str(last["id"])])
+    
+    return ArchiveSearchResponse(articles=articles, count=len(articles), next_cursor=next_cursor)
+
+@app.get("/api/news/archive/stats")
+async def get_archive_stats(
+    days: int = Query(30, ge=1, le=3650),
+    category: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """Daily article counts from the archive rollups (kept after partitions expire)"""
+    since = datetime.utcnow().date() - timedelta(days=days)
+    query = select(
+        ArticleDailyStats.day, ArticleDailyStats.category, func.sum(ArticleDailyStats.articles)
+    ).where(ArticleDailyStats.day >= since)
+    if category:
+        query = query.where(ArticleDailyStats.category == category)
+    if source:
+        query = query.where(ArticleDailyStats.source == source)
+    
+    rows = (await db.execute(
+        query.group_by(ArticleDailyStats.day, ArticleDailyStats.category).order_by(ArticleDailyStats.day.desc())
+    )).all()
+    return {
+        "status": "success",
+        "days": [{"day": day, "category": row_category, "articles": int(count)} for day, row_category, count in rows],
+        "retention_days": ARCHIVE_RETENTION_DAYS
+    }
 
 @app.get("/api/news/categories")
-async def get_news_categories():
+async def get_news_categories(request: Request, response: Response):
     """Get available news categories"""
+    version, last_updated, not_modified = await conditional_snapshot(request)
+    if not_modified:
+        return not_modified
+    
     main_cache = await get_from_cache("news:all")
     if main_cache:
         categories = {}
@@ -590,15 +2485,61 @@ async def get_news_categories():
                 categories[cat] = 0
             categories[cat] += 1
         
+        set_snapshot_headers(request, response, main_cache.get("version", version))
         return {
             "status": "success",
             "categories": categories,
             "total_categories": len(categories),
-            "timestamp": datetime.utcnow()
+            "timestamp": last_updated or main_cache["last_updated"]
         }
     
+    set_snapshot_headers(request, response, None)
     return {"status": "error", "message": "No data available"}
 
+@app.get("/api/news/stream")
+async def stream_news(
+    category: Optional[str] = Query(None, description="Only push articles in this category"),
+    last_event_id: Optional[int] = Header(None, description="Resume after this update (sent by EventSource on reconnect)")
+):
+    """Server-sent events carrying new or changed articles as snapshots are published"""
+    return StreamingResponse(
+        news_stream_events(category, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.websocket("/api/news/stream")
+async def stream_news_websocket(
+    websocket: WebSocket,
+    category: Optional[str] = None,
+    last_event_id: Optional[int] = None
+):
+    """WebSocket variant of /api/news/stream; messages are the SSE data payloads"""
+    await websocket.accept()
+    STREAM_CLIENTS.labels("websocket").inc()
+    
+    async def wait_for_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    
+    disconnected = asyncio.create_task(wait_for_disconnect())
+    try:
+        async with aclosing(iter_news_updates(last_event_id)) as updates:
+            async for update in updates:
+                if disconnected.done():
+                    break
+                if update is None:
+                    await websocket.send_text('{"type": "ping"}')
+                    continue
+                payload = update.payload(category)
+                if payload:
+                    await websocket.send_text(payload)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        disconnected.cancel()
+        STREAM_CLIENTS.labels("websocket").dec()
+
 @app.post("/api/news/refresh")
 async def refresh_news(background_tasks: BackgroundTasks):
     """Manually refresh news cache"""
@@ -611,12 +2552,125 @@ async def refresh_news(background_tasks: BackgroundTasks):
         "timestamp": datetime.utcnow()
     }
 
+# Source management
+def verify_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """Guard for registry writes; without ADMIN_TOKEN the registry is read-only"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=503, detail="Registry writes are disabled: ADMIN_TOKEN is not configured")
+    if x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+async def get_source_or_404(db: AsyncSession, source_id: int) -> Source:
+    source = await db.get(Source, source_id)
+    if source is None:
+        raise HTTPException(status_code=404, detail=f"Source {source_id} not found")
+    return source
+
+async def commit_source(db: AsyncSession):
+    """Commit a registry change, mapping unique name/url clashes to 409"""
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A source with this name or URL already exists")
+
+@app.get("/api/sources")
+async def list_sources(
+    category: Optional[str] = Query(None, description="Filter by category"),
+    enabled: Optional[bool] = Query(None, description="Filter by enabled state"),
+    after_id: int = Query(0, ge=0, description="Return sources with id greater than this (cursor)"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of sources to return"),
+    db: AsyncSession = Depends(get_db)
+):
+    """List registered sources with their fetch state, paged by id"""
+    query = select(Source).where(Source.id > after_id)
+    if category:
+        query = query.where(Source.category == category)
+    if enabled is not None:
+        query = query.where(Source.enabled.is_(enabled))
+    
+    sources = (await db.scalars(query.order_by(Source.id).limit(limit))).all()
+    return {
+        "status": "success",
+        "sources": [SourceResponse.from_orm(s) for s in sources],
+        "next_after_id": sources[-1].id if len(sources) == limit else None
+    }
+
+@app.get("/api/sources/{source_id}", response_model=SourceResponse)
+async def get_source(source_id: int, db: AsyncSession = Depends(get_db)):
+    """Get one source and its fetch state"""
+    return await get_source_or_404(db, source_id)
+
+@app.post("/api/sources", response_model=SourceResponse, status_code=201, dependencies=[Depends(verify_admin_token)])
+async def create_source(source_input: SourceInput, db: AsyncSession = Depends(get_db)):
+    """Register a new source"""
+    source = Source(**source_input.dict())
+    db.add(source)
+    await commit_source(db)
+    await db.refresh(source)
+    return source
+
+@app.post("/api/sources/bulk", dependencies=[Depends(verify_admin_token)])
+async def import_sources(sources: List[SourceInput], db: AsyncSession = Depends(get_db)):
+    """Register many sources at once, skipping names or URLs already registered"""
+    names = {s.name for s in sources}
+    urls = {s.url for s in sources}
+    existing = (await db.execute(
+        select(Source.name, Source.url).where(or_(Source.name.in_(names), Source.url.in_(urls)))
+    )).all()
+    taken_names = {name for name, _ in existing}
+    taken_urls = {url for _, url in existing}
+    
+    added = []
+    for source_input in sources:
+        if source_input.name in taken_names or source_input.url in taken_urls:
+            continue
+        taken_names.add(source_input.name)
+        taken_urls.add(source_input.url)
+        added.append(Source(**source_input.dict()))
+    
+    db.add_all(added)
+    await commit_source(db)
+    return {"status": "success", "added": len(added), "skipped": len(sources) - len(added)}
+
+@app.patch("/api/sources/{source_id}", response_model=SourceResponse, dependencies=[Depends(verify_admin_token)])
+async def update_source(source_id: int, source_update: SourceUpdate, db: AsyncSession = Depends(get_db)):
+    """Update a source's settings"""
+    source = await get_source_or_404(db, source_id)
+    changes = source_update.dict(exclude_unset=True)
+    if "url" in changes and changes["url"] != source.url:
+        # A new feed URL invalidates the conditional-request validators
+        source.etag = None
+        source.last_modified = None
+    for field, value in changes.items():
+        setattr(source, field, value)
+    
+    await commit_source(db)
+    await db.refresh(source)
+    return source
+
+@app.delete("/api/sources/{source_id}", dependencies=[Depends(verify_admin_token)])
+async def delete_source(source_id: int, db: AsyncSession = Depends(get_db)):
+    """Remove a source and its stored articles"""
+    source = await get_source_or_404(db, source_id)
+    name = source.name
+    await db.delete(source)
+    await db.commit()
+    
+    if redis_client:
+        try:
+            redis_client.hdel(INGESTED_ARTICLES_KEY, name)
+        except Exception as e:
+            logger.error(f"Ingested articles delete error for {name}: {e}")
+    
+    return {"status": "success", "message": f"Source {source_id} deleted"}
+
 # Error handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     return JSONResponse(
         status_code=exc.status_code,
-        content=ErrorResponse(message=exc.detail).dict()
+        content=jsonable_encoder(ErrorResponse(message=exc.detail))
     )
 
 @app.exception_handler(Exception)
@@ -624,20 +2678,9 @@ async def general_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {exc}")
     return JSONResponse(
         status_code=500,
-        content=ErrorResponse(message="Internal server error").dict()
+        content=jsonable_encoder(ErrorResponse(message="Internal server error"))
     )
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Initialize app on startup"""
-    logger.info("🚀 Starting KaiTech News Service...")
-    
-    # Initial news fetch
-    asyncio.create_task(fetch_all_news())
-    
-    logger.info("✅ KaiTech News Service started successfully")
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+KaiTech News Service migrations
+Creates or upgrades the news-service schema (tables, archive partitioning and
+search indexes) and seeds the default sources. Run it once per deploy before
+starting the API and ingestion workers, which no longer touch the schema:
+
+    DATABASE_URL=postgresql://... python migrate.py
+
+Set AUTO_MIGRATE=true instead to run the same steps at API startup (local
+development and SQLite).
+"""
+
+import asyncio
+import logging
+
+import main as news_service
+
+logger = logging.getLogger(__name__)
+
+async def run():
+    try:
+        await news_service.run_migrations()
+    finally:
+        await news_service.close_db()
+
+def main():
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+KaiTech service observability helpers
+Prometheus metrics and request profiling shared by the Python services
+(news-service, ai-service)
+"""
+
+import os
+import re
+import random
+import cProfile
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response
+
+logger = logging.getLogger(__name__)
+
+# prometheus_client is optional; without it every metric is a no-op
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class NoopMetric:
+    """Stand-in metric used when prometheus_client is not installed"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+def create_metric(kind: str, name: str, documentation: str, labelnames=(), **kwargs):
+    """Create a Prometheus metric, or a no-op if prometheus_client is missing"""
+    if prometheus_client is None:
+        return NoopMetric()
+    return getattr(prometheus_client, kind)(name, documentation, labelnames, **kwargs)
+
+def metrics_response() -> Response:
+    """Prometheus exposition (aggregated across workers when PROMETHEUS_MULTIPROC_DIR is set)"""
+    if prometheus_client is None:
+        raise HTTPException(status_code=503, detail="prometheus_client is not installed")
+    
+    registry = prometheus_client.REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(prometheus_client.generate_latest(registry), media_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+# Request profiling (opt-in): a request is profiled when it sends an X-Profile
+# header matching PROFILE_TOKEN or is picked by the sample rate. Without a
+# token only sampling works; header requests and the admin endpoints are refused
+PROFILE_NAME_PATTERN = re.compile(r"^[\w.-]+$")
+
+class RequestProfiler:
+    """Per-service request profiler writing pyinstrument/cProfile output to disk"""
+
+    def __init__(self, service: str):
+        self.enabled = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+        self.sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+        self.token = os.getenv("PROFILE_TOKEN", "")
+        self.directory = Path(os.getenv("PROFILE_DIR", f"/tmp/kaitech-profiles/{service}"))
+        self.keep = int(os.getenv("PROFILE_KEEP", "50"))
+        self.active = False
+        
+        if self.enabled and not self.token:
+            logger.warning(f"⚠️ {service} profiling has no PROFILE_TOKEN: only sampling is enabled, X-Profile and /admin/profiles are refused")
+
+    def should_profile(self, request) -> bool:
+        """Whether to profile this request"""
+        if not self.enabled or self.active:
+            return False
+        
+        header = request.headers.get("x-profile")
+        if header is not None:
+            return bool(self.token) and header == self.token
+        return random.random() < self.sample_rate
+
+    @staticmethod
+    def start() -> tuple:
+        """Start pyinstrument (async-aware) if installed, otherwise cProfile"""
+        try:
+            from pyinstrument import Profiler
+            profiler = Profiler(async_mode="enabled")
+            profiler.start()
+            return "pyinstrument", profiler
+        except ImportError:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return "cprofile", profiler
+
+    def save(self, kind: str, profiler, method: str, path: str, duration: float) -> str:
+        """Write a finished profile to the profile directory and prune old ones; returns its name"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"\W+", "_", path).strip("_") or "root"
+        name = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{method}-{slug}-{int(duration * 1000)}ms"
+        
+        if kind == "pyinstrument":
+            name += ".html"
+            (self.directory / name).write_text(profiler.output_html())
+        else:
+            name += ".prof"
+            profiler.dump_stats(str(self.directory / name))
+        
+        profiles = sorted(self.directory.iterdir())
+        for old in profiles[:max(len(profiles) - self.keep, 0)]:
+            old.unlink(missing_ok=True)
+        return name
+
+    async def middleware(self, request, call_next):
+        """Profile sampled or explicitly requested requests to local disk"""
+        if not self.should_profile(request):
+            return await call_next(request)
+        
+        self.active = True
+        start_time = time.perf_counter()
+        kind, profiler = self.start()
+        try:
+            response = await call_next(request)
+        finally:
+            if kind == "pyinstrument":
+                profiler.stop()
+            else:
+                profiler.disable()
+            self.active = False
+        
+        name = await run_in_threadpool(
+            self.save, kind, profiler, request.method, request.url.path, time.perf_counter() - start_time
+        )
+        response.headers["X-Profile-Id"] = name
+        return response
+
+    def verify_access(self, x_admin_token: Optional[str] = Header(None)):
+        """Guard for the profile admin endpoints"""
+        if not self.enabled:
+            raise HTTPException(status_code=404, detail="Profiling is disabled")
+        if not self.token:
+            raise HTTPException(status_code=403, detail="PROFILE_TOKEN is not configured")
+        if x_admin_token != self.token:
+            raise HTTPException(status_code=403, detail="Invalid admin token")
+
+    def router(self) -> APIRouter:
+        """Admin endpoints for listing and downloading profiles"""
+        router = APIRouter(prefix="/admin/profiles", dependencies=[Depends(self.verify_access)])
+        
+        @router.get("")
+        async def list_profiles():
+            """List recent request profiles, newest first"""
+            profiles = []
+            if self.directory.is_dir():
+                for path in sorted(self.directory.iterdir(), reverse=True):
+                    stat = path.stat()
+                    profiles.append({
+                        "name": path.name,
+                        "size": stat.st_size,
+                        "created": datetime.utcfromtimestamp(stat.st_mtime),
+                        "url": f"/admin/profiles/{path.name}"
+                    })
+            
+            return {"status": "success", "profiles": profiles, "total": len(profiles)}
+        
+        @router.get("/{name}")
+        async def get_profile(name: str):
+            """Download one profile (HTML for pyinstrument, pstats dump for cProfile)"""
+            path = self.directory / name
+            if not PROFILE_NAME_PATTERN.match(name) or not path.is_file():
+                raise HTTPException(status_code=404, detail="Profile not found")
+            
+            media_type = "text/html" if name.endswith(".html") else "application/octet-stream"
+            return FileResponse(path, media_type=media_type, filename=name)
+        
+        return router
+
+def install_profiling(app: FastAPI, service: str) -> RequestProfiler:
+    """Add the profiling middleware and /admin/profiles endpoints to a service app"""
+    profiler = RequestProfiler(service)
+    app.middleware("http")(profiler.middleware)
+    app.include_router(profiler.router())
+    return profiler